@@ -1,1224 +1,4438 @@
-# ============================================================
-#  Excursionistas — Reserva 2026
-#  App Streamlit para cuerpo técnico de fútbol
-#  Datos en tiempo real desde Google Sheets (CSV público)
-# ============================================================
-
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import date
-
-# ─────────────────────────────────────────────
-#  CONFIGURACIÓN GLOBAL
-# ─────────────────────────────────────────────
-
-# ⚙️  Reemplazá este ID si cambiás el Google Sheets
-SHEET_ID = "1swZ_PRVtKwm3WwKX0HKvKDJV6r_UAxo3194yBx6ipfk"
-
-# Paleta de colores del panel
-COLOR_VERDE   = "#00c46a"
-COLOR_NARANJA = "#ff6b35"
-COLOR_FONDO   = "#0e1117"
-COLOR_CARD    = "#1c2333"
-COLOR_TEXTO   = "#e8eaed"
-
-# Colores por tipo de tarea
-TIPO_COLORES = {
-    "Activación":     {"border": "#ffd600", "bg": "rgba(255,214,0,0.10)",   "text": "#ffd600"},
-    "Física":         {"border": "#ff4b4b", "bg": "rgba(255,75,75,0.10)",    "text": "#ff4b4b"},
-    "Técnica":        {"border": "#38bdf8", "bg": "rgba(56,189,248,0.10)",   "text": "#38bdf8"},
-    "Táctico":        {"border": "#00c46a", "bg": "rgba(0,196,106,0.10)",    "text": "#00c46a"},
-    "Fútbol Formal":  {"border": "#a78bfa", "bg": "rgba(167,139,250,0.10)",  "text": "#a78bfa"},
-    "Fútbol formal":  {"border": "#a78bfa", "bg": "rgba(167,139,250,0.10)",  "text": "#a78bfa"},
-}
-TIPO_DEFAULT = {"border": "#00c46a", "bg": "rgba(0,196,106,0.10)", "text": "#00c46a"}
-
-# Orden canónico de días de la semana
-DIAS_ORDEN = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
-
-# Orden de posiciones para agrupar plantel
-POSICIONES_ORDEN = ["Arquero", "Defensor", "Mediocampista", "Delantero"]
-POS_PLURAL = {
-    "Arquero": "Arqueros",
-    "Defensor": "Defensores",
-    "Mediocampista": "Mediocampistas",
-    "Delantero": "Delanteros",
-}
-POS_EMOJI = {
-    "Arquero": "🧤",
-    "Defensor": "🔵",
-    "Mediocampista": "⚙️",
-    "Delantero": "⚡",
-}
-
-st.set_page_config(
-    page_title="Excursionistas — Reserva 2026",
-    page_icon="⚽",
-    layout="wide",
-    initial_sidebar_state="expanded",
-)
-
-# ─────────────────────────────────────────────
-#  CSS PERSONALIZADO
-# ─────────────────────────────────────────────
-st.markdown("""
-<style>
-/* Tarjeta de tarea — borde y fondo dinámico via inline style */
-.tarea-card {
-    border-radius: 8px;
-    padding: 12px 16px;
-    margin-bottom: 10px;
-    border-left: 4px solid #00c46a;
-}
-.tarea-titulo {
-    font-size: 1rem;
-    font-weight: 700;
-    color: #e8eaed;
-    margin-bottom: 4px;
-}
-.tarea-meta {
-    font-size: 0.82rem;
-    color: #8d9db6;
-}
-.tipo-badge {
-    display: inline-block;
-    border-radius: 4px;
-    padding: 2px 8px;
-    font-size: 0.75rem;
-    font-weight: 600;
-    margin-right: 6px;
-}
-/* Encabezado de día */
-.dia-header {
-    font-size: 1.05rem;
-    font-weight: 700;
-    color: #00c46a;
-    border-bottom: 1px solid rgba(0,196,106,0.3);
-    padding-bottom: 4px;
-    margin-bottom: 12px;
-    margin-top: 4px;
-}
-/* Scroll horizontal para la semana de entrenamientos */
-.semana-scroll-wrapper {
-    overflow-x: auto;
-    overflow-y: hidden;
-    padding-bottom: 12px;
-    margin: 0 -1rem;
-    padding-left: 1rem;
-    padding-right: 1rem;
-}
-.semana-scroll-wrapper::-webkit-scrollbar {
-    height: 8px;
-}
-.semana-scroll-wrapper::-webkit-scrollbar-track {
-    background: rgba(255,255,255,0.05);
-    border-radius: 4px;
-}
-.semana-scroll-wrapper::-webkit-scrollbar-thumb {
-    background: rgba(0,196,106,0.4);
-    border-radius: 4px;
-}
-.semana-scroll-wrapper::-webkit-scrollbar-thumb:hover {
-    background: rgba(0,196,106,0.7);
-}
-/* Forzar que las columnas de streamlit dentro del wrapper no se achiquen */
-.semana-scroll-wrapper [data-testid="stHorizontalBlock"] {
-    flex-wrap: nowrap !important;
-    overflow: visible !important;
-    min-width: max-content;
-}
-.semana-scroll-wrapper [data-testid="stHorizontalBlock"] > [data-testid="stColumn"] {
-    min-width: 320px !important;
-    flex: 0 0 320px !important;
-}
-/* Métricas de asistencia */
-.metric-pill {
-    display: inline-block;
-    border-radius: 20px;
-    padding: 6px 18px;
-    font-weight: 700;
-    font-size: 1.1rem;
-    margin-right: 8px;
-}
-.pill-verde    { background:rgba(0,196,106,0.15);  color:#00c46a; }
-.pill-rojo     { background:rgba(255,75,75,0.15);   color:#ff4b4b; }
-.pill-amarillo { background:rgba(255,214,0,0.15);   color:#ffd600; }
-/* Tarjeta de jugador */
-.jugador-card {
-    background: #1c2333;
-    border-radius: 12px;
-    padding: 14px 10px;
-    text-align: center;
-    margin-bottom: 12px;
-    cursor: pointer;
-    transition: transform .15s, box-shadow .15s;
-    border: 1px solid rgba(255,255,255,0.06);
-}
-.jugador-card:hover {
-    transform: translateY(-3px);
-    box-shadow: 0 6px 20px rgba(0,0,0,0.4);
-}
-.jugador-nombre {
-    font-size: .9rem;
-    font-weight: 700;
-    color: #e8eaed;
-    margin: 6px 0 2px;
-}
-.jugador-cat {
-    font-size: .78rem;
-    color: #8d9db6;
-}
-/* Sidebar */
-section[data-testid="stSidebar"] { background: #111827; }
-</style>
-""", unsafe_allow_html=True)
-
-
-# ─────────────────────────────────────────────
-#  CARGA DE DATOS
-# ─────────────────────────────────────────────
-
-def _sheet_url(sheet_name: str) -> str:
-    """Construye la URL de exportación CSV para una hoja del Sheets."""
-    return (
-        f"https://docs.google.com/spreadsheets/d/{SHEET_ID}"
-        f"/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-    )
-
-
-@st.cache_data(ttl=300)  # Refresca cada 5 minutos
-def load_sheet(sheet_name: str) -> pd.DataFrame:
-    """
-    Carga una hoja del Google Sheets público como DataFrame.
-    Parametros:
-        sheet_name: nombre exacto de la hoja (sensible a mayúsculas/tildes)
-    Retorna:
-        DataFrame con los datos de la hoja, o DataFrame vacío si hay error.
-    """
-    url = _sheet_url(sheet_name)
-    try:
-        df = pd.read_csv(url)
-        # Limpiar nombres de columna (espacios extra)
-        df.columns = df.columns.str.strip()
-        return df
-    except Exception as e:
-        st.warning(f"⚠️ No se pudo cargar '{sheet_name}': {e}")
-        return pd.DataFrame()
-
-
-# ─────────────────────────────────────────────
-#  SESSION STATE
-# ─────────────────────────────────────────────
-if "jugador_perfil" not in st.session_state:
-    st.session_state.jugador_perfil = None
-if "tema" not in st.session_state:
-    st.session_state.tema = "oscuro"   # valor inicial
-
-
-# ─────────────────────────────────────────────
-#  SIDEBAR — NAVEGACIÓN
-# ─────────────────────────────────────────────
-
-with st.sidebar:
-    # Centrar la imagen usando tres columnas
-    col_l, col_img, col_r = st.columns([1, 4, 1])
-    with col_img:
-        st.image(
-            "excursionistas.png",
-            width=180,
-        )
-    st.markdown("<h2 style='text-align: center'>Excursionistas 2026</h2>", unsafe_allow_html=True)
-    st.divider()
-
-    seccion = st.radio(
-        "Navegación",
-        options=["🏠 Inicio", "📅 Entrenamientos", "👥 Plantel", "🟡 Asistencia", "📹 Videoanálisis", "⚽ Post-Partido"],
-        label_visibility="collapsed",
-    )
-
-    st.divider()
-    if st.button("🔄 Refrescar datos"):
-        st.cache_data.clear()
-        st.rerun()
-
-    st.caption("Datos actualizados cada 5 min.")
-
-
-# ─────────────────────────────────────────────
-#  HELPER: carga todos los sheets de una vez
-# ─────────────────────────────────────────────
-
-@st.cache_data(ttl=300)
-def cargar_todo():
-    plantel         = load_sheet("Plantel")
-    sesiones        = load_sheet("Sesiones")
-    tareas          = load_sheet("Tareas")
-    asistencia      = load_sheet("Asistencia_Entrenamiento")
-    partidos        = load_sheet("Partidos")
-    postpartido     = load_sheet("PostPartido")
-    entrenamientos  = load_sheet("Entrenamientos_Dia")   # nuevo
-    videoanalisis   = load_sheet("Videoanalisis")
-    return plantel, sesiones, tareas, asistencia, partidos, postpartido, entrenamientos, videoanalisis
-
-
-plantel, sesiones, tareas, asistencia, partidos, postpartido, entrenamientos, videoanalisis = cargar_todo()
-
-
-# ─────────────────────────────────────────────
-#  HELPER: normalizar columna fecha
-# ─────────────────────────────────────────────
-
-def parse_fecha(s: pd.Series) -> pd.Series:
-    return pd.to_datetime(s, dayfirst=True, errors="coerce")
-
-
-# helper para leer categoría (admite acento o sin acento en el nombre de columna)
-def get_categoria(row):
-    for col in ["categoría", "categoria", "anio_nac"]:
-        if col in row.index and pd.notna(row[col]) and str(row[col]).strip() not in ("", "nan"):
-            return str(row[col]).strip()
-    return "—"
-
-
-# ══════════════════════════════════════════════
-#  🏠  INICIO
-# ══════════════════════════════════════════════
-
-if seccion == "🏠 Inicio":
-    st.title("⚽ Excursionistas — Reserva 2026")
-    st.markdown("---")
-
-    col1, col2 = st.columns(2, gap="large")
-
-    # — Orden del día —
-    hoy = pd.Timestamp(date.today())
-    DIAS_ES = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
-    dia_hoy_nombre = DIAS_ES[hoy.weekday()].title()
-
-    with col1:
-        st.subheader("📋 Orden del día")
-        # Buscar sesión de la semana actual
-        tareas_hoy_html = ""
-        encontrado = False
-        if not sesiones.empty and not entrenamientos.empty and not tareas.empty:
-            df_ses_h = sesiones.copy()
-            df_ses_h["fecha_inicio_semana"] = parse_fecha(df_ses_h["fecha_inicio_semana"])
-            df_ses_h = df_ses_h.dropna(subset=["fecha_inicio_semana"])
-            # Sesión más reciente cuya fecha_inicio <= hoy
-            ses_act = df_ses_h[df_ses_h["fecha_inicio_semana"] <= hoy].sort_values(
-                "fecha_inicio_semana", ascending=False
-            )
-            if not ses_act.empty:
-                id_ses_hoy = ses_act.iloc[0]["id_sesion"]
-                ids_dia_hoy = entrenamientos.loc[
-                    entrenamientos["id_sesion"] == id_ses_hoy, "id_entreno_dia"
-                ].tolist()
-                if ids_dia_hoy and "id_entreno_dia" in tareas.columns:
-                    t_hoy = tareas[tareas["id_entreno_dia"].isin(ids_dia_hoy)].copy()
-                    if "dia_semana" not in t_hoy.columns:
-                        dias_map = entrenamientos[entrenamientos["id_entreno_dia"].isin(ids_dia_hoy)]
-                        t_hoy = t_hoy.merge(dias_map[["id_entreno_dia", "dia_semana"]], on="id_entreno_dia", how="left")
-                    t_hoy["dia_semana"] = t_hoy["dia_semana"].astype(str).str.strip().str.title()
-                    t_hoy = t_hoy[t_hoy["dia_semana"] == dia_hoy_nombre].sort_values("orden")
-                    if not t_hoy.empty:
-                        encontrado = True
-                        cards = ""
-                        for _, t in t_hoy.iterrows():
-                            nombre  = t.get("nombre_tarea", "Sin nombre")
-                            tipo    = str(t.get("tipo", "")).strip()
-                            mins    = t.get("tiempo_min", "")
-                            descr_v = str(t.get("descrip_tarea", "")).strip()
-                            colores = TIPO_COLORES.get(tipo, TIPO_DEFAULT)
-                            bc = colores["border"]; bg = colores["bg"]; tc = colores["text"]
-                            mins_str = f"{int(float(mins))} min" if pd.notna(mins) and str(mins).strip() not in ("", "nan") else ""
-                            tipo_h = f"<span class='tipo-badge' style='background:{bg};color:{tc};'>{tipo}</span>" if tipo and tipo.lower() not in ("nan","none","") else ""
-                            mins_h = f"⏱ {mins_str}" if mins_str else ""
-                            meta_h = f"<div class='tarea-meta' style='margin-top:4px;'>{tipo_h}{mins_h}</div>" if (tipo_h or mins_h) else ""
-                            desc_h = (f"<div style='font-size:0.83rem;color:#e8eaed;font-weight:400;margin:5px 0 6px;line-height:1.4;'>{descr_v}</div>"
-                                      if descr_v and descr_v.lower() not in ("nan","none","") else "")
-                            cards += (f"<div class='tarea-card' style='background:{bg};border-left:4px solid {bc};'>"
-                                      f"<div style='font-size:1.05rem;font-weight:700;color:#e8eaed;margin-bottom:2px;'>{nombre}</div>"
-                                      f"{desc_h}{meta_h}</div>")
-                        st.markdown(
-                            f"<div style='background:{COLOR_CARD};border-radius:10px;padding:16px;'>"
-                            f"<p style='color:#8d9db6;font-size:.85rem;margin:0 0 10px;'>📆 {dia_hoy_nombre}</p>"
-                            f"{cards}</div>",
-                            unsafe_allow_html=True,
-                        )
-        if not encontrado:
-            st.info(f"No hay entrenamiento registrado para hoy ({dia_hoy_nombre}).")
-
-    # — Próximo partido —
-    with col2:
-        st.subheader("🏟️ Próximo partido")
-        if partidos.empty:
-            st.info("Sin partidos registrados.")
-        else:
-            df_p = partidos.copy()
-            df_p["fecha"] = parse_fecha(df_p["fecha"])
-            hoy = pd.Timestamp(date.today())
-            proximos = df_p[df_p["fecha"] >= hoy].sort_values("fecha")
-            if proximos.empty:
-                st.info("No hay partidos próximos cargados.")
-            else:
-                prox = proximos.iloc[0]
-                dias_restantes = (prox["fecha"] - hoy).days
-                nombre_dia = DIAS_ES[prox["fecha"].weekday()]
-                horario = str(prox.get("horario", "")).strip()
-                horario_html = f"&nbsp;⏰ {horario}" if horario and horario.lower() not in ("nan", "none", "") else ""
-                st.markdown(f"""
-                <div style='background:{COLOR_CARD};border-radius:10px;padding:20px;'>
-                    <p style='color:#8d9db6;font-size:.85rem;margin:0'>Rival</p>
-                    <p style='font-size:1.8rem;font-weight:800;color:{COLOR_VERDE};margin:0'>
-                        {prox.get('rival','—')}
-                    </p>
-                    <p style='color:{COLOR_TEXTO};margin:4px 0 0;'>
-                        📅 <b>{nombre_dia}</b>{horario_html}
-                        &nbsp;|&nbsp; {prox.get('torneo','—')}
-                    </p>
-                    <p style='color:{COLOR_NARANJA};font-weight:600;margin-top:6px'>
-                        ⏳ {dias_restantes} día{'s' if dias_restantes != 1 else ''}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-
-
-# ══════════════════════════════════════════════
-#  📅  ENTRENAMIENTOS
-# ══════════════════════════════════════════════
-
-elif seccion == "📅 Entrenamientos":
-    st.title("📅 Entrenamientos")
-    st.markdown("---")
-
-    if sesiones.empty or tareas.empty:
-        st.warning("No hay datos de sesiones o tareas disponibles.")
-    else:
-        # ── Preparar fechas ─────────────────────────────────────────
-        hoy = pd.Timestamp(date.today())
-        df_ses_tmp = sesiones.copy()
-        df_ses_tmp["fecha_inicio_semana"] = parse_fecha(df_ses_tmp["fecha_inicio_semana"])
-        df_ses_tmp = df_ses_tmp.dropna(subset=["fecha_inicio_semana"])
-        df_ses_tmp["mes"]  = df_ses_tmp["fecha_inicio_semana"].dt.month
-        df_ses_tmp["anio"] = df_ses_tmp["fecha_inicio_semana"].dt.year
-
-        MESES_ES = {
-            1: "Enero", 2: "Febrero", 3: "Marzo",    4: "Abril",
-            5: "Mayo",  6: "Junio",   7: "Julio",    8: "Agosto",
-            9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre",
-        }
-
-        # Meses disponibles ordenados cronológicamente
-        meses_disp  = sorted(df_ses_tmp[["anio", "mes"]].drop_duplicates().itertuples(index=False))
-        meses_labels = [
-            MESES_ES[m.mes] + (f" {m.anio}" if m.anio != hoy.year else "")
-            for m in meses_disp
-        ]
-        meses_keys = [(m.anio, m.mes) for m in meses_disp]
-
-        # Pre-seleccionar mes actual (o el más reciente pasado)
-        mes_actual_key = (hoy.year, hoy.month)
-        if mes_actual_key in meses_keys:
-            idx_mes = meses_keys.index(mes_actual_key)
-        else:
-            pasados_mes = [(i, k) for i, k in enumerate(meses_keys) if k <= mes_actual_key]
-            idx_mes = pasados_mes[-1][0] if pasados_mes else 0
-
-        col_mes, _ = st.columns([2, 3])
-        with col_mes:
-            mes_label_sel = st.selectbox("📆 Mes", options=meses_labels, index=idx_mes)
-        mes_sel_key = meses_keys[meses_labels.index(mes_label_sel)]
-
-        # ── Semanas del mes seleccionado ────────────────────────────
-        ses_mes = df_ses_tmp[
-            (df_ses_tmp["anio"] == mes_sel_key[0]) &
-            (df_ses_tmp["mes"]  == mes_sel_key[1])
-        ]
-        semanas_disp = sorted(ses_mes["semana_num"].dropna().unique().tolist())
-
-        if not semanas_disp:
-            st.info("No hay semanas registradas para ese mes.")
-        else:
-            # Auto-seleccionar semana actual dentro del mes
-            pasadas_mes = ses_mes[ses_mes["fecha_inicio_semana"] <= hoy].sort_values(
-                "fecha_inicio_semana", ascending=False
-            )
-            semana_actual = pasadas_mes.iloc[0]["semana_num"] if not pasadas_mes.empty else semanas_disp[0]
-            idx_sem = semanas_disp.index(semana_actual) if semana_actual in semanas_disp else 0
-
-            semana_sel = st.selectbox(
-                "Seleccioná la semana",
-                options=semanas_disp,
-                index=idx_sem,
-                format_func=lambda x: f"Semana {int(x)}",
-            )
-
-            # ── Filtrar sesión ──────────────────────────────────────
-            sesion_sem = sesiones[sesiones["semana_num"] == semana_sel]
-            if sesion_sem.empty:
-                st.info("Sin sesión para esa semana.")
-            else:
-                id_sesion_sel = sesion_sem.iloc[0]["id_sesion"]
-                tipo_sem      = sesion_sem.iloc[0].get("tipo_semana", "")
-                fecha_ini     = parse_fecha(
-                    pd.Series([sesion_sem.iloc[0]["fecha_inicio_semana"]])
-                ).iloc[0]
-
-                cols_info = st.columns(3)
-                cols_info[0].metric("Semana", int(semana_sel))
-                cols_info[1].metric("Tipo", tipo_sem if tipo_sem else "—")
-                cols_info[2].metric(
-                    "Inicio",
-                    fecha_ini.strftime("%d/%m/%Y") if pd.notna(fecha_ini) else "—",
-                )
-                st.markdown("---")
-
-                # ── Días de entrenamiento ───────────────────────────
-                if not entrenamientos.empty and "id_sesion" in entrenamientos.columns:
-                    dias_semana = entrenamientos[
-                        entrenamientos["id_sesion"] == id_sesion_sel
-                    ].copy()
-                else:
-                    dias_semana = pd.DataFrame()
-
-                if dias_semana.empty:
-                    st.info("No hay días de entrenamiento registrados para esta semana.")
-                else:
-                    ids_dia = dias_semana["id_entreno_dia"].tolist()
-
-                    if "id_entreno_dia" in tareas.columns:
-                        tareas_sem = tareas[tareas["id_entreno_dia"].isin(ids_dia)].copy()
-                        if "dia_semana" not in tareas_sem.columns:
-                            tareas_sem = tareas_sem.merge(
-                                dias_semana[["id_entreno_dia", "dia_semana"]],
-                                on="id_entreno_dia",
-                                how="left",
-                            )
-                    else:
-                        tareas_sem = (
-                            tareas[tareas["id_sesion"] == id_sesion_sel].copy()
-                            if "id_sesion" in tareas.columns else pd.DataFrame()
-                        )
-
-                    if tareas_sem.empty:
-                        st.info("No hay tareas cargadas para esta semana.")
-                    else:
-                        tareas_sem["dia_semana"] = tareas_sem["dia_semana"].astype(str).str.strip().str.title()
-                        tareas_sem = tareas_sem[
-                            ~tareas_sem["dia_semana"].str.lower().isin(["nan", "none", ""])
-                        ]
-
-                        st.markdown("<div class='semana-scroll-wrapper'>", unsafe_allow_html=True)
-                        cols_dias = st.columns(7, gap="medium")
-                        for col_widget, dia in zip(cols_dias, DIAS_ORDEN):
-                            with col_widget:
-                                st.markdown(f"<div class='dia-header'>📆 {dia}</div>", unsafe_allow_html=True)
-                                
-                                # -- Información de Asistencia Diaria --
-                                info_asistencia_html = ""
-                                if not asistencia.empty and not plantel.empty and not dias_semana.empty:
-                                    dia_row = dias_semana[dias_semana["dia_semana"].str.strip().str.title() == dia]
-                                    if not dia_row.empty:
-                                        id_entreno_dia_actual = dia_row.iloc[0]["id_entreno_dia"]
-                                        ast_dia = asistencia[asistencia["id_entreno_dia"] == id_entreno_dia_actual]
-                                        
-                                        if not ast_dia.empty:
-                                            ast_dia = ast_dia.merge(
-                                                plantel[["id_jugador", "nombre"]],
-                                                on="id_jugador",
-                                                how="left"
-                                            )
-                                            total_dia = len(ast_dia)
-                                            ausentes = ast_dia[ast_dia["estado"] == "Ausente"]["nombre"].dropna().tolist()
-                                            diferenciados = ast_dia[ast_dia["estado"] == "Diferenciado"]["nombre"].dropna().tolist()
-                                            
-                                            # Construir texto de jugadores no disponibles 
-                                            lista_nombres = []
-                                            if ausentes:
-                                                lista_nombres.append(f"{', '.join(ausentes)} ausente")
-                                            if diferenciados:
-                                                lista_nombres.append(f"{', '.join(diferenciados)} diferenciado")
-                                                
-                                            detalle_str = f" ({'; '.join(lista_nombres)})" if lista_nombres else ""
-                                            
-                                            info_asistencia_html = (
-                                                f"<div style='margin-bottom:12px; font-size:0.85rem; color:#8d9db6; "
-                                                f"background:rgba(255,255,255,0.03); padding:6px; border-radius:6px;'>"
-                                                f"<b>{total_dia} jugadores</b>{detalle_str}"
-                                                f"</div>"
-                                            )
-                                
-                                if info_asistencia_html:
-                                    st.markdown(info_asistencia_html, unsafe_allow_html=True)
-
-                                if dia in tareas_sem["dia_semana"].values:
-                                    tareas_dia = (
-                                        tareas_sem[tareas_sem["dia_semana"] == dia]
-                                        .sort_values("orden")
-                                    )
-                                    for _, t in tareas_dia.iterrows():
-                                        nombre = t.get("nombre_tarea", "Sin nombre")
-                                        tipo   = str(t.get("tipo", "")).strip()
-                                        mins   = t.get("tiempo_min", "")
-                                        yt_url = str(t.get("link_youtube", "")).strip()
-
-                                        colores = TIPO_COLORES.get(tipo, TIPO_DEFAULT)
-                                        border_color = colores["border"]
-                                        bg_color     = colores["bg"]
-                                        text_color   = colores["text"]
-
-                                        mins_str  = f"{int(float(mins))} min" if pd.notna(mins) and str(mins).strip() not in ("", "nan") else ""
-                                        tipo_html = (
-                                            f"<span class='tipo-badge' style='background:{bg_color};color:{text_color};'>"
-                                            f"{tipo}</span>"
-                                        ) if tipo and tipo.lower() not in ("nan", "none", "") else ""
-                                        mins_html = f"⏱ {mins_str}" if mins_str else ""
-
-                                        meta_html = (
-                                            f"<div class='tarea-meta' style='margin-top:4px;'>{tipo_html}{mins_html}</div>"
-                                        ) if (tipo_html or mins_html) else ""
-
-                                        descr_val = str(t.get("descrip_tarea", "")).strip()
-                                        descr_html = (
-                                            f"<div style='font-size:0.83rem;color:#e8eaed;font-weight:400;"
-                                            f"margin:5px 0 6px;line-height:1.4;'>{descr_val}</div>"
-                                        ) if descr_val and descr_val.lower() not in ("nan", "none", "") else ""
-
-                                        yt_html = (
-                                            f"<div style='margin-top:8px;'>"
-                                            f"<a href='{yt_url}' target='_blank' "
-                                            f"style='font-size:0.8rem;color:#38bdf8;text-decoration:none;'>"
-                                            f"▶ Ver vídeo</a></div>"
-                                        ) if yt_url and yt_url.lower() not in ("", "nan", "none") else ""
-
-                                        st.markdown(
-                                            f"<div class='tarea-card' style='background:{bg_color};border-left:4px solid {border_color};'>"
-                                            f"<div style='font-size:1.05rem;font-weight:700;color:#e8eaed;margin-bottom:2px;'>{nombre}</div>"
-                                            f"{descr_html}"
-                                            f"{meta_html}"
-                                            f"{yt_html}"
-                                            f"</div>",
-                                            unsafe_allow_html=True,
-                                        )
-                                else:
-                                    st.caption("Sin tareas")
-                        st.markdown("</div>", unsafe_allow_html=True)
-
-
-# ══════════════════════════════════════════════
-#  👥  PLANTEL
-# ══════════════════════════════════════════════
-
-elif seccion == "👥 Plantel":
-
-    # ── Sub-vista: perfil individual ──────────────────────────────
-    if st.session_state.jugador_perfil is not None:
-        jug_nombre = st.session_state.jugador_perfil
-        if st.button("← Volver al plantel"):
-            st.session_state.jugador_perfil = None
-            st.rerun()
-
-        if not plantel.empty and jug_nombre in plantel["nombre"].values:
-            jug    = plantel[plantel["nombre"] == jug_nombre].iloc[0]
-            id_jug = jug["id_jugador"]
-
-            st.title(f"👤 {jug['nombre']}")
-            st.markdown("---")
-
-            col_foto, col_datos = st.columns([1, 3], gap="large")
-
-            with col_foto:
-                foto_url = str(jug.get("foto_url", "")).strip()
-                if foto_url and foto_url.lower() not in ("nan", "none", ""):
-                    st.image(foto_url, width=200)
-                else:
-                    st.markdown(
-                        f"<div style='width:180px;height:180px;background:{COLOR_CARD};"
-                        f"border-radius:16px;display:flex;align-items:center;"
-                        f"justify-content:center;font-size:5rem;'>👤</div>",
-                        unsafe_allow_html=True,
-                    )
-
-            with col_datos:
-                col_a, col_b = st.columns(2)
-                col_a.markdown(f"**Posición:** {jug.get('posicion','—')}")
-                col_b.markdown(f"**Categoría:** {get_categoria(jug)}")
-
-                # Conteo de asistencia
-                if not asistencia.empty:
-                    ast_jug      = asistencia[asistencia["id_jugador"] == id_jug]
-                    presente     = int((ast_jug["estado"] == "Presente").sum())
-                    ausente      = int((ast_jug["estado"] == "Ausente").sum())
-                    diferenciado = int((ast_jug["estado"] == "Diferenciado").sum())
-                    total        = presente + ausente + diferenciado
-
-                    st.markdown("#### 📊 Asistencia a entrenamientos")
-                    st.markdown(
-                        f"<span class='metric-pill pill-verde'>✅ Presente: {presente}</span>"
-                        f"<span class='metric-pill pill-rojo'>❌ Ausente: {ausente}</span>"
-                        f"<span class='metric-pill pill-amarillo'>⚠️ Diferenciado: {diferenciado}</span>",
-                        unsafe_allow_html=True,
-                    )
-                    if total > 0:
-                        fig_pie = px.pie(
-                            values=[presente, ausente, diferenciado],
-                            names=["Presente", "Ausente", "Diferenciado"],
-                            color_discrete_sequence=[COLOR_VERDE, "#ff4b4b", "#ffd600"],
-                            hole=0.45,
-                        )
-                        fig_pie.update_layout(
-                            margin=dict(t=10, b=10, l=10, r=10),
-                            paper_bgcolor="rgba(0,0,0,0)",
-                            plot_bgcolor="rgba(0,0,0,0)",
-                            legend=dict(font=dict(color="#e8eaed")),
-                        )
-                        st.plotly_chart(fig_pie, use_container_width=True)
-                else:
-                    st.info("Sin datos de asistencia.")
-
-                # Estadísticas de partidos
-                st.markdown("#### ⚽ Estadísticas de partidos")
-                if not postpartido.empty:
-                    pp_jug = postpartido[postpartido["id_jugador"] == id_jug].copy()
-                    if not pp_jug.empty:
-                        for col_pp in ["minutos", "goles", "asistencias"]:
-                            if col_pp in pp_jug.columns:
-                                pp_jug[col_pp] = pd.to_numeric(pp_jug[col_pp], errors="coerce").fillna(0)
-                        mc1, mc2, mc3, mc4 = st.columns(4)
-                        mc1.metric("Partidos",    len(pp_jug))
-                        mc2.metric("Minutos",     int(pp_jug["minutos"].sum()) if "minutos" in pp_jug.columns else "—")
-                        mc3.metric("Goles",       int(pp_jug["goles"].sum())   if "goles" in pp_jug.columns else "—")
-                        mc4.metric("Asistencias", int(pp_jug["asistencias"].sum()) if "asistencias" in pp_jug.columns else "—")
-                    else:
-                        st.info("Sin estadísticas de partidos.")
-                else:
-                    st.info("Sin datos de postpartido.")
-
-                with st.expander("📈 Más estadísticas (próximamente)"):
-                    st.info("Aquí se agregarán métricas de rendimiento físico, posesión, pressing, etc.")
-                    
-                # ── Videos del Jugador (Videoanálisis) ──
-                if not videoanalisis.empty and "jugadores_etiquetados" in videoanalisis.columns:
-                    # Buscar videos que incluyan el nombre del jugador
-                    vid_jug = videoanalisis[
-                        videoanalisis["jugadores_etiquetados"].fillna("").str.contains(jug["nombre"], case=False, na=False)
-                    ]
-                    
-                    if not vid_jug.empty:
-                        st.markdown("---")
-                        st.markdown("#### 📹  Videoanálisis personal")
-                        st.caption(f"Clips tácticos y resúmenes vinculados a {jug['nombre']}")
-                        
-                        # Combinar con Partidos para obtener información de fecha y rival (opcional, solo para mostrar)
-                        if not partidos.empty and "id_partido" in vid_jug.columns:
-                            vid_jug = vid_jug.merge(
-                                partidos[["id_partido", "rival", "fecha"]],
-                                on="id_partido",
-                                how="left"
-                            )
-
-                        # Crear opciones de filtro de partido
-                        def get_contexto(row):
-                            rival_str = row.get("rival", "")
-                            fecha_part = row.get("fecha", pd.NaT)
-                            if pd.notna(rival_str) and rival_str != "":
-                                if pd.notna(fecha_part):
-                                    return f"vs {rival_str} ({parse_fecha(pd.Series([fecha_part])).iloc[0].strftime('%d/%m')})"
-                                return f"vs {rival_str}"
-                            return "Sin asignar a partido"
-
-                        vid_jug["contexto_partido"] = vid_jug.apply(get_contexto, axis=1)
-                        partidos_disponibles = sorted(vid_jug["contexto_partido"].unique().tolist())
-                        
-                        if partidos_disponibles:
-                            partidos_con_todos = ["Todos los partidos"] + partidos_disponibles
-                            partido_filtro = st.selectbox("Filtrar clips por:", partidos_con_todos, key="filtro_vid_jugador")
-                            
-                            if partido_filtro != "Todos los partidos":
-                                vid_jug = vid_jug[vid_jug["contexto_partido"] == partido_filtro]
-                                
-                        st.markdown("<br>", unsafe_allow_html=True)
-                        
-                        if vid_jug.empty:
-                            st.info("No hay videos para este filtro.")
-                        else:
-                            # Mostrar en grilla de 2 columnas
-                            for fila_start in range(0, len(vid_jug), 2):
-                                fila = vid_jug.iloc[fila_start : fila_start + 2]
-                                cols_vid = st.columns(2, gap="large")
-                                
-                                for col_v, (_, vid_row) in zip(cols_vid, fila.iterrows()):
-                                    with col_v:
-                                        titulo = vid_row.get("titulo", "Sin título")
-                                        tipo = vid_row.get("tipo_analisis", "")
-                                        desc = vid_row.get("descripcion", "")
-                                        link = str(vid_row.get("link_youtube", "")).strip()
-                                        contexto_str = vid_row.get("contexto_partido", "Video")
-                                            
-                                        st.markdown(f"**{titulo}** | {contexto_str}")
-                                    
-                                    if tipo and pd.notna(tipo):
-                                        st.caption(f"📌 {tipo}")
-                                        
-                                    if link and link.lower() not in ("nan", "none", ""):
-                                        try:
-                                            st.video(link)
-                                        except Exception:
-                                            st.error("Enlace de video inválido")
-                                    else:
-                                        st.info("Video no disponible o link roto")
-                                        
-                                    if desc and pd.notna(desc):
-                                        st.markdown(f"*{desc}*")
-                                        
-                                    st.markdown("<br>", unsafe_allow_html=True)
-
-    # ── Vista principal: tarjetas por posición ────────────────────
-    else:
-        st.title("👥 Plantel")
-        st.markdown("---")
-
-        if plantel.empty:
-            st.warning("No hay datos de plantel disponibles.")
-        else:
-            # Agrupar por posición (orden POSICIONES_ORDEN + el resto)
-            posiciones_en_plantel = plantel["posicion"].dropna().unique().tolist()
-            orden = [p for p in POSICIONES_ORDEN if p in posiciones_en_plantel]
-            orden += [p for p in posiciones_en_plantel if p not in POSICIONES_ORDEN]
-
-            CARDS_POR_FILA = 5
-
-            for pos in orden:
-                jugadores_pos = plantel[plantel["posicion"] == pos].reset_index(drop=True)
-                emoji_pos  = POS_EMOJI.get(pos, "👤")
-                titulo_pos = POS_PLURAL.get(pos, f"{pos}s")
-                st.markdown(f"### {emoji_pos} {titulo_pos}")
-
-                for fila_start in range(0, len(jugadores_pos), CARDS_POR_FILA):
-                    fila = jugadores_pos.iloc[fila_start : fila_start + CARDS_POR_FILA]
-                    cols_cards = st.columns(len(fila), gap="small")
-                    for col_c, (_, jug_row) in zip(cols_cards, fila.iterrows()):
-                        with col_c:
-                            foto_url  = str(jug_row.get("foto_url", "")).strip()
-                            categoria = get_categoria(jug_row)
-                            nombre    = jug_row.get("nombre", "")
-
-                            # Foto o avatar
-                            if foto_url and foto_url.lower() not in ("nan", "none", ""):
-                                st.image(foto_url, use_column_width=True)
-                            else:
-                                st.markdown(
-                                    "<div style='height:120px;background:#1c2333;"
-                                    "border-radius:10px;display:flex;align-items:center;"
-                                    "justify-content:center;font-size:3rem;'>👤</div>",
-                                    unsafe_allow_html=True,
-                                )
-
-                            st.markdown(
-                                f"<div style='text-align:center;padding:4px 0;'>"
-                                f"<div style='font-weight:700;color:#e8eaed;font-size:.9rem;'>{nombre}</div>"
-                                f"<div style='color:#8d9db6;font-size:.78rem;'>{categoria}</div>"
-                                f"</div>",
-                                unsafe_allow_html=True,
-                            )
-                            # Botón para ingresar al perfil
-                            if st.button("Ver perfil", key=f"btn_{jug_row['id_jugador']}", use_container_width=True):
-                                st.session_state.jugador_perfil = nombre
-                                st.rerun()
-
-                st.markdown("---")
-
-
-# ══════════════════════════════════════════════
-#  🟡  ASISTENCIA
-# ══════════════════════════════════════════════
-
-elif seccion == "🟡 Asistencia":
-    st.title("🟡 Asistencia a Entrenamientos")
-    st.markdown("---")
-
-    if sesiones.empty or asistencia.empty:
-        st.warning("No hay datos de sesiones o asistencia disponibles.")
-    else:
-        # ── Selector de semana ──────────────────────────────────────
-        df_ses = sesiones.copy()
-        df_ses["fecha_inicio_semana"] = parse_fecha(df_ses["fecha_inicio_semana"])
-        df_ses["label"] = df_ses.apply(
-            lambda r: f"Semana {int(r['semana_num'])}  —  "
-                      f"{r['fecha_inicio_semana'].strftime('%d/%m/%Y') if pd.notna(r['fecha_inicio_semana']) else ''}",
-            axis=1,
-        )
-        df_ses_sorted = df_ses.sort_values("fecha_inicio_semana", ascending=False)
-
-        semana_label = st.selectbox(
-            "Seleccioná la semana",
-            options=df_ses_sorted["label"].tolist(),
-        )
-        id_sesion_sel = df_ses_sorted.loc[
-            df_ses_sorted["label"] == semana_label, "id_sesion"
-        ].values[0]
-
-        # ── Resolver id_entreno_dia de esa semana ───────────────────
-        if not entrenamientos.empty and "id_sesion" in entrenamientos.columns:
-            ids_dia_semana = entrenamientos.loc[
-                entrenamientos["id_sesion"] == id_sesion_sel, "id_entreno_dia"
-            ].tolist()
-        else:
-            ids_dia_semana = []
-
-        # ── Filtrar asistencia ───────────────────────────────────────
-        if "id_entreno_dia" in asistencia.columns and ids_dia_semana:
-            ast_fil = asistencia[asistencia["id_entreno_dia"].isin(ids_dia_semana)].copy()
-        elif "id_sesion" in asistencia.columns:
-            # fallback: la tabla aún tiene id_sesion directamente
-            ast_fil = asistencia[asistencia["id_sesion"] == id_sesion_sel].copy()
-        else:
-            ast_fil = pd.DataFrame()
-
-        if ast_fil.empty:
-            st.info("Sin datos de asistencia para este día.")
-        else:
-            # Join con plantel para mostrar nombres
-            if not plantel.empty:
-                ast_fil = ast_fil.merge(
-                    plantel[["id_jugador", "nombre", "posicion"]],
-                    on="id_jugador",
-                    how="left",
-                )
-
-            # Rellenar nulos para armar correctamente el resumen
-            if "nombre" in ast_fil.columns:
-                ast_fil["nombre"] = ast_fil["nombre"].fillna("Desconocido")
-            if "posicion" in ast_fil.columns:
-                ast_fil["posicion"] = ast_fil["posicion"].fillna("—")
-            if "estado" in ast_fil.columns:
-                ast_fil["estado"] = ast_fil["estado"].fillna("Sin registro")
-
-            # Agrupar por jugador
-            if 'nombre' in ast_fil.columns:
-                df_resumen = ast_fil.groupby(['nombre', 'posicion', 'estado']).size().unstack(fill_value=0).reset_index()
-                df_resumen.columns.name = None
-                
-                for est in ["Presente", "Ausente", "Diferenciado"]:
-                    if est not in df_resumen.columns:
-                        df_resumen[est] = 0
-                        
-                df_resumen["Sesiones"] = df_resumen["Presente"] + df_resumen["Ausente"] + df_resumen["Diferenciado"]
-                total_jugadores = len(df_resumen)
-                
-                # Métricas rápidas (contar si el jugador tuvo AL MENOS UN ausente/diferenciado en la semana)
-                ausente = int((df_resumen["Ausente"] > 0).sum())
-                diferenciado = int((df_resumen["Diferenciado"] > 0).sum())
-                # Presente es el resto o si tiene al menos un presente
-                presente = int((df_resumen["Presente"] > 0).sum())
-            else:
-                df_resumen = pd.DataFrame()
-                total_jugadores = ast_fil["id_jugador"].nunique() if "id_jugador" in ast_fil.columns else len(ast_fil)
-                presente     = int((ast_fil["estado"] == "Presente").sum())
-                ausente      = int((ast_fil["estado"] == "Ausente").sum())
-                diferenciado = int((ast_fil["estado"] == "Diferenciado").sum())
-
-            c1, c2, c3, c4 = st.columns(4)
-            c1.metric("Jugadores", total_jugadores)
-            c2.metric("✅ Presentes",     presente)
-            c3.metric("❌ Ausentes",      ausente)
-            c4.metric("⚠️ Diferenciados", diferenciado)
-
-            st.markdown("---")
-
-            col_tabla, col_grafico = st.columns([3, 2], gap="large")
-
-            with col_tabla:
-                st.subheader("📋 Detalle por Jugador")
-                if not df_resumen.empty:
-                    # Renombrar columnas para mejor visualización
-                    df_resumen = df_resumen.rename(columns={
-                        "Presente": "✅ Presente",
-                        "Ausente": "❌ Ausente",
-                        "Diferenciado": "⚠️ Diferenciado"
-                    })
-                    # Ordenar prioritariamente por presencias y luego nombre
-                    df_resumen = df_resumen.sort_values(by=["✅ Presente", "nombre"], ascending=[False, True])
-                    
-                    cols_vis = ["nombre", "posicion", "✅ Presente", "❌ Ausente", "⚠️ Diferenciado", "Sesiones"]
-                    st.dataframe(df_resumen[cols_vis], use_container_width=True, hide_index=True)
-                else:
-                    cols_vis = [c for c in ["nombre", "posicion", "estado"] if c in ast_fil.columns]
-                    st.dataframe(ast_fil[cols_vis], use_container_width=True, hide_index=True)
-
-            with col_grafico:
-                st.subheader("📊 Distribución")
-                fig_bar = px.bar(
-                    x=["Presente", "Ausente", "Diferenciado"],
-                    y=[presente, ausente, diferenciado],
-                    color=["Presente", "Ausente", "Diferenciado"],
-                    color_discrete_map={
-                        "Presente": COLOR_VERDE,
-                        "Ausente": "#ff4b4b",
-                        "Diferenciado": "#ffd600",
-                    },
-                    labels={"x": "Estado", "y": "Jugadores"},
-                    text_auto=True,
-                )
-                fig_bar.update_layout(
-                    showlegend=False,
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    font=dict(color="#e8eaed"),
-                    margin=dict(t=10, b=10),
-                )
-                fig_bar.update_xaxes(showgrid=False)
-                fig_bar.update_yaxes(gridcolor="rgba(255,255,255,0.07)")
-                st.plotly_chart(fig_bar, use_container_width=True)
-
-                fig_pie = px.pie(
-                    values=[presente, ausente, diferenciado],
-                    names=["Presente", "Ausente", "Diferenciado"],
-                    color_discrete_sequence=[COLOR_VERDE, "#ff4b4b", "#ffd600"],
-                    hole=0.4,
-                )
-                fig_pie.update_layout(
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    font=dict(color="#e8eaed"),
-                    margin=dict(t=10, b=10),
-                    legend=dict(font=dict(color="#e8eaed")),
-                )
-                st.plotly_chart(fig_pie, use_container_width=True)
-
-
-# ══════════════════════════════════════════════
-#  📹  VIDEOANÁLISIS
-# ══════════════════════════════════════════════
-
-elif seccion == "📹 Videoanálisis":
-    st.title("📹 Videoanálisis")
-    st.markdown("---")
-
-    if partidos.empty or videoanalisis.empty:
-        st.warning("No hay datos de partidos o videos cargados.")
-    else:
-        df_par = partidos.copy()
-        df_par["fecha"] = parse_fecha(df_par["fecha"])
-        df_par["label"] = df_par.apply(
-            lambda r: f"{r['fecha'].strftime('%d/%m/%Y') if pd.notna(r['fecha']) else '—'}  vs  "
-                      f"{r.get('rival','?')}  ({r.get('torneo','—')})",
-            axis=1,
-        )
-        df_par_sorted = df_par.sort_values("fecha", ascending=False)
-
-        # ── Selector de Partido ──
-        col_sel_p, _ = st.columns([2, 2])
-        with col_sel_p:
-            partido_label = st.selectbox("Seleccioná el partido a analizar", df_par_sorted["label"].tolist())
-            
-        id_partido_sel = df_par_sorted.loc[
-            df_par_sorted["label"] == partido_label, "id_partido"
-        ].values[0]
-
-        # ── Filtrar videos del partido ──
-        vid_fil = videoanalisis[videoanalisis["id_partido"] == id_partido_sel].copy()
-
-        if vid_fil.empty:
-            st.info("No hay recortes de video disponibles para este partido.")
-        else:
-            # ── Filtros combinados: Tipo y Jugador ──
-            col_f1, col_f2 = st.columns(2)
-            
-            with col_f1:
-                # ── Filtro por tipo de análisis ──
-                tipos_disponibles = vid_fil["tipo_analisis"].dropna().unique().tolist()
-                tipos_con_todos = ["Todos"] + tipos_disponibles if tipos_disponibles else ["Todos"]
-                tipo_sel = st.selectbox("Categoría de análisis", tipos_con_todos)
-
-            with col_f2:
-                # ── Filtro por Jugador (desde jugadores_etiquetados) ──
-                todos_jugadores = []
-                for j_str in vid_fil["jugadores_etiquetados"].dropna():
-                    # Separar por comas y limpiar espacios
-                    nombres = [n.strip() for n in str(j_str).split(",") if n.strip()]
-                    todos_jugadores.extend(nombres)
-                    
-                jugadores_unicos = sorted(list(set(todos_jugadores)))
-                jug_con_todos = ["Todos"] + jugadores_unicos
-                
-                jugador_sel = st.selectbox("Jugador etiquetado", jug_con_todos)
-
-            # Aplicar filtros
-            if tipo_sel != "Todos":
-                vid_fil = vid_fil[vid_fil["tipo_analisis"] == tipo_sel]
-                
-            if jugador_sel != "Todos":
-                # Usar containts para ver si el jugador está en la lista separada por comas
-                vid_fil = vid_fil[
-                    vid_fil["jugadores_etiquetados"].fillna("").str.contains(jugador_sel, case=False, na=False)
-                ]
-            
-            st.markdown("<br>", unsafe_allow_html=True)
-            
-            # ── Renderizar videos ──
-            if vid_fil.empty:
-                st.warning("No hay videos para la categoría seleccionada.")
-            else:
-                # Mostrar en grilla de a 2 si hay muchos
-                for fila_start in range(0, len(vid_fil), 2):
-                    fila = vid_fil.iloc[fila_start : fila_start + 2]
-                    cols_vid = st.columns(2, gap="large")
-                    
-                    for col_v, (_, vid_row) in zip(cols_vid, fila.iterrows()):
-                        with col_v:
-                            titulo = vid_row.get("titulo", "Sin título")
-                            tipo = vid_row.get("tipo_analisis", "")
-                            desc = vid_row.get("descripcion", "")
-                            link = str(vid_row.get("link_youtube", "")).strip()
-                            jugadores = vid_row.get("jugadores_etiquetados", "")
-                            
-                            st.markdown(f"#### {titulo}")
-                            
-                            if tipo and pd.notna(tipo):
-                                st.caption(f"📌 {tipo}")
-                                
-                            if link and link.lower() not in ("nan", "none", ""):
-                                # Tratar de manejar links sucios
-                                try:
-                                    st.video(link)
-                                except Exception:
-                                    st.error("Enlace de video inválido")
-                            else:
-                                st.info("Video no disponible o link roto")
-                                
-                            if desc and pd.notna(desc):
-                                st.markdown(f"*{desc}*")
-                                
-                            if jugadores and pd.notna(jugadores):
-                                st.markdown(
-                                    f"<div style='font-size:0.8rem; background:rgba(56,189,248,0.1); "
-                                    f"padding:4px 8px; border-radius:4px; display:inline-block; margin-top:4px;'>"
-                                    f"👤 <b>{jugadores}</b></div>", 
-                                    unsafe_allow_html=True
-                                )
-                            
-                            st.markdown("<br>", unsafe_allow_html=True)
-
-
-# ══════════════════════════════════════════════
-#  ⚽  POST-PARTIDO
-# ══════════════════════════════════════════════
-
-elif seccion == "⚽ Post-Partido":
-    st.title("⚽ Post-Partido")
-    st.markdown("---")
-
-    if partidos.empty or postpartido.empty:
-        st.warning("No hay datos de partidos o estadísticas disponibles.")
-    else:
-        df_par = partidos.copy()
-        df_par["fecha"] = parse_fecha(df_par["fecha"])
-        df_par["label"] = df_par.apply(
-            lambda r: f"{r['fecha'].strftime('%d/%m/%Y') if pd.notna(r['fecha']) else '—'}  vs  "
-                      f"{r.get('rival','?')}  ({r.get('torneo','—')})",
-            axis=1,
-        )
-        df_par_sorted = df_par.sort_values("fecha", ascending=False)
-
-        partido_label = st.selectbox("Seleccioná el partido", df_par_sorted["label"].tolist())
-        id_partido_sel = df_par_sorted.loc[
-            df_par_sorted["label"] == partido_label, "id_partido"
-        ].values[0]
-
-        # Filtrar post-partido
-        pp_fil = postpartido[postpartido["id_partido"] == id_partido_sel].copy()
-
-        if pp_fil.empty:
-            st.info("Sin estadísticas para este partido.")
-        else:
-            # Join con plantel
-            if not plantel.empty:
-                pp_fil = pp_fil.merge(
-                    plantel[["id_jugador", "nombre", "posicion"]],
-                    on="id_jugador",
-                    how="left",
-                )
-
-            # Convertir numéricas
-            for col in ["minutos", "goles", "asistencias"]:
-                if col in pp_fil.columns:
-                    pp_fil[col] = pd.to_numeric(pp_fil[col], errors="coerce").fillna(0).astype(int)
-
-            pp_fil = pp_fil.sort_values("minutos", ascending=False)
-
-            # — Tabla —
-            st.subheader("📋 Estadísticas del partido")
-            cols_vis = [c for c in ["nombre", "posicion", "minutos", "goles", "asistencias"] if c in pp_fil.columns]
-            st.dataframe(pp_fil[cols_vis], use_container_width=True, hide_index=True)
-
-            st.markdown("---")
-
-            # — Gráficos —
-            st.subheader("📊 Gráficos")
-
-            tab_min, tab_gol, tab_ast = st.tabs(["⏱ Minutos", "⚽ Goles", "🅰️ Asistencias"])
-
-            def bar_chart(df, col_y, title, color):
-                """Helper para gráfico de barras horizontales."""
-                df_plot = df[["nombre", col_y]].sort_values(col_y, ascending=True)
-                fig = px.bar(
-                    df_plot,
-                    x=col_y,
-                    y="nombre",
-                    orientation="h",
-                    title=title,
-                    color_discrete_sequence=[color],
-                    labels={"nombre": "", col_y: ""},
-                    text_auto=True,
-                )
-                fig.update_layout(
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    font=dict(color="#e8eaed"),
-                    margin=dict(t=40, b=10, l=10, r=10),
-                    height=max(300, 30 * len(df_plot)),
-                )
-                fig.update_xaxes(showgrid=False)
-                fig.update_yaxes(gridcolor="rgba(255,255,255,0.07)")
-                return fig
-
-            with tab_min:
-                if "minutos" in pp_fil.columns:
-                    st.plotly_chart(
-                        bar_chart(pp_fil, "minutos", "Minutos jugados", COLOR_VERDE),
-                        use_container_width=True,
-                    )
-
-            with tab_gol:
-                if "goles" in pp_fil.columns:
-                    goleadores = pp_fil[pp_fil["goles"] > 0]
-                    if goleadores.empty:
-                        st.info("Sin goles registrados en este partido.")
-                    else:
-                        st.plotly_chart(
-                            bar_chart(goleadores, "goles", "Goles", COLOR_NARANJA),
-                            use_container_width=True,
-                        )
-
-            with tab_ast:
-                if "asistencias" in pp_fil.columns:
-                    asistidores = pp_fil[pp_fil["asistencias"] > 0]
-                    if asistidores.empty:
-                        st.info("Sin asistencias registradas en este partido.")
-                    else:
-                        st.plotly_chart(
-                            bar_chart(asistidores, "asistencias", "Asistencias", "#a78bfa"),
-                            use_container_width=True,
-                        )
-
-            # — Resumen global del partido —
-            st.markdown("---")
-            st.subheader("📈 Resumen global")
-            rc1, rc2, rc3, rc4 = st.columns(4)
-            rc1.metric("Jugadores",   len(pp_fil))
-            rc2.metric("Min. totales", int(pp_fil["minutos"].sum()) if "minutos" in pp_fil.columns else "—")
-            rc3.metric("Goles",        int(pp_fil["goles"].sum())   if "goles"   in pp_fil.columns else "—")
-            rc4.metric("Asistencias",  int(pp_fil["asistencias"].sum()) if "asistencias" in pp_fil.columns else "—")
-
+# ============================================================
+#  Excursionistas — Reserva 2026
+#  App Streamlit para cuerpo técnico de fútbol
+#  Datos en tiempo real desde Google Sheets (CSV público)
+# ============================================================
+
+import csv
+import functools
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+try:
+    import resource     # solo Unix: pico de memoria del proceso en la instrumentación
+except ImportError:
+    resource = None
+import urllib.parse
+import urllib.request
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing, contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import date
+from pathlib import Path
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from PIL import Image, ImageOps
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# ─────────────────────────────────────────────
+#  CONFIGURACIÓN GLOBAL
+# ─────────────────────────────────────────────
+
+# ⚙️  Reemplazá este ID si cambiás el Google Sheets
+SHEET_ID = "1swZ_PRVtKwm3WwKX0HKvKDJV6r_UAxo3194yBx6ipfk"
+
+# Hojas que usa la app
+HOJAS = (
+    "Plantel",
+    "Sesiones",
+    "Tareas",
+    "Asistencia_Entrenamiento",
+    "Partidos",
+    "PostPartido",
+    "Entrenamientos_Dia",
+    "Videoanalisis",
+)
+
+# Descarga en paralelo: hilos simultáneos y timeout por hoja (segundos)
+CARGA_MAX_WORKERS = 4
+CARGA_TIMEOUT_S   = 15
+# Si una hoja ya se está bajando para otra sesión se espera esa descarga,
+# como mucho este tiempo; pasado eso se sigue con la última copia conocida
+CARGA_ESPERA_MAX_S = 2 * CARGA_TIMEOUT_S
+
+# Transporte HTTP de las hojas: timeout para conectar (el de lectura es
+# CARGA_TIMEOUT_S), reintentos ante errores transitorios con backoff
+# exponencial + jitter, y circuito que corta tras varias fallas seguidas
+HTTP_TIMEOUT_CONEXION_S = 5
+HTTP_REINTENTOS         = 3
+HTTP_BACKOFF_S          = 0.5
+HTTP_FALLAS_CIRCUITO    = 5
+HTTP_PAUSA_CIRCUITO_S   = 60
+
+# Snapshots en disco de cada hoja (Parquet + metadatos JSON). Las páginas se
+# sirven desde acá y se revalidan en segundo plano pasado DATOS_TTL_S.
+SNAPSHOT_DIR = Path(__file__).parent / ".snapshots"
+DATOS_TTL_S  = 300
+
+# Refresco adelantado: cada hoja se revalida sola antes de vencer, con un
+# intervalo propio (arranca en DATOS_TTL_S) que se acorta cuando la hoja
+# cambia y se estira cuando no. Una hoja que nadie lee hace
+# REFRESCO_INACTIVA_S queda en pausa hasta la próxima lectura.
+REFRESCO_MIN_S      = 60
+REFRESCO_MAX_S      = 3600
+REFRESCO_INACTIVA_S = 30 * 60
+
+# Ventanas de entrenamiento y partido: las hojas que se cargan en el momento
+# se revalidan como máximo cada REFRESCO_VENTANA_S. Los días salen de
+# Entrenamientos_Dia y Partidos; los horarios, de acá (hora del club, en
+# ZONA_HORARIA, aunque el servidor corra en UTC).
+REFRESCO_VENTANA_S    = 60
+ZONA_HORARIA          = "America/Argentina/Buenos_Aires"
+HORARIO_ENTRENAMIENTO = ("08:00", "13:00")
+PARTIDO_VENTANA_H     = (-1, 4)    # horas antes y después del horario del partido
+HOJAS_EN_VIVO = {
+    "entrenamiento": ("Asistencia_Entrenamiento", "Tareas", "Entrenamientos_Dia"),
+    "partido":       ("PostPartido", "Videoanalisis", "Partidos"),
+}
+# Hojas que Asistencia, Videoanálisis y Post-Partido leen por porciones
+# (ConsultasHojas): la precarga no las baja enteras y esas lecturas no las
+# mantienen activas en el planificador de refresco
+HOJAS_POR_PORCION = ("Asistencia_Entrenamiento", "PostPartido", "Videoanalisis")
+
+# De dónde se leen las hojas: "sheets" (CSV público de Google), "sqlite"
+# (base local, sin red; se llena con el botón "Sincronizar" del sidebar) o
+# "sintetica" (datos generados para medir la app con temporadas más grandes)
+FUENTE_DATOS = os.environ.get("EXCURSIONISTAS_FUENTE", "sheets")
+SQLITE_PATH  = Path(os.environ.get("EXCURSIONISTAS_SQLITE", Path(__file__).parent / "datos_locales.sqlite"))
+# Tamaño de los datos sintéticos, p. ej. "jugadores=30,semanas=40,clips_por_partido=10"
+SINTETICA_PARAMS = os.environ.get("EXCURSIONISTAS_SINTETICA", "")
+
+# Fotos del plantel: se bajan una vez y se guardan achicadas (lado mayor en
+# px por variante). Pasado FOTOS_MAX_BYTES se borran las menos usadas.
+FOTOS_DIR       = Path(__file__).parent / ".fotos"
+FOTOS_MAX_BYTES = 50 * 1024 * 1024
+FOTOS_VARIANTES = {"mini": 240, "perfil": 400}
+FOTOS_REINTENTO_S = 600     # una foto que no bajó no se vuelve a pedir antes de esto
+
+# Packs semanales offline (HTML + JSON por semana_num). Streamlit sirve
+# ./static en /app/static (enableStaticServing en .streamlit/config.toml).
+PACKS_DIR     = Path(__file__).parent / "static" / "packs"
+PACKS_VERSION = 1   # subirlo si cambia el formato: regenera todos los packs
+# Los packs se exportan en segundo plano, como mucho una vez cada
+# PACKS_ESPERA_S; mientras tanto la grilla de la semana se arma en vivo
+PACKS_ESPERA_S = 300
+
+# Instrumentación: con ?debug=1 se ve el panel en el sidebar; con esta
+# variable de entorno además se agrega una línea JSON por unidad medida
+PERF_LOG = os.environ.get("EXCURSIONISTAS_PERF_LOG")
+
+# Grillas de clips: cuántos por página (el usuario puede elegir otro de la lista)
+CLIPS_POR_PAGINA          = 6
+CLIPS_POR_PAGINA_OPCIONES = [6, 12, 24]
+
+# Columnas id de cada hoja: se indexan en la base local
+COLUMNAS_ID = {
+    "Plantel":                  ["id_jugador"],
+    "Sesiones":                 ["id_sesion"],
+    "Tareas":                   ["id_entreno_dia"],
+    "Asistencia_Entrenamiento": ["id_entreno_dia", "id_jugador"],
+    "Partidos":                 ["id_partido"],
+    "PostPartido":              ["id_partido", "id_jugador"],
+    "Entrenamientos_Dia":       ["id_entreno_dia", "id_sesion"],
+    "Videoanalisis":            ["id_partido"],
+}
+
+# Clave de fila de cada hoja: identifica altas, cambios y bajas entre versiones
+CLAVES_FILA = {
+    "Plantel":                  ["id_jugador"],
+    "Sesiones":                 ["id_sesion"],
+    "Tareas":                   ["id_entreno_dia", "orden"],
+    "Asistencia_Entrenamiento": ["id_entreno_dia", "id_jugador"],
+    "Partidos":                 ["id_partido"],
+    "PostPartido":              ["id_partido", "id_jugador"],
+    "Entrenamientos_Dia":       ["id_entreno_dia"],
+    "Videoanalisis":            ["id_partido", "link_youtube"],
+}
+
+# Esquema de cada hoja: las columnas que usa la app y su tipo, declarado una
+# sola vez. El resto de las columnas del Sheets no se parsea ni queda en
+# memoria. Los enteros y las fechas se tipan al leer el CSV; el resto, al
+# normalizar (ver CONVERSORES).
+# "entero" = Int32 (admite vacíos), "estadistica" = entero (vacío cuenta 0),
+# "texto", "categoria", "dia" = día de DIAS_ORDEN, "fecha" = FORMATO_FECHA.
+ESQUEMAS_CSV = {
+    "Plantel": {
+        "id_jugador": "entero", "nombre": "texto", "posicion": "categoria", "foto_url": "texto",
+        "categoría": "texto", "categoria": "texto", "anio_nac": "texto",
+    },
+    "Sesiones": {
+        "id_sesion": "entero", "semana_num": "entero", "fecha_inicio_semana": "fecha",
+        "tipo_semana": "texto",
+    },
+    "Tareas": {
+        "id_entreno_dia": "entero", "id_sesion": "entero", "dia_semana": "dia", "orden": "entero",
+        "nombre_tarea": "texto", "tipo": "categoria", "tiempo_min": "entero", "descrip_tarea": "texto",
+        "link_youtube": "texto",
+    },
+    "Asistencia_Entrenamiento": {
+        "id_entreno_dia": "entero", "id_sesion": "entero", "id_jugador": "entero", "estado": "categoria",
+    },
+    "Partidos": {
+        "id_partido": "entero", "fecha": "fecha", "rival": "texto", "torneo": "texto", "horario": "texto",
+    },
+    "PostPartido": {
+        "id_partido": "entero", "id_jugador": "entero",
+        "minutos": "estadistica", "goles": "estadistica", "asistencias": "estadistica",
+    },
+    "Entrenamientos_Dia": {
+        "id_entreno_dia": "entero", "id_sesion": "entero", "dia_semana": "dia", "fecha": "fecha",
+    },
+    "Videoanalisis": {
+        "id_partido": "entero", "titulo": "texto", "tipo_analisis": "texto", "descripcion": "texto",
+        "link_youtube": "texto", "jugadores_etiquetados": "texto",
+    },
+}
+# Tipo con el que pyarrow lee cada tipo del esquema; lo que no está, como texto
+TIPOS_LECTURA = {"entero": "Int32", "estadistica": "Int32"}
+FORMATO_FECHA = "%d/%m/%Y"   # como exporta las fechas el Sheets
+
+# Paleta de colores del panel
+COLOR_VERDE   = "#00c46a"
+COLOR_NARANJA = "#ff6b35"
+COLOR_FONDO   = "#0e1117"
+COLOR_CARD    = "#1c2333"
+COLOR_TEXTO   = "#e8eaed"
+
+# Colores por tipo de tarea
+TIPO_COLORES = {
+    "Activación":     {"border": "#ffd600", "bg": "rgba(255,214,0,0.10)",   "text": "#ffd600"},
+    "Física":         {"border": "#ff4b4b", "bg": "rgba(255,75,75,0.10)",    "text": "#ff4b4b"},
+    "Técnica":        {"border": "#38bdf8", "bg": "rgba(56,189,248,0.10)",   "text": "#38bdf8"},
+    "Táctico":        {"border": "#00c46a", "bg": "rgba(0,196,106,0.10)",    "text": "#00c46a"},
+    "Fútbol Formal":  {"border": "#a78bfa", "bg": "rgba(167,139,250,0.10)",  "text": "#a78bfa"},
+    "Fútbol formal":  {"border": "#a78bfa", "bg": "rgba(167,139,250,0.10)",  "text": "#a78bfa"},
+}
+TIPO_DEFAULT = {"border": "#00c46a", "bg": "rgba(0,196,106,0.10)", "text": "#00c46a"}
+
+# Orden canónico de días de la semana
+DIAS_ORDEN = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
+# Orden de posiciones para agrupar plantel
+POSICIONES_ORDEN = ["Arquero", "Defensor", "Mediocampista", "Delantero"]
+POS_PLURAL = {
+    "Arquero": "Arqueros",
+    "Defensor": "Defensores",
+    "Mediocampista": "Mediocampistas",
+    "Delantero": "Delanteros",
+}
+POS_EMOJI = {
+    "Arquero": "🧤",
+    "Defensor": "🔵",
+    "Mediocampista": "⚙️",
+    "Delantero": "⚡",
+}
+
+st.set_page_config(
+    page_title="Excursionistas — Reserva 2026",
+    page_icon="⚽",
+    layout="wide",
+    initial_sidebar_state="expanded",
+)
+
+# Medición de tiempos de ejecución: se ve agregando ?debug=1 a la URL
+INICIO_SCRIPT = time.perf_counter()
+DEBUG = st.query_params.get("debug") == "1"
+MEDIR = DEBUG or bool(PERF_LOG)
+
+
+# ─────────────────────────────────────────────
+#  INSTRUMENTACIÓN (solo con MEDIR)
+# ─────────────────────────────────────────────
+
+_SIN_MEDICION = nullcontext()
+_LOCK_PERF_LOG = threading.Lock()
+
+# Llamadas de st que se cuentan como elementos emitidos
+ELEMENTOS_CONTADOS = {
+    "markdown", "caption", "title", "subheader", "metric", "info", "warning", "error",
+    "dataframe", "plotly_chart", "image", "video", "button", "download_button",
+    "selectbox", "radio", "date_input",
+}
+# Llamadas que devuelven contenedores: lo que se escriba adentro también se cuenta
+CONTENEDORES = {"sidebar", "container", "expander", "empty", "columns", "tabs"}
+
+
+class Metricas:
+    """
+    Tiempos (ms acumulados por nombre) y contadores de la ejecución en
+    curso. Desactivada, medir() devuelve un contexto vacío y contar() no
+    hace nada: el costo es un if.
+    """
+
+    def __init__(self, activa: bool):
+        self.activa     = activa
+        self.tiempos    = Counter()
+        self.contadores = Counter()
+
+    def medir(self, nombre: str):
+        return self._cronometro(nombre) if self.activa else _SIN_MEDICION
+
+    @contextmanager
+    def _cronometro(self, nombre: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tiempos[nombre] += (time.perf_counter() - t0) * 1000
+
+    def contar(self, nombre: str, n: int = 1) -> None:
+        if self.activa:
+            self.contadores[nombre] += n
+
+    def volcar(self, unidad: str, ms: float) -> None:
+        """
+        Cierra una unidad (una sección o el resto del script): guarda el
+        registro para el panel de debug, lo agrega al log JSONL si está
+        configurado y vuelve los tiempos y contadores a cero.
+        """
+        if not self.activa:
+            return
+        registro = {
+            "ts":         round(time.time(), 3),
+            "unidad":     unidad,
+            "ms":         round(ms, 1),
+            "tiempos":    {k: round(v, 1) for k, v in self.tiempos.items()},
+            "contadores": dict(self.contadores),
+        }
+        if resource is not None:
+            # ru_maxrss: KB en Linux (bytes en macOS)
+            registro["rss_max_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.tiempos.clear()
+        self.contadores.clear()
+        if "registros_perf" not in st.session_state:
+            st.session_state.registros_perf = deque(maxlen=50)
+        st.session_state.registros_perf.append(registro)
+        if PERF_LOG:
+            with _LOCK_PERF_LOG, open(PERF_LOG, "a", encoding="utf-8") as f:
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+
+class ContadorElementos:
+    """
+    Envoltorio de st (o de un contenedor) que cuenta los elementos emitidos
+    y los bytes de markdown. Se usa en lugar de st solo con MEDIR: cada
+    ejecución del script arma el suyo, así que no afecta a otras sesiones.
+    """
+
+    def __init__(self, destino, metricas: Metricas):
+        self._destino  = destino
+        self._metricas = metricas
+
+    def __getattr__(self, nombre):
+        attr = getattr(self._destino, nombre)
+        if nombre in CONTENEDORES:
+            return self._envolver_contenedor(attr)
+        if nombre not in ELEMENTOS_CONTADOS:
+            return attr
+        metricas = self._metricas
+
+        def contado(*args, **kwargs):
+            metricas.contar(f"st.{nombre}")
+            if nombre == "markdown" and args:
+                metricas.contar("bytes_markdown", len(str(args[0]).encode("utf-8")))
+            return attr(*args, **kwargs)
+
+        return contado
+
+    def _envolver_contenedor(self, attr):
+        if not callable(attr):                  # st.sidebar
+            return ContadorElementos(attr, self._metricas)
+
+        def contenedor(*args, **kwargs):
+            resultado = attr(*args, **kwargs)
+            if isinstance(resultado, (list, tuple)):   # st.columns, st.tabs
+                return [ContadorElementos(r, self._metricas) for r in resultado]
+            return ContadorElementos(resultado, self._metricas)
+
+        return contenedor
+
+    def __enter__(self):
+        self._destino.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._destino.__exit__(*exc)
+
+
+_SIN_METRICAS = Metricas(False)
+
+
+def metricas_en_curso() -> Metricas:
+    """
+    Metricas de la ejecución en curso de esta sesión. Cada rerun redefine
+    el módulo, pero los objetos de cache_resource (y lo que llaman) siguen
+    viendo los globales de la ejecución que los creó: la capa de datos
+    busca acá sus métricas y no en la variable global `metricas`.
+    Fuera de una ejecución (hilos de fondo) retorna una desactivada.
+    """
+    try:
+        return st.session_state.get("metricas_en_curso", _SIN_METRICAS)
+    except Exception:
+        return _SIN_METRICAS
+
+
+metricas = Metricas(MEDIR)
+st.session_state.metricas_en_curso = metricas
+if MEDIR:
+    st = ContadorElementos(st, metricas)
+
+# ─────────────────────────────────────────────
+#  CSS PERSONALIZADO
+# ─────────────────────────────────────────────
+# Constante: los packs semanales offline embeben los mismos estilos
+CSS_APP = """
+<style>
+/* Tarjeta de tarea — borde y fondo dinámico via inline style */
+.tarea-card {
+    border-radius: 8px;
+    padding: 12px 16px;
+    margin-bottom: 10px;
+    border-left: 4px solid #00c46a;
+}
+.tarea-titulo {
+    font-size: 1rem;
+    font-weight: 700;
+    color: #e8eaed;
+    margin-bottom: 4px;
+}
+.tarea-meta {
+    font-size: 0.82rem;
+    color: #8d9db6;
+}
+.tipo-badge {
+    display: inline-block;
+    border-radius: 4px;
+    padding: 2px 8px;
+    font-size: 0.75rem;
+    font-weight: 600;
+    margin-right: 6px;
+}
+/* Encabezado de día */
+.dia-header {
+    font-size: 1.05rem;
+    font-weight: 700;
+    color: #00c46a;
+    border-bottom: 1px solid rgba(0,196,106,0.3);
+    padding-bottom: 4px;
+    margin-bottom: 12px;
+    margin-top: 4px;
+}
+/* Scroll horizontal para la semana de entrenamientos */
+.semana-scroll-wrapper {
+    overflow-x: auto;
+    overflow-y: hidden;
+    padding-bottom: 12px;
+    margin: 0 -1rem;
+    padding-left: 1rem;
+    padding-right: 1rem;
+}
+.semana-scroll-wrapper::-webkit-scrollbar {
+    height: 8px;
+}
+.semana-scroll-wrapper::-webkit-scrollbar-track {
+    background: rgba(255,255,255,0.05);
+    border-radius: 4px;
+}
+.semana-scroll-wrapper::-webkit-scrollbar-thumb {
+    background: rgba(0,196,106,0.4);
+    border-radius: 4px;
+}
+.semana-scroll-wrapper::-webkit-scrollbar-thumb:hover {
+    background: rgba(0,196,106,0.7);
+}
+/* Forzar que las columnas de streamlit dentro del wrapper no se achiquen */
+.semana-scroll-wrapper [data-testid="stHorizontalBlock"] {
+    flex-wrap: nowrap !important;
+    overflow: visible !important;
+    min-width: max-content;
+}
+.semana-scroll-wrapper [data-testid="stHorizontalBlock"] > [data-testid="stColumn"] {
+    min-width: 320px !important;
+    flex: 0 0 320px !important;
+}
+/* Métricas de asistencia */
+.metric-pill {
+    display: inline-block;
+    border-radius: 20px;
+    padding: 6px 18px;
+    font-weight: 700;
+    font-size: 1.1rem;
+    margin-right: 8px;
+}
+.pill-verde    { background:rgba(0,196,106,0.15);  color:#00c46a; }
+.pill-rojo     { background:rgba(255,75,75,0.15);   color:#ff4b4b; }
+.pill-amarillo { background:rgba(255,214,0,0.15);   color:#ffd600; }
+/* Tarjeta de jugador */
+.jugador-card {
+    background: #1c2333;
+    border-radius: 12px;
+    padding: 14px 10px;
+    text-align: center;
+    margin-bottom: 12px;
+    cursor: pointer;
+    transition: transform .15s, box-shadow .15s;
+    border: 1px solid rgba(255,255,255,0.06);
+}
+.jugador-card:hover {
+    transform: translateY(-3px);
+    box-shadow: 0 6px 20px rgba(0,0,0,0.4);
+}
+.jugador-nombre {
+    font-size: .9rem;
+    font-weight: 700;
+    color: #e8eaed;
+    margin: 6px 0 2px;
+}
+.jugador-cat {
+    font-size: .78rem;
+    color: #8d9db6;
+}
+/* Sidebar */
+section[data-testid="stSidebar"] { background: #111827; }
+</style>
+"""
+st.markdown(CSS_APP, unsafe_allow_html=True)
+
+
+# ─────────────────────────────────────────────
+#  CARGA DE DATOS
+# ─────────────────────────────────────────────
+
+def _sheet_url(sheet_name: str, tq: str | None = None) -> str:
+    """
+    Construye la URL de exportación CSV para una hoja del Sheets; con tq,
+    Google aplica la consulta (columnas y filtros) antes de mandar el CSV.
+    """
+    url = (
+        f"https://docs.google.com/spreadsheets/d/{SHEET_ID}"
+        f"/gviz/tq?tqx=out:csv&sheet={urllib.parse.quote(sheet_name)}"
+    )
+    return f"{url}&tq={urllib.parse.quote(tq)}" if tq else url
+
+
+def _registros_csv(payload: bytes) -> tuple[bytes, list[bytes]]:
+    """
+    Separa un CSV en encabezado y registros. Un registro puede ocupar varias
+    líneas si tiene saltos de línea dentro de comillas.
+    """
+    registros, partes, comillas = [], [], 0
+    for linea in payload.replace(b"\r\n", b"\n").split(b"\n"):
+        partes.append(linea)
+        comillas += linea.count(b'"')
+        if comillas % 2 == 0:
+            registro = b"\n".join(partes)
+            if registro.strip():
+                registros.append(registro)
+            partes, comillas = [], 0
+    if partes:
+        # Comillas sin cerrar: que lo resuelva read_csv
+        registros.append(b"\n".join(partes))
+    if not registros:
+        return b"", []
+    return registros[0], registros[1:]
+
+
+def _parsear_csv(encabezado: bytes, registros: list[bytes], hoja: str | None = None) -> pd.DataFrame:
+    """
+    Parsea registros CSV. Si la hoja tiene esquema (ESQUEMAS_CSV) lee solo
+    esas columnas, con su tipo y el motor de pyarrow, sin inferir nada; si
+    algún valor no entra en su tipo, relee la tanda como texto. Una columna
+    entera con valores no numéricos queda como texto: normalizar_hoja la
+    convierte y avisa qué filas se perdieron.
+    """
+    # Salto final: pyarrow no acepta un encabezado solo, sin filas
+    datos = io.BytesIO(b"\n".join([encabezado, *registros, b""]))
+    esquema = ESQUEMAS_CSV.get(hoja)
+    if not esquema or not encabezado:
+        df = pd.read_csv(datos)
+        # Limpiar nombres de columna (espacios extra)
+        df.columns = df.columns.str.strip()
+        return df
+
+    # Nombre tal como viene en el encabezado (puede traer espacios) → limpio
+    encabezados = next(csv.reader([encabezado.decode("utf-8-sig", "replace")]), [])
+    columnas = {c: c.strip() for c in encabezados if c.strip() in esquema}
+    tipos = {c: TIPOS_LECTURA.get(esquema[limpio], "str") for c, limpio in columnas.items()}
+    try:
+        df = pd.read_csv(datos, engine="pyarrow", usecols=list(columnas), dtype=tipos)
+    except ValueError:
+        datos.seek(0)
+        df = pd.read_csv(datos, engine="pyarrow", usecols=list(columnas), dtype=dict.fromkeys(columnas, "str"))
+        for c, tipo in tipos.items():
+            if tipo == "Int32" and not _no_numericos(df[c]).any():
+                df[c] = _a_entero(df[c])
+    df = df.rename(columns=columnas)
+    for col, tipo in esquema.items():
+        if tipo == "fecha" and col in df.columns:
+            df[col] = parse_fecha(df[col])
+    return df
+
+
+def _enteros_como_texto(df: pd.DataFrame, hoja: str | None) -> bool:
+    """Si alguna columna entera del esquema quedó como texto al parsear."""
+    return any(
+        tipo in TIPOS_LECTURA and col in df.columns and not pd.api.types.is_integer_dtype(df[col])
+        for col, tipo in ESQUEMAS_CSV.get(hoja, {}).items()
+    )
+
+
+def _proyectar(df: pd.DataFrame, hoja: str) -> pd.DataFrame:
+    """Solo las columnas del esquema de la hoja (para copias guardadas antes de tenerlo)."""
+    esquema = ESQUEMAS_CSV.get(hoja)
+    if not esquema:
+        return df
+    return df[[c for c in df.columns if c in esquema]]
+
+
+def _claves_de(df: pd.DataFrame, claves: list[str]) -> set:
+    return set(df[claves].itertuples(index=False, name=None))
+
+
+class CSVHoja:
+    """
+    Una versión descargada de una hoja: el DataFrame, los registros crudos
+    del CSV (para diferenciar contra la próxima versión) y el delta por
+    clave de fila (CLAVES_FILA) respecto de la versión anterior.
+    """
+
+    def __init__(self, df: pd.DataFrame, encabezado: bytes = b"", registros=None):
+        self.df         = df
+        self.encabezado = encabezado
+        self.registros  = registros      # None: no sirve de base para un diff
+        self.hash       = None
+        self.base_hash  = None           # versión contra la que se calculó el delta
+        self.delta      = None           # {"altas", "cambios", "bajas"}
+        self.claves_afectadas = None     # claves con altas, cambios o bajas
+
+    @classmethod
+    def desde_payload(cls, payload: bytes, hoja: str | None = None, base=None) -> "CSVHoja":
+        """
+        Arma la nueva versión. Si hay una base con el mismo encabezado, solo
+        se parsean los registros que no estaban en ella; el resto de las
+        filas se reutiliza tal cual, así el costo sigue a los cambios del día
+        y no al largo de la temporada.
+        """
+        encabezado, registros = _registros_csv(payload)
+        claves = CLAVES_FILA.get(hoja, ())
+        if base is None or base.registros is None or encabezado != base.encabezado:
+            return cls._completo(encabezado, registros, hoja)
+
+        # Posiciones de cada registro en la versión anterior
+        previos: dict[bytes, list[int]] = {}
+        for i, registro in enumerate(base.registros):
+            previos.setdefault(registro, []).append(i)
+        n_prev = len(base.df)
+        orden, nuevos = [], []
+        for registro in registros:
+            posiciones = previos.get(registro)
+            if posiciones:
+                orden.append(posiciones.pop())
+            else:
+                orden.append(n_prev + len(nuevos))
+                nuevos.append(registro)
+
+        agregados = _parsear_csv(encabezado, nuevos, hoja)
+        # Con enteros leídos como texto (valores no numéricos) en alguna de
+        # las dos partes, los tipos no coinciden: se parsea todo
+        if len(agregados) != len(nuevos) or _enteros_como_texto(base.df, hoja) \
+                or _enteros_como_texto(agregados, hoja):
+            return cls._completo(encabezado, registros, hoja)
+        quitados = base.df.iloc[[i for pos in previos.values() for i in pos]]
+
+        combinado = pd.concat([base.df, agregados], ignore_index=True) if nuevos else base.df
+        nuevo = cls(combinado.iloc[orden].reset_index(drop=True), encabezado, registros)
+        nuevo.base_hash = base.hash
+
+        if claves and all(c in base.df.columns for c in claves):
+            k_quitadas, k_agregadas = _claves_de(quitados, claves), _claves_de(agregados, claves)
+            nuevo.delta = {
+                "altas":   len(k_agregadas - k_quitadas),
+                "cambios": len(k_agregadas & k_quitadas),
+                "bajas":   len(k_quitadas - k_agregadas),
+            }
+            nuevo.claves_afectadas = k_quitadas | k_agregadas
+        else:
+            nuevo.delta = {"altas": len(agregados), "cambios": 0, "bajas": len(quitados)}
+        return nuevo
+
+    @classmethod
+    def _completo(cls, encabezado: bytes, registros: list[bytes], hoja: str | None) -> "CSVHoja":
+        df = _parsear_csv(encabezado, registros, hoja)
+        # Si read_csv no devolvió una fila por registro, esta versión no sirve de base
+        return cls(df, encabezado, registros if len(df) == len(registros) else None)
+
+
+class CircuitoAbierto(Exception):
+    """El transporte dejó de pedir a la red por un rato tras varias fallas seguidas."""
+
+
+class TransporteHTTP:
+    """
+    Conexiones HTTP para bajar las hojas, compartidas por todas las
+    descargas del proceso: keep-alive (pool de conexiones de requests),
+    gzip, timeouts de conexión y de lectura, y reintentos con backoff
+    exponencial y jitter ante errores de red, 429 y 5xx.
+
+    Tras HTTP_FALLAS_CIRCUITO descargas fallidas seguidas el circuito se
+    abre: durante HTTP_PAUSA_CIRCUITO_S no se pide nada y se falla al
+    instante, así las hojas siguen saliendo de la última copia buena en
+    vez de esperar timeouts. Pasada la pausa se deja probar de nuevo.
+    """
+
+    REINTENTABLES = {429, 500, 502, 503, 504}
+    # Errores de red que se reintentan: sin conexión, timeout, cuerpo
+    # cortado a mitad de camino y gzip roto
+    ERRORES_RED = (
+        requests.ConnectionError,
+        requests.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+        requests.exceptions.ContentDecodingError,
+    )
+
+    def __init__(self, reintentos: int = HTTP_REINTENTOS, backoff: float = HTTP_BACKOFF_S,
+                 fallas_circuito: int = HTTP_FALLAS_CIRCUITO, pausa: float = HTTP_PAUSA_CIRCUITO_S,
+                 conexiones: int = CARGA_MAX_WORKERS):
+        self.reintentos      = reintentos
+        self.backoff         = backoff
+        self.fallas_circuito = fallas_circuito
+        self.pausa           = pausa
+        self.sesion = requests.Session()
+        adaptador = HTTPAdapter(pool_maxsize=conexiones)
+        self.sesion.mount("https://", adaptador)
+        self.sesion.mount("http://", adaptador)
+        self.sesion.headers["Accept-Encoding"] = "gzip, deflate"
+        self._lock   = threading.Lock()
+        self._fallas = 0            # descargas fallidas seguidas
+        self._abierto_hasta = 0.0
+
+    def estado(self) -> str:
+        with self._lock:
+            if time.time() < self._abierto_hasta:
+                return f"abierto ({self._abierto_hasta - time.time():.0f} s)"
+            return "cerrado" if self._fallas == 0 else f"cerrado ({self._fallas} fallas)"
+
+    def _registrar(self, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self._fallas = 0
+                return
+            self._fallas += 1
+            if self._fallas >= self.fallas_circuito:
+                self._abierto_hasta = time.time() + self.pausa
+
+    def get(self, url: str, headers: dict | None = None,
+            timeout: float = CARGA_TIMEOUT_S) -> tuple[requests.Response, int]:
+        """
+        GET con reintentos. No valida el código de respuesta (el 304 o un
+        404 los interpreta el que llama), pero un 4xx cuenta como falla para
+        el circuito: una hoja que dejó de estar publicada (403/404) no es
+        una descarga buena.
+        Retorna:
+            (respuesta, intentos)
+        Lanza:
+            CircuitoAbierto sin tocar la red si el circuito está abierto, o
+            el último error si se agotaron los reintentos. Cualquier error
+            que salga de acá cuenta como falla para el circuito.
+        """
+        with self._lock:
+            if time.time() < self._abierto_hasta:
+                raise CircuitoAbierto(
+                    f"sin conexión con Google Sheets; se reintenta en {self._abierto_hasta - time.time():.0f} s"
+                )
+        ok = False
+        try:
+            error = None
+            for intento in range(self.reintentos + 1):
+                if intento:
+                    # Full jitter: espera al azar hasta backoff·2^(intento-1)
+                    time.sleep(random.uniform(0, self.backoff * 2 ** (intento - 1)))
+                try:
+                    resp = self.sesion.get(url, headers=headers, timeout=(HTTP_TIMEOUT_CONEXION_S, timeout))
+                except self.ERRORES_RED as e:
+                    error = e
+                    continue
+                if resp.status_code in self.REINTENTABLES:
+                    error = requests.HTTPError(f"HTTP {resp.status_code}", response=resp)
+                    continue
+                # 2xx y 304 (sin cambios); los 4xx no se reintentan
+                ok = resp.status_code < 400
+                return resp, intento + 1
+            raise error
+        finally:
+            self._registrar(ok)
+
+
+def _descargar_hoja(
+    sheet_name: str,
+    timeout: float = CARGA_TIMEOUT_S,
+    meta_previa: dict | None = None,
+    base: CSVHoja | None = None,
+    transporte: TransporteHTTP | None = None,
+) -> tuple[CSVHoja | None, dict]:
+    """
+    Descarga una hoja y la parsea solo si su contenido cambió. No captura
+    errores: el que llama decide cómo reportarlos (puede correr en un hilo
+    sin contexto de Streamlit).
+    Parametros:
+        sheet_name:  nombre de la hoja
+        timeout:     timeout de red en segundos
+        meta_previa: metadatos de la descarga anterior (hash, etag,
+                     last_modified) para pedir/validar condicionalmente
+        base:        versión anterior, para parsear solo los registros nuevos
+        transporte:  conexiones a reutilizar (por defecto, unas nuevas)
+    Retorna:
+        (contenido, meta): contenido es None si no cambió respecto de meta_previa.
+    """
+    transporte = transporte or TransporteHTTP()
+    headers = {}
+    if meta_previa:
+        if meta_previa.get("etag"):
+            headers["If-None-Match"] = meta_previa["etag"]
+        if meta_previa.get("last_modified"):
+            headers["If-Modified-Since"] = meta_previa["last_modified"]
+    resp, intentos = transporte.get(_sheet_url(sheet_name), headers=headers, timeout=timeout)
+    if resp.status_code == 304 and meta_previa:
+        return None, dict(meta_previa, fetched_at=time.time(), intentos=intentos)
+    resp.raise_for_status()
+    payload = resp.content
+    headers = resp.headers
+
+    meta = {
+        "fetched_at":    time.time(),
+        "hash":          hashlib.sha256(payload).hexdigest(),
+        "etag":          headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "bytes":         len(payload),
+        "bytes_red":     resp.raw.tell(),      # lo que viajó (comprimido)
+        "intentos":      intentos,
+    }
+    if meta_previa and meta_previa.get("hash") == meta["hash"]:
+        return None, meta
+
+    contenido = CSVHoja.desde_payload(payload, sheet_name, base)
+    contenido.hash = meta["hash"]
+    if contenido.delta is not None:
+        meta["delta"] = contenido.delta
+    return contenido, meta
+
+
+class FuenteSheets:
+    """Hojas desde la exportación CSV pública (gviz) de Google Sheets."""
+
+    nombre = "sheets"
+
+    def __init__(self, transporte: TransporteHTTP | None = None):
+        self.transporte = transporte or TransporteHTTP()
+
+    def descargar(self, hoja: str, timeout: float, meta_previa: dict | None, base=None):
+        return _descargar_hoja(hoja, timeout, meta_previa, base, self.transporte)
+
+
+class FuenteSQLite:
+    """
+    Hojas desde una base SQLite local: una tabla por hoja (columnas tal
+    como vienen del CSV), índices sobre las columnas id y una tabla _sync
+    con el hash y la fecha de la última sincronización de cada hoja.
+    """
+
+    nombre = "sqlite"
+
+    def __init__(self, ruta: Path = SQLITE_PATH):
+        self.ruta  = Path(ruta)
+        # Última versión sincronizada de cada hoja: base del próximo diff
+        self.bases: dict[str, CSVHoja] = {}
+
+    def _conectar(self) -> sqlite3.Connection:
+        # Una conexión por operación: la fuente se usa desde varios hilos
+        con = sqlite3.connect(self.ruta)
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS _sync ("
+            " hoja TEXT PRIMARY KEY, hash TEXT, filas INTEGER, synced_at REAL)"
+        )
+        return con
+
+    def descargar(self, hoja: str, timeout: float, meta_previa: dict | None, base=None):
+        with closing(self._conectar()) as con:
+            fila = con.execute("SELECT hash FROM _sync WHERE hoja = ?", (hoja,)).fetchone()
+            if fila is None:
+                raise LookupError(f"la hoja '{hoja}' no está en la base local (falta sincronizar)")
+            meta = {"fetched_at": time.time(), "hash": fila[0]}
+            if meta_previa and meta_previa.get("hash") == fila[0]:
+                return None, meta
+            contenido = CSVHoja(_proyectar(pd.read_sql_query(f'SELECT * FROM "{hoja}"', con), hoja))
+        contenido.hash = fila[0]
+        return contenido, meta
+
+    def consultar(self, sql: str, params=()) -> pd.DataFrame:
+        """
+        Consulta puntual contra la base, p. ej. la asistencia de una sesión:
+            SELECT a.* FROM Asistencia_Entrenamiento a
+            JOIN Entrenamientos_Dia e USING (id_entreno_dia)
+            WHERE e.id_sesion = ?
+        """
+        with closing(self._conectar()) as con:
+            return pd.read_sql_query(sql, con, params=params)
+
+    def columnas(self, hoja: str) -> list[str]:
+        """Columnas de la tabla de la hoja (vacío si no está sincronizada)."""
+        with closing(self._conectar()) as con:
+            return [c[1] for c in con.execute(f'PRAGMA table_info("{hoja}")')]
+
+    def guardar(self, hoja: str, df: pd.DataFrame, meta: dict) -> None:
+        """Reemplaza la tabla de una hoja y sus índices en una sola transacción."""
+        with closing(self._conectar()) as con, con:
+            df.to_sql(hoja, con, if_exists="replace", index=False)
+            for col in COLUMNAS_ID.get(hoja, []):
+                if col in df.columns:
+                    con.execute(f'CREATE INDEX IF NOT EXISTS "ix_{hoja}_{col}" ON "{hoja}" ("{col}")')
+            con.execute(
+                "INSERT OR REPLACE INTO _sync (hoja, hash, filas, synced_at) VALUES (?, ?, ?, ?)",
+                (hoja, meta.get("hash"), len(df), time.time()),
+            )
+
+    def aplicar_delta(self, hoja: str, contenido: CSVHoja) -> bool:
+        """
+        Aplica solo las filas que cambiaron: borra las claves afectadas y
+        vuelve a insertar sus filas actuales. Solo si la tabla está justo en
+        la versión contra la que se calculó el delta; si no, retorna False
+        y hay que reescribir la tabla entera.
+        """
+        claves = CLAVES_FILA.get(hoja, [])
+        if contenido.claves_afectadas is None or not claves:
+            return False
+        with closing(self._conectar()) as con, con:
+            fila = con.execute("SELECT hash FROM _sync WHERE hoja = ?", (hoja,)).fetchone()
+            if fila is None or fila[0] != contenido.base_hash:
+                return False
+            columnas = [c[1] for c in con.execute(f'PRAGMA table_info("{hoja}")')]
+            if columnas != list(contenido.df.columns):
+                return False
+            condicion = " AND ".join(f'"{c}" IS ?' for c in claves)
+            con.executemany(
+                f'DELETE FROM "{hoja}" WHERE {condicion}',
+                [tuple(_valor_sql(v) for v in clave) for clave in contenido.claves_afectadas],
+            )
+            df = contenido.df
+            afectadas = pd.MultiIndex.from_frame(df[claves]).isin(list(contenido.claves_afectadas))
+            df[afectadas].to_sql(hoja, con, if_exists="append", index=False)
+            con.execute(
+                "UPDATE _sync SET hash = ?, filas = ?, synced_at = ? WHERE hoja = ?",
+                (contenido.hash, len(df), time.time(), hoja),
+            )
+        return True
+
+    def metas(self) -> dict:
+        with closing(self._conectar()) as con:
+            return {h: {"hash": x} for h, x in con.execute("SELECT hoja, hash FROM _sync")}
+
+
+class FuenteSintetica:
+    """
+    Hojas generadas con las mismas columnas que las de Google Sheets, sin
+    red y con el tamaño que se pida: sirve para medir cómo escala la app a
+    medida que crece la temporada. Mismos parámetros → mismos datos.
+    """
+
+    nombre = "sintetica"
+
+    def __init__(self, jugadores=25, semanas=12, tareas_por_dia=4, partidos=None,
+                 clips_por_partido=3, semilla=1):
+        self.params = dict(
+            jugadores=int(jugadores), semanas=int(semanas), tareas_por_dia=int(tareas_por_dia),
+            partidos=int(partidos if partidos is not None else semanas),
+            clips_por_partido=int(clips_por_partido), semilla=int(semilla),
+        )
+        self._lock  = threading.Lock()
+        self._hojas = None
+
+    @classmethod
+    def desde_texto(cls, texto: str) -> "FuenteSintetica":
+        """Parámetros como "jugadores=30,semanas=40" (vacío = valores por defecto)."""
+        params = dict(p.split("=", 1) for p in texto.replace(" ", "").split(",") if "=" in p)
+        return cls(**params)
+
+    def firma(self) -> str:
+        return hashlib.sha256(json.dumps(self.params, sort_keys=True).encode()).hexdigest()[:12]
+
+    def descargar(self, hoja: str, timeout: float, meta_previa: dict | None, base=None):
+        with self._lock:
+            if self._hojas is None:
+                self._hojas = self._generar(**self.params)
+        payload = self._hojas[hoja]
+        meta = {"fetched_at": time.time(), "hash": hashlib.sha256(payload).hexdigest(), "bytes": len(payload)}
+        if meta_previa and meta_previa.get("hash") == meta["hash"]:
+            return None, meta
+        contenido = CSVHoja.desde_payload(payload, hoja)
+        contenido.hash = meta["hash"]
+        return contenido, meta
+
+    @staticmethod
+    def _generar(jugadores, semanas, tareas_por_dia, partidos, clips_por_partido, semilla) -> dict:
+        """CSV (bytes) de cada hoja, armados de forma vectorizada."""
+        rng = np.random.default_rng(semilla)
+        inicio = pd.Timestamp(date.today()) - pd.Timedelta(weeks=semanas - 1)
+        inicio -= pd.Timedelta(days=inicio.weekday())
+
+        def csv(df):
+            return df.to_csv(index=False).encode("utf-8")
+
+        def fmt(fechas):
+            return pd.DatetimeIndex(fechas).strftime("%d/%m/%Y")
+
+        ids_jug = np.arange(1, jugadores + 1)
+        nombres = np.array([f"Jugador {i}" for i in ids_jug])
+        hojas = {"Plantel": csv(pd.DataFrame({
+            "id_jugador": ids_jug,
+            "nombre":     nombres,
+            "posicion":   np.resize(POSICIONES_ORDEN, jugadores),
+            "categoría":  2004 + ids_jug % 3,
+            "foto_url":   "",
+        }))}
+
+        ids_ses = np.arange(1, semanas + 1)
+        inicios = inicio + pd.to_timedelta((ids_ses - 1) * 7, unit="D")
+        hojas["Sesiones"] = csv(pd.DataFrame({
+            "id_sesion": ids_ses, "semana_num": ids_ses, "fecha_inicio_semana": fmt(inicios),
+            "tipo_semana": rng.choice(["Competitiva", "Carga", "Descarga"], semanas),
+        }))
+
+        # Lunes a viernes de cada semana
+        dias = pd.DataFrame({
+            "id_entreno_dia": np.arange(1, semanas * 5 + 1),
+            "id_sesion":      np.repeat(ids_ses, 5),
+            "dia_semana":     np.tile(DIAS_ORDEN[:5], semanas),
+        })
+        dias["fecha"] = fmt(np.repeat(inicios, 5) + pd.to_timedelta(np.tile(np.arange(5), semanas), unit="D"))
+        hojas["Entrenamientos_Dia"] = csv(dias)
+
+        n_tareas = len(dias) * tareas_por_dia
+        hojas["Tareas"] = csv(pd.DataFrame({
+            "id_tarea":       np.arange(1, n_tareas + 1),
+            "id_entreno_dia": np.repeat(dias["id_entreno_dia"], tareas_por_dia),
+            "nombre_tarea":   [f"Tarea {i}" for i in range(1, n_tareas + 1)],
+            "tipo":           rng.choice(list(TIPO_COLORES), n_tareas),
+            "tiempo_min":     rng.choice([10, 15, 20, 25], n_tareas),
+            "descrip_tarea":  "Descripción de la tarea",
+            "link_youtube":   np.where(rng.random(n_tareas) < 0.3, "https://youtu.be/dQw4w9WgXcQ", ""),
+            "orden":          np.tile(np.arange(1, tareas_por_dia + 1), len(dias)),
+        }))
+
+        n_ast = len(dias) * jugadores
+        hojas["Asistencia_Entrenamiento"] = csv(pd.DataFrame({
+            "id_entreno_dia": np.repeat(dias["id_entreno_dia"], jugadores),
+            "id_jugador":     np.tile(ids_jug, len(dias)),
+            "estado":         rng.choice(ESTADOS_ASISTENCIA, n_ast, p=[0.8, 0.1, 0.1]),
+        }))
+
+        ids_par = np.arange(1, partidos + 1)
+        hojas["Partidos"] = csv(pd.DataFrame({
+            "id_partido": ids_par,
+            "fecha":      fmt(inicio + pd.to_timedelta((ids_par - 1) * 7 + 5, unit="D")),
+            "rival":      [f"Rival {i % 20 + 1}" for i in ids_par],
+            "torneo":     np.where(ids_par <= partidos // 2, "Apertura", "Clausura"),
+            "horario":    "15:00",
+        }))
+
+        # 16 jugadores por partido (o todos si hay menos)
+        por_partido = min(16, jugadores)
+        convocados = np.argsort(rng.random((partidos, jugadores)), axis=1)[:, :por_partido] + 1
+        n_pp = partidos * por_partido
+        hojas["PostPartido"] = csv(pd.DataFrame({
+            "id_partido":  np.repeat(ids_par, por_partido),
+            "id_jugador":  convocados.ravel(),
+            "minutos":     rng.choice([90, 75, 45, 20], n_pp),
+            "goles":       rng.choice([0, 0, 0, 1, 2], n_pp),
+            "asistencias": rng.choice([0, 0, 1], n_pp),
+        }))
+
+        n_clips = partidos * clips_por_partido
+        etiquetados = nombres[rng.integers(0, jugadores, (n_clips, 2))]
+        hojas["Videoanalisis"] = csv(pd.DataFrame({
+            "id_video":              np.arange(1, n_clips + 1),
+            "id_partido":            np.repeat(ids_par, clips_por_partido),
+            "titulo":                [f"Clip {i}" for i in range(1, n_clips + 1)],
+            "tipo_analisis":         rng.choice(["Ofensivo", "Defensivo", "Pelota parada"], n_clips),
+            "descripcion":           "",
+            "link_youtube":          [f"https://youtu.be/{i:011d}" for i in range(1, n_clips + 1)],
+            "jugadores_etiquetados": [", ".join(par) for par in etiquetados],
+        }))
+        return hojas
+
+
+def _valor_sql(v):
+    """Escalar de pandas/numpy → tipo que acepta sqlite3."""
+    if pd.isna(v):
+        return None
+    return v.item() if hasattr(v, "item") else v
+
+
+def describir_delta(delta: dict | None) -> str:
+    if not delta:
+        return "actualizada"
+    return f"+{delta['altas']} / ~{delta['cambios']} / −{delta['bajas']} filas"
+
+
+def sincronizar_sqlite(destino: FuenteSQLite, nombres=HOJAS) -> dict:
+    """
+    Copia las hojas de Google Sheets a la base local. Las hojas sin cambios
+    no se tocan; en las que cambiaron se aplican solo las filas nuevas,
+    modificadas o borradas (o se reescribe la tabla si no hay base previa).
+    Retorna:
+        dict hoja → descripción del resultado o mensaje de error
+    """
+    contenidos, metas, errores = cargar_hojas(
+        nombres, fuente=FuenteSheets(transporte_sheets()), metas_previas=destino.metas(), bases=destino.bases
+    )
+    resultado = {}
+    for hoja in nombres:
+        if hoja in errores:
+            resultado[hoja] = errores[hoja]
+        elif hoja in contenidos:
+            contenido = contenidos[hoja]
+            if destino.aplicar_delta(hoja, contenido):
+                resultado[hoja] = describir_delta(contenido.delta)
+            else:
+                destino.guardar(hoja, contenido.df, metas[hoja])
+                resultado[hoja] = "actualizada (tabla completa)"
+            destino.bases[hoja] = contenido
+        else:
+            resultado[hoja] = "sin cambios"
+    return resultado
+
+
+def _descargar_medido(fuente, hoja: str, timeout: float, meta_previa, base):
+    # La latencia de cada descarga queda en sus metadatos ("ms"), junto a "bytes"
+    t0 = time.perf_counter()
+    contenido, meta = fuente.descargar(hoja, timeout, meta_previa, base)
+    return contenido, dict(meta, ms=round((time.perf_counter() - t0) * 1000, 1))
+
+
+def cargar_hojas(
+    nombres,
+    fuente=None,
+    max_workers: int = CARGA_MAX_WORKERS,
+    timeout: float = CARGA_TIMEOUT_S,
+    metas_previas: dict | None = None,
+    bases: dict | None = None,
+) -> tuple[dict, dict, dict]:
+    """
+    Descarga varias hojas en paralelo con un pool de hilos acotado.
+    Parametros:
+        nombres:       nombres de las hojas a descargar
+        fuente:        FuenteSheets (por defecto) o FuenteSQLite
+        max_workers:   máximo de descargas simultáneas
+        timeout:       timeout de red por hoja, en segundos
+        metas_previas: dict nombre → metadatos de la descarga anterior
+        bases:         dict nombre → CSVHoja anterior (diff por filas)
+    Retorna:
+        (contenidos, metas, errores):
+            contenidos: nombre → CSVHoja, solo para las hojas que cambiaron
+            metas:   nombre → metadatos, para todas las hojas descargadas
+            errores: nombre → mensaje, para las hojas que fallaron
+    """
+    nombres = list(nombres)
+    fuente = fuente or FuenteSheets()
+    metas_previas = metas_previas or {}
+    bases = bases or {}
+    contenidos, metas, errores = {}, {}, {}
+    if not nombres:
+        return contenidos, metas, errores
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(nombres))) as pool:
+        futuros = {
+            pool.submit(_descargar_medido, fuente, n, timeout, metas_previas.get(n), bases.get(n)): n
+            for n in nombres
+        }
+        for fut in as_completed(futuros):
+            nombre = futuros[fut]
+            try:
+                contenido, meta = fut.result()
+            except Exception as e:
+                errores[nombre] = str(e)
+                continue
+            metas[nombre] = meta
+            if contenido is not None:
+                contenidos[nombre] = contenido
+    return contenidos, metas, errores
+
+
+class _Vuelo:
+    def __init__(self):
+        self.listo     = threading.Event()
+        self.resultado = None
+
+
+class VuelosCompartidos:
+    """
+    Una sola ejecución por clave a la vez ("single-flight"): si varias
+    sesiones piden lo mismo mientras se está buscando, la primera lo busca
+    y las demás esperan ese resultado en lugar de repetir el pedido.
+    """
+
+    def __init__(self, espera_max: float = CARGA_ESPERA_MAX_S):
+        self.espera_max = espera_max
+        self.propios    = 0   # claves buscadas
+        self.ajenos     = 0   # claves que esperaron una búsqueda en curso
+        self._lock      = threading.Lock()
+        self._en_curso: dict = {}
+
+    def tomar(self, claves) -> tuple[list, dict]:
+        """
+        Reparte las claves: (propias, ajenas). Las propias las tiene que
+        buscar quien llama y después entregarlas con soltar(); las ajenas
+        (clave → vuelo) ya las está buscando otro y se esperan con esperar().
+        """
+        propias, ajenas = [], {}
+        with self._lock:
+            for clave in claves:
+                if clave in self._en_curso:
+                    ajenas[clave] = self._en_curso[clave]
+                else:
+                    self._en_curso[clave] = _Vuelo()
+                    propias.append(clave)
+            self.propios += len(propias)
+            self.ajenos  += len(ajenas)
+        return propias, ajenas
+
+    def soltar(self, resultados: dict, claves=None) -> None:
+        """Entrega el resultado de cada clave propia y libera a quienes esperaban."""
+        with self._lock:
+            vuelos = {c: self._en_curso.pop(c, None) for c in (resultados if claves is None else claves)}
+        for clave, vuelo in vuelos.items():
+            if vuelo is not None:
+                vuelo.resultado = resultados.get(clave)
+                vuelo.listo.set()
+
+    def esperar(self, ajenas: dict) -> dict:
+        """clave → resultado de las búsquedas ajenas que terminaron a tiempo."""
+        limite = time.monotonic() + self.espera_max
+        resultados = {}
+        for clave, vuelo in ajenas.items():
+            if vuelo.listo.wait(max(0.0, limite - time.monotonic())):
+                resultados[clave] = vuelo.resultado
+        return resultados
+
+    def hacer(self, clave, funcion):
+        """funcion() una sola vez por clave entre llamadas concurrentes (None si se agota la espera)."""
+        propias, ajenas = self.tomar([clave])
+        if ajenas:
+            return self.esperar(ajenas).get(clave)
+        resultado = None
+        try:
+            resultado = funcion()
+        finally:
+            self.soltar({clave: resultado}, propias)
+        return resultado
+
+
+class AlmacenHojas:
+    """
+    Copia local de las hojas, compartida por todas las sesiones del proceso.
+
+    Siempre responde con la última versión conocida (memoria o snapshot en
+    disco). Si está vieja, la revalida en un hilo de fondo y la reemplaza
+    cuando llega, sin bloquear la página que la pidió. Con un planificador
+    (PlanificadorRefresco) cada hoja vence a su propio ritmo y la
+    revalidación la hace él, antes de que alguien la encuentre vieja.
+    Cada hoja se baja una sola vez aunque la pidan varias sesiones juntas.
+    """
+
+    def __init__(self, directorio: Path, fuente=None, ttl: float = DATOS_TTL_S):
+        self.directorio = Path(directorio)
+        self.fuente     = fuente or FuenteSheets()
+        self.ttl        = ttl
+        self.frames: dict[str, pd.DataFrame] = {}
+        self.contenidos: dict[str, CSVHoja] = {}   # base de los diffs por filas
+        self.meta:   dict[str, dict] = {}
+        self.errores: dict[str, str] = {}
+        self._lock     = threading.Lock()
+        self._refresco = None
+        self.planificador = None
+        self.vuelos    = VuelosCompartidos()
+
+    # — Snapshots en disco ————————————————————————————————
+
+    def _rutas(self, nombre: str) -> tuple[Path, Path]:
+        return self.directorio / f"{nombre}.parquet", self.directorio / f"{nombre}.json"
+
+    def _leer_snapshot(self, nombre: str) -> bool:
+        ruta_df, ruta_meta = self._rutas(nombre)
+        if not ruta_df.exists():
+            return False
+        try:
+            df = _proyectar(pd.read_parquet(ruta_df), nombre)
+            if ruta_meta.exists():
+                meta = json.loads(ruta_meta.read_text(encoding="utf-8"))
+            else:
+                meta = {"fetched_at": ruta_df.stat().st_mtime}
+        except Exception:
+            return False
+        with self._lock:
+            self.frames.setdefault(nombre, df)
+            self.meta.setdefault(nombre, meta)
+        return True
+
+    def _guardar_snapshot(self, nombre: str, df: pd.DataFrame, meta: dict) -> None:
+        # Escribir a un temporal y renombrar: nunca queda un snapshot a medias
+        ruta_df, _ = self._rutas(nombre)
+        try:
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            tmp_df = ruta_df.with_name(ruta_df.name + ".tmp")
+            df.to_parquet(tmp_df, index=False)
+            os.replace(tmp_df, ruta_df)
+        except Exception:
+            # Sin disco escribible la app sigue funcionando desde memoria
+            return
+        self._guardar_meta(nombre, meta)
+
+    def _guardar_meta(self, nombre: str, meta: dict) -> None:
+        _, ruta_meta = self._rutas(nombre)
+        try:
+            tmp_meta = ruta_meta.with_name(ruta_meta.name + ".tmp")
+            tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+            os.replace(tmp_meta, ruta_meta)
+        except Exception:
+            pass
+
+    # — Descarga y reemplazo ——————————————————————————————
+
+    def _actualizar(self, nombres) -> list[str]:
+        """
+        Revalida las hojas y retorna las que cambiaron. Las que ya se están
+        bajando para otra sesión no se piden de nuevo: se espera esa descarga.
+        """
+        propias, ajenas = self.vuelos.tomar(nombres)
+        cambiadas = []
+        try:
+            if propias:
+                cambiadas = self._descargar(propias)
+        finally:
+            self.vuelos.soltar({n: n in cambiadas for n in propias})
+        for nombre, cambio in self.vuelos.esperar(ajenas).items():
+            if cambio:
+                cambiadas.append(nombre)
+        for nombre in ajenas:
+            if nombre not in self.frames:
+                # Se agotó la espera y no hay copia: que la página lo avise
+                self.errores.setdefault(nombre, "la descarga en curso no terminó a tiempo")
+        return cambiadas
+
+    def _descargar(self, nombres) -> list[str]:
+        with self._lock:
+            previas = {n: self.meta[n] for n in nombres if n in self.meta and n in self.frames}
+        bases = {n: self.contenidos[n] for n in previas if n in self.contenidos}
+        contenidos, metas, errores = cargar_hojas(
+            nombres, fuente=self.fuente, metas_previas=previas, bases=bases
+        )
+        # Se conserva la última versión buena de las hojas que fallaron
+        self.errores.update(errores)
+        cambiadas = []
+        for nombre, meta in metas.items():
+            contenido = contenidos.get(nombre)
+            df = contenido.df if contenido is not None else None
+            with self._lock:
+                if contenido is not None:
+                    self.frames[nombre]     = df
+                    self.contenidos[nombre] = contenido
+                self.meta[nombre] = meta
+                self.errores.pop(nombre, None)
+            if df is not None:
+                cambiadas.append(nombre)
+                self._guardar_snapshot(nombre, df, meta)
+            else:
+                # Mismo contenido: solo se renueva la marca de tiempo
+                self._guardar_meta(nombre, meta)
+        if self.planificador is not None:
+            # La primera descarga de una hoja no dice nada de cuánto cambia
+            self.planificador.registrar_descarga(
+                metas, [n for n in cambiadas if n in previas], errores
+            )
+        return cambiadas
+
+    def refrescar_en_segundo_plano(self, nombres) -> None:
+        """Lanza una revalidación en un hilo, salvo que ya haya una en curso."""
+        with self._lock:
+            if self._refresco is not None and self._refresco.is_alive():
+                return
+            self._refresco = threading.Thread(
+                target=self._actualizar, args=(list(nombres),), daemon=True
+            )
+            self._refresco.start()
+
+    def refrescar(self, nombres=HOJAS) -> list[str]:
+        """
+        Revalida ya las hojas indicadas (bloquea hasta terminar).
+        Retorna los nombres de las hojas cuyo contenido cambió; las demás
+        conservan su DataFrame y todo lo derivado de él.
+        """
+        return self._actualizar(list(nombres))
+
+    def firma(self, nombres) -> tuple:
+        """
+        Hash de contenido de cada hoja indicada. Sirve como clave de caché
+        para datos derivados: solo cambia si cambió alguna de esas hojas.
+        """
+        return self.instantanea(nombres)[0]
+
+    def precargar(self, nombres) -> None:
+        """Baja en segundo plano las hojas que no están ni en memoria ni en disco."""
+        faltan = [n for n in nombres if n not in self.frames and not self._rutas(n)[0].exists()]
+        if faltan:
+            self.refrescar_en_segundo_plano(faltan)
+
+    def edad(self, nombre: str) -> float:
+        """Segundos desde la última descarga exitosa (inf si nunca se bajó)."""
+        meta = self.meta.get(nombre)
+        return time.time() - meta["fetched_at"] if meta else float("inf")
+
+    def vigencia(self, nombre: str) -> float:
+        """Segundos que la hoja se da por buena: los del planificador o el TTL fijo."""
+        if self.planificador is not None:
+            return self.planificador.intervalo(nombre)
+        return self.ttl
+
+    def al_dia(self, nombre: str) -> bool:
+        return nombre in self.frames and self.edad(nombre) <= self.vigencia(nombre)
+
+    def obtener(self, nombres=HOJAS, registrar: bool = True) -> dict:
+        """
+        Devuelve dict nombre → DataFrame sin esperar a la red, salvo en el
+        primer arranque sin snapshot en disco.
+        Parametros:
+            registrar: False para no contar la lectura (ni disparar el
+                       refresco de lo vencido), como en las porciones
+        """
+        nombres = list(nombres)
+        faltan = [n for n in nombres if n not in self.frames and not self._leer_snapshot(n)]
+        if faltan:
+            self._actualizar(faltan)
+        if registrar and self.planificador is not None:
+            # Lo vencido lo revalida el planificador en su hilo
+            self.planificador.registrar_lectura(nombres)
+        elif registrar:
+            viejas = [n for n in nombres if not self.al_dia(n)]
+            if viejas:
+                self.refrescar_en_segundo_plano(viejas)
+        return self.instantanea(nombres)[1]
+
+    def instantanea(self, nombres) -> tuple[tuple, dict]:
+        """(firma, frames) leídos juntos, coherentes aunque haya un refresco en curso."""
+        with self._lock:
+            firma  = tuple(self.meta.get(n, {}).get("hash") for n in nombres)
+            frames = {n: self.frames.get(n, pd.DataFrame()) for n in nombres}
+        return firma, frames
+
+
+class PlanificadorRefresco:
+    """
+    Revalida cada hoja en un hilo de fondo antes de que venza, así ninguna
+    página la encuentra vieja. El intervalo de cada hoja se aprende de sus
+    descargas: se reduce a la mitad cuando trae contenido nuevo y crece un
+    50 % cuando no (entre REFRESCO_MIN_S y REFRESCO_MAX_S). Dentro de una
+    ventana de entrenamiento o partido, las hojas de HOJAS_EN_VIVO no pasan
+    de REFRESCO_VENTANA_S. Solo se revalidan las hojas que alguien leyó en
+    los últimos REFRESCO_INACTIVA_S.
+    """
+
+    def __init__(self, almacen: AlmacenHojas, inicial: float = DATOS_TTL_S,
+                 minimo: float = REFRESCO_MIN_S, maximo: float = REFRESCO_MAX_S,
+                 inactiva: float = REFRESCO_INACTIVA_S):
+        self.almacen  = almacen
+        self.inicial  = inicial
+        self.minimo   = minimo
+        self.maximo   = maximo
+        self.inactiva = inactiva
+        self._hojas: dict[str, dict] = {}
+        self._lock     = threading.Lock()
+        self._despertar = threading.Event()
+        self._hilo     = None
+        self._ventanas = (None, None)   # (firma de Entrenamientos_Dia y Partidos, ventanas)
+
+    def _hoja(self, nombre: str) -> dict:
+        # Llamar con self._lock tomado
+        if nombre not in self._hojas:
+            self._hojas[nombre] = {
+                "intervalo": self.inicial, "lecturas": 0, "aciertos": 0,
+                "refrescos": 0, "cambios": 0, "desde": time.time(),
+                "ultima_lectura": 0.0, "reintento": 0.0,
+            }
+        return self._hojas[nombre]
+
+    # — Ventanas de entrenamiento y partido ———————————————————
+
+    def ventanas(self) -> pd.DataFrame:
+        """inicio, fin y tipo de cada entrenamiento y partido de la temporada."""
+        nombres = ("Entrenamientos_Dia", "Partidos")
+        firma, frames = self.almacen.instantanea(nombres)
+        if self._ventanas[0] == firma:
+            return self._ventanas[1]
+        partes = []
+        try:
+            dias = frames["Entrenamientos_Dia"]
+            if "fecha" in dias.columns:
+                desde, hasta = (pd.to_timedelta(h + ":00") for h in HORARIO_ENTRENAMIENTO)
+                fechas = pd.Series(parse_fecha(dias["fecha"]).dropna().dt.normalize().unique())
+                partes.append(pd.DataFrame({
+                    "inicio": fechas + desde, "fin": fechas + hasta, "tipo": "entrenamiento",
+                }))
+            partidos = frames["Partidos"]
+            if "fecha" in partidos.columns:
+                fechas = parse_fecha(partidos["fecha"]).dt.normalize()
+                horarios = partidos["horario"] if "horario" in partidos.columns else pd.Series("", index=partidos.index)
+                horas = pd.to_timedelta(horarios.astype(str).str.strip() + ":00", errors="coerce")
+                antes, despues = (pd.Timedelta(hours=h) for h in PARTIDO_VENTANA_H)
+                # Sin horario legible se toma todo el día del partido
+                partes.append(pd.DataFrame({
+                    "inicio": (fechas + horas + antes).fillna(fechas),
+                    "fin":    (fechas + horas + despues).fillna(fechas + pd.Timedelta(days=1)),
+                    "tipo":   "partido",
+                }).dropna(subset=["inicio"]))
+        except Exception:
+            # Con fechas ilegibles no hay ventanas: rige el intervalo aprendido
+            partes = []
+        columnas = {"inicio": "datetime64[ns]", "fin": "datetime64[ns]", "tipo": object}
+        ventanas = pd.concat(
+            [pd.DataFrame(columns=list(columnas)).astype(columnas), *partes], ignore_index=True
+        )
+        self._ventanas = (firma, ventanas)
+        return ventanas
+
+    def en_vivo(self, nombre: str, ahora: pd.Timestamp | None = None) -> bool:
+        """
+        True si la hoja se está cargando en este momento (ventana abierta).
+        Las ventanas son horas del club sin zona: ahora se pasa a ZONA_HORARIA
+        (un ahora sin zona se toma como hora del club).
+        """
+        if ahora is None:
+            ahora = pd.Timestamp.now(tz=ZONA_HORARIA)
+        if ahora.tzinfo is not None:
+            ahora = ahora.tz_convert(ZONA_HORARIA).tz_localize(None)
+        v = self.ventanas()
+        abiertas = set(v["tipo"][(v["inicio"] <= ahora) & (ahora < v["fin"])])
+        return any(nombre in HOJAS_EN_VIVO[tipo] for tipo in abiertas)
+
+    # — Intervalos ————————————————————————————————————————
+
+    def intervalo(self, nombre: str) -> float:
+        """Segundos que la hoja se da por buena después de cada descarga."""
+        with self._lock:
+            intervalo = self._hoja(nombre)["intervalo"]
+        if self.en_vivo(nombre):
+            return min(intervalo, REFRESCO_VENTANA_S)
+        return intervalo
+
+    def vence(self, nombre: str) -> float:
+        """Momento (epoch) de la próxima revalidación de la hoja."""
+        meta = self.almacen.meta.get(nombre)
+        vence = meta["fetched_at"] + self.intervalo(nombre) if meta else 0.0
+        with self._lock:
+            return max(vence, self._hoja(nombre)["reintento"])
+
+    def _activas(self, ahora: float) -> list[str]:
+        with self._lock:
+            return [n for n, h in self._hojas.items() if ahora - h["ultima_lectura"] <= self.inactiva]
+
+    # — Registro ———————————————————————————————————————————
+
+    def registrar_lectura(self, nombres) -> None:
+        """
+        Anota que una página leyó estas hojas. Un acierto es encontrarlas al
+        día; si alguna está vencida se despierta al hilo para revalidarla.
+        """
+        ahora = time.time()
+        vencidas = False
+        for nombre in nombres:
+            al_dia = self.almacen.edad(nombre) <= self.intervalo(nombre)
+            with self._lock:
+                hoja = self._hoja(nombre)
+                hoja["lecturas"] += 1
+                hoja["aciertos"] += al_dia
+                reanuda = ahora - hoja["ultima_lectura"] > self.inactiva
+                hoja["ultima_lectura"] = ahora
+            vencidas = vencidas or not al_dia or reanuda
+        if vencidas:
+            self._despertar.set()
+
+    def registrar_descarga(self, metas: dict, cambiadas, errores: dict) -> None:
+        """Ajusta el intervalo de cada hoja revalidada según si cambió o no."""
+        ahora = time.time()
+        with self._lock:
+            for nombre in metas:
+                hoja = self._hoja(nombre)
+                hoja["refrescos"] += 1
+                hoja["reintento"] = 0.0
+                if nombre in cambiadas:
+                    hoja["cambios"] += 1
+                    hoja["intervalo"] = max(self.minimo, hoja["intervalo"] / 2)
+                else:
+                    hoja["intervalo"] = min(self.maximo, max(self.minimo, hoja["intervalo"] * 1.5))
+            for nombre in errores:
+                # Sin red no se insiste: se reintenta pasado el mínimo
+                self._hoja(nombre)["reintento"] = ahora + self.minimo
+
+    # — Hilo de fondo ——————————————————————————————————————
+
+    def iniciar(self) -> None:
+        with self._lock:
+            if self._hilo is not None and self._hilo.is_alive():
+                return
+            self._hilo = threading.Thread(target=self._bucle, daemon=True)
+            self._hilo.start()
+
+    def _bucle(self) -> None:
+        while True:
+            ahora = time.time()
+            activas = self._activas(ahora)
+            vencen = {n: self.vence(n) for n in activas}
+            vencidas = [n for n, t in vencen.items() if t <= ahora]
+            if vencidas:
+                try:
+                    self.almacen._actualizar(vencidas)
+                except Exception as e:
+                    self.registrar_descarga({}, [], {n: str(e) for n in vencidas})
+                continue
+            # Dormir hasta el próximo vencimiento o hasta que una lectura avise
+            espera = min(vencen.values(), default=ahora + self.inactiva) - ahora
+            self._despertar.wait(max(1.0, espera))
+            self._despertar.clear()
+
+    def estado(self) -> pd.DataFrame:
+        """Estado por hoja, para inspeccionar el planificador."""
+        ahora = time.time()
+        filas = []
+        for nombre in sorted(self._hojas):
+            with self._lock:
+                hoja = dict(self._hojas[nombre])
+            horas = max(ahora - hoja["desde"], 1.0) / 3600
+            activa = ahora - hoja["ultima_lectura"] <= self.inactiva
+            filas.append({
+                "hoja":         nombre,
+                "intervalo_s":  round(self.intervalo(nombre)),
+                "proximo_s":    round(self.vence(nombre) - ahora) if activa else None,
+                "lecturas":     hoja["lecturas"],
+                "aciertos_pct": round(100 * hoja["aciertos"] / hoja["lecturas"]) if hoja["lecturas"] else None,
+                "refrescos":    hoja["refrescos"],
+                "cambios":      hoja["cambios"],
+                "cambios_h":    round(hoja["cambios"] / horas, 2),
+                "en_vivo":      self.en_vivo(nombre),
+            })
+        return pd.DataFrame(filas)
+
+
+@st.cache_resource
+def transporte_sheets() -> TransporteHTTP:
+    # Una instancia por proceso: comparten conexiones y estado del circuito
+    # las lecturas de la app y la sincronización de la base local
+    return TransporteHTTP()
+
+
+@st.cache_resource
+def almacen_hojas() -> AlmacenHojas:
+    if FUENTE_DATOS == "sintetica":
+        # Snapshots aparte: los datos generados nunca se mezclan con los reales
+        fuente = FuenteSintetica.desde_texto(SINTETICA_PARAMS)
+        almacen = AlmacenHojas(SNAPSHOT_DIR / f"sintetica-{fuente.firma()}", fuente=fuente)
+    else:
+        fuente = FuenteSQLite(SQLITE_PATH) if FUENTE_DATOS == "sqlite" else FuenteSheets(transporte_sheets())
+        almacen = AlmacenHojas(SNAPSHOT_DIR, fuente=fuente)
+    almacen.planificador = PlanificadorRefresco(almacen)
+    almacen.planificador.iniciar()
+    return almacen
+
+
+@st.cache_resource
+def base_local() -> FuenteSQLite:
+    # Una instancia por proceso: conserva las bases de los diffs entre sincronizaciones
+    return FuenteSQLite(SQLITE_PATH)
+
+
+def _avisar_errores(nombres) -> None:
+    """Muestra un aviso por cada hoja que no se pudo cargar y no tiene copia local."""
+    almacen = almacen_hojas()
+    for nombre in nombres:
+        if nombre in almacen.errores and nombre not in almacen.frames:
+            st.warning(f"⚠️ No se pudo cargar '{nombre}': {almacen.errores[nombre]}")
+
+
+# ─────────────────────────────────────────────
+#  NORMALIZACIÓN (una vez por versión de datos)
+# ─────────────────────────────────────────────
+
+# Columnas mínimas que usa la app en cada hoja
+ESQUEMAS = {
+    "Plantel":                  ["id_jugador", "nombre", "posicion"],
+    "Sesiones":                 ["id_sesion", "semana_num", "fecha_inicio_semana"],
+    "Tareas":                   ["nombre_tarea", "orden"],
+    "Asistencia_Entrenamiento": ["id_jugador", "estado"],
+    "Partidos":                 ["id_partido", "fecha", "rival"],
+    "PostPartido":              ["id_partido", "id_jugador"],
+    "Entrenamientos_Dia":       ["id_entreno_dia", "id_sesion", "dia_semana"],
+    "Videoanalisis":            ["id_partido", "link_youtube"],
+}
+
+
+def parse_fecha(s: pd.Series) -> pd.Series:
+    """
+    Fechas en FORMATO_FECHA a datetime; lo que no tenga ese formato se
+    prueba como ISO (así vuelven de SQLite) y después con día primero.
+    Cada valor distinto se parsea una sola vez.
+    """
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    codigos, valores = pd.factorize(s)
+    valores = pd.Series(valores, dtype=object)
+    fechas = pd.to_datetime(valores, format=FORMATO_FECHA, errors="coerce")
+    for formato in ("ISO8601", "mixed"):
+        resto = fechas.isna()
+        if not resto.any():
+            break
+        fechas[resto] = pd.to_datetime(valores[resto], format=formato, dayfirst=True, errors="coerce")
+    # El código -1 (vacío) toma el NaT agregado al final
+    tabla = np.append(fechas.to_numpy(), np.datetime64("NaT"))
+    return pd.Series(tabla[codigos], index=s.index, name=s.name)
+
+
+def _a_entero(s: pd.Series) -> pd.Series:
+    """Entero nullable (Int32); lo que no es numérico queda como <NA>."""
+    if pd.api.types.is_integer_dtype(s):
+        return s.astype("Int32")
+    return (pd.to_numeric(s, errors="coerce") // 1).astype("Int32")
+
+
+def _no_numericos(s: pd.Series) -> pd.Series:
+    """Máscara de los valores no vacíos que _a_entero dejaría como <NA>."""
+    if pd.api.types.is_numeric_dtype(s):
+        return pd.Series(False, index=s.index)
+    return pd.to_numeric(s, errors="coerce").isna() & _a_texto(s).notna()
+
+
+def _a_estadistica(s: pd.Series) -> pd.Series:
+    """Estadística de partido: vacío o inválido cuenta como 0."""
+    return pd.to_numeric(s, errors="coerce").fillna(0).astype("int64")
+
+
+def _a_texto(s: pd.Series) -> pd.Series:
+    """Texto sin espacios sobrantes; vacíos, 'nan' y 'none' pasan a NaN."""
+    t = s.astype(str).str.strip()
+    return t.where(s.notna() & ~t.str.lower().isin(["", "nan", "none"]))
+
+
+def _a_categoria(s: pd.Series) -> pd.Series:
+    return _a_texto(s).astype("category")
+
+
+def _a_dia(s: pd.Series) -> pd.Series:
+    return _a_texto(s).str.title().astype(pd.CategoricalDtype(DIAS_ORDEN))
+
+
+def rellenar_nulos(s: pd.Series, valor) -> pd.Series:
+    """fillna que también sirve para columnas categóricas (devuelve object)."""
+    return s.astype(object).where(s.notna(), valor)
+
+
+# tipo de ESQUEMAS_CSV → conversor; "texto" queda como se leyó
+CONVERSOR_TIPO = {
+    "entero":      _a_entero,
+    "estadistica": _a_estadistica,
+    "categoria":   _a_categoria,
+    "dia":         _a_dia,
+    "fecha":       parse_fecha,
+}
+
+# hoja → {columna: conversor}, derivado del esquema
+CONVERSORES = {
+    hoja: {col: CONVERSOR_TIPO[tipo] for col, tipo in esquema.items() if tipo in CONVERSOR_TIPO}
+    for hoja, esquema in ESQUEMAS_CSV.items()
+}
+
+
+def normalizar_hoja(nombre: str, df: pd.DataFrame) -> tuple[pd.DataFrame, list]:
+    """
+    Tipa una hoja cruda: ids y enteros a Int32, fechas a datetime,
+    estadísticas a enteros y columnas de pocos valores (estado, posición,
+    tipo, día) a categóricas.
+    Parametros:
+        nombre: nombre de la hoja (elige los conversores de CONVERSORES)
+        df:     DataFrame tal como viene del CSV
+    Retorna:
+        (df_tipado, avisos): avisos son los problemas de la hoja para
+        mostrar en pantalla (columnas de ESQUEMAS que no vinieron, enteros
+        no numéricos que quedaron vacíos).
+    """
+    df = df.copy()
+    avisos = []
+    if not df.empty:
+        faltantes = [c for c in ESQUEMAS.get(nombre, []) if c not in df.columns]
+        if faltantes:
+            avisos.append(f"no tiene las columnas: {', '.join(faltantes)}")
+    for col, conversor in CONVERSORES.get(nombre, {}).items():
+        if col not in df.columns:
+            continue
+        if conversor is _a_entero:
+            invalidos = df.loc[_no_numericos(df[col]), col]
+            if not invalidos.empty:
+                ejemplos = ", ".join(map(str, invalidos.unique()[:5]))
+                avisos.append(
+                    f"tiene {len(invalidos)} fila(s) con '{col}' no numérico ({ejemplos}): "
+                    f"quedan sin {col}"
+                )
+        df[col] = conversor(df[col])
+    return df, avisos
+
+
+@st.cache_resource(max_entries=2 * len(HOJAS))
+def hoja_normalizada(nombre: str, hash_contenido: str | None, _df: pd.DataFrame) -> tuple[pd.DataFrame, list]:
+    # Clave de caché = hash de contenido: se recalcula solo si cambió la hoja.
+    # cache_resource: una sola copia por proceso que comparten todas las
+    # sesiones (cache_data deserializaba una copia entera en cada rerun).
+    # Si varias sesiones piden la misma versión a la vez, la arma una y las
+    # demás esperan ese resultado.
+    metricas_en_curso().contar("normalizar.miss")
+    with metricas_en_curso().medir(f"normalizar.{nombre}"):
+        return normalizar_hoja(nombre, _df)
+
+
+def datos_normalizados(nombres, registrar: bool = True) -> tuple[tuple, dict, dict]:
+    """
+    Hojas pedidas ya normalizadas; solo descarga las que todavía no están
+    en memoria ni en disco. Cada sesión recibe una copia superficial de la
+    versión compartida: con copy-on-write (el modo de pandas 3, por eso
+    requirements.txt pide pandas>=3) no se duplican los datos y lo que
+    una sección le agregue o modifique no llega a las demás sesiones.
+    Parametros:
+        registrar: si la lectura cuenta para el planificador (ver obtener)
+    Retorna:
+        (firma, datos, avisos): hashes de contenido, dict hoja →
+        DataFrame tipado y dict hoja → avisos de normalizar_hoja.
+    """
+    nombres = list(nombres)
+    almacen = almacen_hojas()
+    almacen.obtener(nombres, registrar)
+    firma, frames = almacen.instantanea(nombres)
+    datos, avisos = {}, {}
+    metricas_en_curso().contar("normalizar.llamadas", len(nombres))
+    for nombre, hash_contenido in zip(nombres, firma):
+        compartida, avisos_hoja = hoja_normalizada(nombre, hash_contenido, frames[nombre])
+        datos[nombre] = compartida.copy(deep=False)
+        if avisos_hoja:
+            avisos[nombre] = avisos_hoja
+    return firma, datos, avisos
+
+
+# ─────────────────────────────────────────────
+#  ÍNDICES RELACIONALES (una vez por versión de datos)
+# ─────────────────────────────────────────────
+
+class Indice:
+    """
+    Filas de un DataFrame agrupadas por una columna clave: traer las filas
+    de una clave es un acceso a dict, no un escaneo de toda la temporada.
+    Los grupos se comparten entre reruns y sesiones: no modificarlos in place.
+    """
+
+    def __init__(self, df: pd.DataFrame, columna: str):
+        self.vacio = df.iloc[0:0]
+        if columna in df.columns and not df.empty:
+            self.grupos = dict(tuple(df.groupby(columna, sort=False)))
+        else:
+            self.grupos = {}
+
+    def __getitem__(self, clave) -> pd.DataFrame:
+        return self.grupos.get(clave, self.vacio)
+
+    def varios(self, claves) -> pd.DataFrame:
+        """Filas de todas las claves indicadas, en un DataFrame nuevo."""
+        partes = [self.grupos[c] for c in claves if c in self.grupos]
+        return pd.concat(partes) if partes else self.vacio.copy()
+
+
+def con_plantel(df: pd.DataFrame, plantel: pd.DataFrame) -> pd.DataFrame:
+    """Agrega nombre y posición del jugador a filas que tienen id_jugador."""
+    cols = [c for c in ["id_jugador", "nombre", "posicion"] if c in plantel.columns]
+    if df.empty or "id_jugador" not in df.columns or "id_jugador" not in cols or len(cols) == 1:
+        return df
+    return df.merge(plantel[cols], on="id_jugador", how="left")
+
+
+def _tareas_con_dia(datos: dict) -> pd.DataFrame:
+    """Tareas con su día de la semana y en el orden del entrenamiento."""
+    tareas, entrenamientos = datos["Tareas"], datos["Entrenamientos_Dia"]
+    if (
+        "dia_semana" not in tareas.columns
+        and "id_entreno_dia" in tareas.columns
+        and {"id_entreno_dia", "dia_semana"} <= set(entrenamientos.columns)
+    ):
+        tareas = tareas.merge(
+            entrenamientos[["id_entreno_dia", "dia_semana"]], on="id_entreno_dia", how="left"
+        )
+    if "orden" in tareas.columns:
+        tareas = tareas.sort_values("orden", kind="stable")
+    return tareas
+
+
+def normalizar_nombre(texto) -> str:
+    """Clave de comparación de nombres: sin tildes, en minúsculas y con espacios simples."""
+    descompuesto = unicodedata.normalize("NFKD", str(texto))
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_tildes.casefold().split())
+
+
+class IndiceEtiquetas:
+    """
+    Índice invertido jugador ↔ clip a partir de "jugadores_etiquetados".
+    Cada etiqueta se separa por comas y se normaliza (normalizar_nombre),
+    así "Juan" no matchea "Juanma" y "Martín" es lo mismo que "martin".
+    Las etiquetas que coinciden con un nombre del plantel quedan resueltas
+    a su id_jugador.
+    """
+
+    def __init__(self, videoanalisis: pd.DataFrame, plantel: pd.DataFrame):
+        self.clips_por_clave: dict[str, list] = {}
+        self.claves_por_clip: dict = {}
+        self.nombres: dict[str, str] = {}     # clave → nombre para mostrar
+        self.clips_por_jugador: dict = {}     # id_jugador → clips
+
+        id_por_clave = {}
+        if {"id_jugador", "nombre"} <= set(plantel.columns):
+            for id_jug, nombre in zip(plantel["id_jugador"], plantel["nombre"]):
+                if pd.notna(nombre):
+                    clave = normalizar_nombre(nombre)
+                    id_por_clave.setdefault(clave, id_jug)
+                    self.nombres.setdefault(clave, str(nombre).strip())
+
+        if "jugadores_etiquetados" in videoanalisis.columns:
+            etiquetas = (
+                videoanalisis["jugadores_etiquetados"].dropna().astype(str)
+                .str.split(",").explode().str.strip()
+            )
+            etiquetas = etiquetas[etiquetas != ""]
+            for clip, etiqueta in etiquetas.items():
+                clave = normalizar_nombre(etiqueta)
+                self.nombres.setdefault(clave, etiqueta)
+                claves_clip = self.claves_por_clip.setdefault(clip, [])
+                if clave not in claves_clip:
+                    claves_clip.append(clave)
+                    self.clips_por_clave.setdefault(clave, []).append(clip)
+
+        self.clips_por_jugador = {
+            id_jug: self.clips_por_clave[clave]
+            for clave, id_jug in id_por_clave.items()
+            if clave in self.clips_por_clave
+        }
+
+    def claves_en(self, clips) -> list[str]:
+        """Jugadores etiquetados en los clips indicados, ordenados por nombre."""
+        claves = {c for clip in clips for c in self.claves_por_clip.get(clip, [])}
+        return sorted(claves, key=lambda c: self.nombres[c])
+
+
+ESTADOS_ASISTENCIA = ["Presente", "Ausente", "Diferenciado"]
+STATS_PARTIDO      = ["minutos", "goles", "asistencias"]
+
+
+def construir_resumen_jugadores(datos: dict, etiquetas: IndiceEtiquetas) -> pd.DataFrame:
+    """
+    Tabla de temporada por jugador, indexada por id_jugador: nombre,
+    posición, entrenamientos por estado, partidos, minutos, goles,
+    asistencias y la lista de clips (índices de Videoanalisis) donde aparece.
+    """
+    plantel = datos["Plantel"]
+    if plantel.empty or "id_jugador" not in plantel.columns:
+        return pd.DataFrame()
+    cols_base = [c for c in ["nombre", "posicion"] if c in plantel.columns]
+    resumen = plantel.drop_duplicates("id_jugador").set_index("id_jugador")[cols_base].copy()
+
+    ast = datos["Asistencia_Entrenamiento"]
+    if {"id_jugador", "estado"} <= set(ast.columns):
+        conteo = ast.groupby(["id_jugador", "estado"], observed=True).size().unstack(fill_value=0)
+    else:
+        conteo = pd.DataFrame()
+    for est in ESTADOS_ASISTENCIA:
+        col = conteo[est] if est in conteo.columns else pd.Series(dtype="int64")
+        resumen[est] = col.reindex(resumen.index, fill_value=0).astype(int)
+
+    pp = datos["PostPartido"]
+    if "id_jugador" in pp.columns:
+        por_jugador = pp.groupby("id_jugador")
+        resumen["partidos"] = por_jugador.size().reindex(resumen.index, fill_value=0).astype(int)
+        for col in STATS_PARTIDO:
+            if col in pp.columns:
+                resumen[col] = por_jugador[col].sum().reindex(resumen.index, fill_value=0).astype(int)
+    else:
+        resumen["partidos"] = 0
+
+    resumen["clips"] = [etiquetas.clips_por_jugador.get(i, []) for i in resumen.index]
+    return resumen
+
+
+# ─────────────────────────────────────────────
+#  CUBO DE ESTADÍSTICAS DE PARTIDO
+# ─────────────────────────────────────────────
+
+DIMENSIONES_CUBO = ["id_jugador", "posicion", "torneo", "rival", "mes"]
+MEDIDAS_CUBO     = ["presencias", *STATS_PARTIDO]
+
+
+def hechos_partido(datos: dict) -> pd.DataFrame:
+    """
+    Una fila por jugador y partido con las dimensiones del cubo (jugador,
+    posición, torneo, rival, mes "AAAA-MM") y las medidas (presencias = 1,
+    minutos, goles, asistencias).
+    """
+    pp, partidos, plantel = datos["PostPartido"], datos["Partidos"], datos["Plantel"]
+    if not {"id_partido", "id_jugador"} <= set(pp.columns):
+        return pd.DataFrame(columns=["id_partido", *DIMENSIONES_CUBO, *MEDIDAS_CUBO])
+
+    hechos = pd.DataFrame({"id_partido": pp["id_partido"], "id_jugador": pp["id_jugador"]})
+    por_partido = partidos.drop_duplicates("id_partido").set_index("id_partido") \
+        if "id_partido" in partidos.columns else pd.DataFrame()
+    por_jugador = plantel.drop_duplicates("id_jugador").set_index("id_jugador") \
+        if "id_jugador" in plantel.columns else pd.DataFrame()
+
+    if "fecha" in por_partido.columns:
+        # El mes se arma una vez por partido, no por cada fila de jugador
+        fecha = pd.to_datetime(por_partido["fecha"])
+        por_partido = por_partido.assign(mes=fecha.dt.strftime("%Y-%m").where(fecha.notna()))
+
+    def dimension(tabla, clave, col):
+        if col not in tabla.columns:
+            return pd.Series(pd.NA, index=hechos.index, dtype=object)
+        return hechos[clave].map(tabla[col].astype(object))
+
+    hechos["posicion"] = dimension(por_jugador, "id_jugador", "posicion")
+    hechos["torneo"]   = dimension(por_partido, "id_partido", "torneo")
+    hechos["rival"]    = dimension(por_partido, "id_partido", "rival")
+    hechos["mes"]      = dimension(por_partido, "id_partido", "mes")
+    hechos["presencias"] = 1
+    for col in STATS_PARTIDO:
+        hechos[col] = pp[col].to_numpy() if col in pp.columns else 0
+    return hechos.reset_index(drop=True)
+
+
+def _agrupar(hechos: pd.DataFrame, dims: tuple) -> pd.DataFrame:
+    if not dims:
+        return hechos[MEDIDAS_CUBO].sum().to_frame().T
+    return hechos.groupby(list(dims), dropna=False, observed=True)[MEDIDAS_CUBO].sum()
+
+
+class CuboEstadisticas:
+    """
+    Estadísticas de partido pre-agregadas por combinación de dimensiones
+    (DIMENSIONES_CUBO). Cada rollup se arma la primera vez que se usa y
+    queda para toda la versión de datos; las consultas se memorizan, así
+    que repetirlas no vuelve a recorrer la temporada.
+    """
+
+    def __init__(self, hechos: pd.DataFrame, rollups: dict | None = None, hashes=None):
+        self.hechos    = hechos
+        self._hashes   = hashes if hashes is not None else pd.util.hash_pandas_object(hechos, index=False).to_numpy()
+        self.rollups   = rollups if rollups is not None else {}
+        self._consultas: dict = {}
+
+    def rollup(self, dims: tuple) -> pd.DataFrame:
+        """Totales agrupados exactamente por `dims` (en el orden de DIMENSIONES_CUBO)."""
+        if dims not in self.rollups:
+            self.rollups[dims] = _agrupar(self.hechos, dims)
+        return self.rollups[dims]
+
+    def con_filas(self, hechos: pd.DataFrame) -> "CuboEstadisticas":
+        """
+        Cubo para la nueva versión de los hechos. Si solo se agregaron filas
+        (partidos nuevos), suma sus totales a los rollups ya armados; si
+        cambió o se borró alguna fila existente, arranca de cero.
+        """
+        hashes = pd.util.hash_pandas_object(hechos, index=False).to_numpy()
+        # Como multiconjuntos: una fila repetida cuenta tantas veces como aparece
+        previas = pd.Series(self._hashes).value_counts()
+        actuales = pd.Series(hashes)
+        if (actuales.value_counts().reindex(previas.index, fill_value=0) < previas).any():
+            return CuboEstadisticas(hechos, hashes=hashes)
+        # Nuevas: las apariciones de cada fila más allá de las que ya había
+        ocurrencia = actuales.groupby(actuales).cumcount().to_numpy()
+        ya_estaban = ocurrencia < actuales.map(previas).fillna(0).to_numpy()
+        nuevos = hechos[~ya_estaban]
+        rollups = {}
+        for dims, actual in list(self.rollups.items()):
+            if not dims:
+                rollups[dims] = actual + _agrupar(nuevos, dims).to_numpy()
+                continue
+            juntos = pd.concat([actual, _agrupar(nuevos, dims)])
+            rollups[dims] = juntos.groupby(level=list(dims), dropna=False).sum()
+        return CuboEstadisticas(hechos, rollups, hashes)
+
+    def consulta(self, por=(), **filtros) -> pd.DataFrame:
+        """
+        Totales agrupados por las dimensiones de `por`, opcionalmente
+        filtrando otras (cubo.consulta(("posicion", "mes"), torneo="Apertura")).
+        Retorna:
+            DataFrame con las dimensiones como columnas y las MEDIDAS_CUBO.
+        """
+        filtros = {d: v for d, v in filtros.items() if v is not None}
+        clave = (tuple(por), tuple(sorted(filtros.items())))
+        if clave not in self._consultas:
+            self._consultas[clave] = self._resolver(tuple(por), filtros)
+        return self._consultas[clave].copy()
+
+    def _resolver(self, por: tuple, filtros: dict) -> pd.DataFrame:
+        dims = tuple(d for d in DIMENSIONES_CUBO if d in por or d in filtros)
+        tabla = self.rollup(dims)
+        if filtros:
+            mascara = np.ones(len(tabla), dtype=bool)
+            for d, v in filtros.items():
+                mascara &= tabla.index.get_level_values(d) == v
+            tabla = tabla[mascara]
+            if len(por) < len(dims):
+                tabla = tabla.groupby(level=list(por), dropna=False).sum() if por else tabla.sum().to_frame().T
+        return tabla.reset_index() if por else tabla.reset_index(drop=True)
+
+
+@st.cache_resource
+def _cubo_vigente() -> dict:
+    # Último cubo armado: base para sumar solo los partidos nuevos
+    return {}
+
+
+def construir_cubo(datos: dict) -> CuboEstadisticas:
+    hechos = hechos_partido(datos)
+    vigente = _cubo_vigente()
+    previo = vigente.get("cubo")
+    cubo = previo.con_filas(hechos) if previo is not None else CuboEstadisticas(hechos)
+    vigente["cubo"] = cubo
+    return cubo
+
+
+# ─────────────────────────────────────────────
+#  ANALÍTICA DE ASISTENCIA (rangos de fechas)
+# ─────────────────────────────────────────────
+
+def asistencia_fechada(datos: dict) -> pd.DataFrame:
+    """
+    Una fila por jugador y entrenamiento con la fecha del día, ordenada por
+    jugador y fecha. Si Entrenamientos_Dia no trae fecha se deduce del
+    inicio de la semana (Sesiones) más el día de la semana.
+    Retorna:
+        DataFrame con id_jugador, fecha, estado, presente, ausente y diferenciado.
+    """
+    ast, dias, sesiones = datos["Asistencia_Entrenamiento"], datos["Entrenamientos_Dia"], datos["Sesiones"]
+    vacio = pd.DataFrame(columns=["id_jugador", "fecha", "estado", "presente", "ausente", "diferenciado"])
+    if not {"id_jugador", "estado", "id_entreno_dia"} <= set(ast.columns) or "id_entreno_dia" not in dias.columns:
+        return vacio
+
+    dias = dias.drop_duplicates("id_entreno_dia")
+    fecha = dias["fecha"] if "fecha" in dias.columns else pd.Series(pd.NaT, index=dias.index)
+    if fecha.isna().any() and {"id_sesion", "dia_semana"} <= set(dias.columns) \
+            and {"id_sesion", "fecha_inicio_semana"} <= set(sesiones.columns):
+        inicio = dias["id_sesion"].map(
+            sesiones.drop_duplicates("id_sesion").set_index("id_sesion")["fecha_inicio_semana"]
+        )
+        offset = pd.to_timedelta(dias["dia_semana"].cat.codes.where(dias["dia_semana"].notna()), unit="D")
+        fecha = fecha.fillna(inicio + offset)
+    fecha_por_dia = pd.Series(fecha.to_numpy(), index=dias["id_entreno_dia"].to_numpy())
+
+    df = pd.DataFrame({
+        "id_jugador": ast["id_jugador"].to_numpy(),
+        "fecha":      ast["id_entreno_dia"].map(fecha_por_dia).to_numpy(),
+        "estado":     ast["estado"].to_numpy(),
+    }).dropna(subset=["id_jugador", "fecha"])
+    df["fecha"] = pd.to_datetime(df["fecha"]).dt.normalize()
+    for est in ESTADOS_ASISTENCIA:
+        df[est.lower()] = (df["estado"] == est).to_numpy()
+    return df.sort_values(["id_jugador", "fecha"], kind="stable").reset_index(drop=True)
+
+
+def _rachas_ausencia(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ausencias consecutivas por jugador (df ordenado por jugador y fecha).
+    Retorna:
+        DataFrame por id_jugador con racha_actual y racha_max.
+    """
+    # Cada asistencia (o diferenciado) corta la racha y abre un tramo nuevo
+    tramo = (~df["ausente"]).groupby(df["id_jugador"]).cumsum()
+    racha = df["ausente"].astype(int).groupby([df["id_jugador"], tramo]).cumsum()
+    por_jugador = racha.groupby(df["id_jugador"])
+    return pd.DataFrame({"racha_actual": por_jugador.last(), "racha_max": por_jugador.max()})
+
+
+@st.cache_resource(max_entries=32)
+def analitica_asistencia(firma: tuple, desde: date, hasta: date, _fechada: pd.DataFrame) -> dict:
+    """
+    Métricas de asistencia de todo el plantel para un rango de fechas, en
+    una sola pasada vectorizada. Se cachea por versión de datos y rango y
+    se comparte entre sesiones: no modificar el resultado in place.
+    Parametros:
+        firma:    hashes de las hojas de origen (clave de caché)
+        desde:    primer día del rango (inclusive)
+        hasta:    último día del rango (inclusive); las ventanas de 7 y 28
+                  días terminan acá
+        _fechada: salida de asistencia_fechada (no se hashea)
+    Retorna:
+        dict con "resumen" (por id_jugador: sesiones, % presente,
+        disponibilidad 7d/28d, rachas de ausencia y diferenciados de los
+        últimos 28 días contra los 28 anteriores) y "semanal"
+        (id_jugador × semana → % presente, para el heatmap).
+    """
+    fin = pd.Timestamp(hasta)
+    df = _fechada[_fechada["fecha"].between(pd.Timestamp(desde), fin)]
+    if df.empty:
+        return {"resumen": pd.DataFrame(), "semanal": pd.DataFrame()}
+
+    dias_atras = (fin - df["fecha"]).dt.days
+    en_7, en_28 = dias_atras < 7, dias_atras < 28
+    prev_28 = (dias_atras >= 28) & (dias_atras < 56)
+    por_jugador = df.groupby("id_jugador")
+
+    resumen = pd.DataFrame({
+        "sesiones":     por_jugador.size(),
+        "presente":     por_jugador["presente"].sum(),
+        "ausente":      por_jugador["ausente"].sum(),
+        "diferenciado": por_jugador["diferenciado"].sum(),
+    })
+    resumen["pct_presente"] = resumen["presente"] / resumen["sesiones"] * 100
+    for dias, mascara in [(7, en_7), (28, en_28)]:
+        ventana = df["presente"].where(mascara)
+        # NaN = sin entrenamientos del jugador en la ventana
+        resumen[f"disp_{dias}d"] = ventana.groupby(df["id_jugador"]).mean() * 100
+    resumen["dif_28d"]      = (df["diferenciado"] & en_28).groupby(df["id_jugador"]).sum()
+    resumen["dif_28d_prev"] = (df["diferenciado"] & prev_28).groupby(df["id_jugador"]).sum()
+    resumen["tendencia_dif"] = resumen["dif_28d"] - resumen["dif_28d_prev"]
+    resumen = resumen.join(_rachas_ausencia(df))
+
+    semana = df["fecha"] - pd.to_timedelta(df["fecha"].dt.weekday, unit="D")
+    semanal = (
+        df.assign(semana=semana)
+          .pivot_table(index="id_jugador", columns="semana", values="presente", aggfunc="mean")
+        * 100
+    )
+    return {"resumen": resumen, "semanal": semanal}
+
+
+# índice → (hojas de las que depende, constructor). Las asistencias y
+# estadísticas vienen unidas con nombre y posición del plantel. Un
+# constructor que usa otro índice lo pide a `indices`: durante la
+# construcción está fijado a la misma versión de las hojas.
+INDICES = {
+    "dias_por_sesion": (
+        ("Entrenamientos_Dia",),
+        lambda d: Indice(d["Entrenamientos_Dia"], "id_sesion"),
+    ),
+    "tareas_por_dia": (
+        ("Tareas", "Entrenamientos_Dia"),
+        lambda d: Indice(_tareas_con_dia(d), "id_entreno_dia"),
+    ),
+    "asistencia_por_dia": (
+        ("Asistencia_Entrenamiento", "Plantel"),
+        lambda d: Indice(con_plantel(d["Asistencia_Entrenamiento"], d["Plantel"]), "id_entreno_dia"),
+    ),
+    "etiquetas": (
+        ("Videoanalisis", "Plantel"),
+        lambda d: IndiceEtiquetas(d["Videoanalisis"], d["Plantel"]),
+    ),
+    "asistencia_fechada": (
+        ("Asistencia_Entrenamiento", "Entrenamientos_Dia", "Sesiones"),
+        asistencia_fechada,
+    ),
+    "cubo_partidos": (
+        ("PostPartido", "Partidos", "Plantel"),
+        construir_cubo,
+    ),
+    "resumen_jugadores": (
+        ("Plantel", "Asistencia_Entrenamiento", "PostPartido", "Videoanalisis"),
+        lambda d: construir_resumen_jugadores(d, indices["etiquetas"]),
+    ),
+}
+
+
+@st.cache_resource(max_entries=4 * len(INDICES))
+def _indice_cacheado(nombre: str, firma: tuple, _datos: dict):
+    # cache_resource: los índices se comparten tal cual, sin copiarlos en cada rerun.
+    # _datos (no se hashea) es la versión de las hojas que identifica firma.
+    hojas, constructor = INDICES[nombre]
+    metricas_en_curso().contar("indices.miss")
+    with metricas_en_curso().medir(f"indice.{nombre}"), indices.fijar(hojas, firma, _datos):
+        return constructor(_datos)
+
+
+class IndicesPerezosos:
+    """
+    Acceso a los índices por nombre (indices["dias_por_sesion"]). Cada uno
+    se arma la primera vez que se pide, solo con las hojas de las que
+    depende, y se reutiliza mientras esas hojas no cambien.
+
+    Dentro de fijar() los índices salen de la versión de las hojas que
+    recibió la sección, aunque el almacén ya tenga una más nueva: frames
+    e índices de una misma página nunca mezclan versiones.
+    """
+
+    def __init__(self):
+        # (hoja → hash, hoja → DataFrame) fijados en este hilo, o None
+        self._fijada = ContextVar("indices_fijados", default=None)
+
+    @contextmanager
+    def fijar(self, nombres, firma, datos: dict):
+        """
+        Durante el bloque, los índices de estas hojas se arman y buscan con
+        esta versión (firma y datos de una misma instantánea).
+        """
+        # Copias superficiales: si la sección agrega columnas a sus frames,
+        # no llegan a los índices (que se comparten entre sesiones)
+        fijados = {n: datos[n].copy(deep=False) for n in nombres}
+        token = self._fijada.set((dict(zip(nombres, firma)), fijados))
+        try:
+            yield
+        finally:
+            self._fijada.reset(token)
+
+    def _instantanea(self, hojas) -> tuple[tuple, dict]:
+        fijada = self._fijada.get()
+        if fijada is not None and all(h in fijada[1] for h in hojas):
+            firmas, datos = fijada
+            return tuple(firmas[h] for h in hojas), {h: datos[h] for h in hojas}
+        # Hojas que la sección no cargó: otra instantánea, coherente en sí misma
+        firma, datos, _ = datos_normalizados(hojas)
+        return firma, datos
+
+    def __getitem__(self, nombre: str):
+        hojas, _ = INDICES[nombre]
+        firma, datos = self._instantanea(hojas)
+        metricas_en_curso().contar("indices.pedidos")
+        return _indice_cacheado(nombre, firma, datos)
+
+    def firma(self, nombre: str) -> tuple:
+        """Versión de las hojas de las que depende el índice (para claves de caché)."""
+        return self.firma_hojas(INDICES[nombre][0])
+
+    def firma_hojas(self, hojas) -> tuple:
+        """Versión de estas hojas en la página (la fijada, si la sección las cargó)."""
+        return self._instantanea(hojas)[0]
+
+
+indices = IndicesPerezosos()
+
+
+# ─────────────────────────────────────────────
+#  CONSULTAS A LAS HOJAS (gviz tq)
+# ─────────────────────────────────────────────
+
+def _letra_columna(i: int) -> str:
+    """Posición de columna (0 = A) → letra de la hoja (A … Z, AA …)."""
+    letras = ""
+    i += 1
+    while i:
+        i, resto = divmod(i - 1, 26)
+        letras = chr(ord("A") + resto) + letras
+    return letras
+
+
+def _literal_tq(valor) -> str:
+    """Valor de Python/pandas → literal del lenguaje de consultas de gviz."""
+    if isinstance(valor, (pd.Timestamp, date)):
+        return f"date '{pd.Timestamp(valor):%Y-%m-%d}'"
+    if isinstance(valor, (int, np.integer)) and not isinstance(valor, bool):
+        return str(int(valor))
+    if isinstance(valor, (float, np.floating)):
+        return repr(float(valor))
+    texto = str(valor)
+    # gviz no tiene escape: se usa la otra comilla si el texto trae una
+    return f'"{texto}"' if "'" in texto else f"'{texto}'"
+
+
+class ConsultaGviz:
+    """
+    Consulta a una hoja, por nombre de columna: qué columnas traer y qué
+    filas (igualdad o lista de valores). tq() la traduce al lenguaje
+    de gviz con las letras de la hoja para que el filtro corra en Google;
+    filtrar() aplica la misma consulta a un DataFrame local, así el
+    resultado no depende de dónde salió.
+
+        ConsultaGviz("PostPartido").donde("id_partido", 12)
+        ConsultaGviz("Asistencia_Entrenamiento").en("id_entreno_dia", [40, 41, 42])
+    """
+
+    def __init__(self, hoja: str, columnas=None):
+        self.hoja     = hoja
+        self.columnas = tuple(columnas) if columnas else None   # None = las de ESQUEMAS_CSV
+        self.filtros  = []          # (operación, columna, valores)
+
+    def donde(self, columna: str, valor) -> "ConsultaGviz":
+        self.filtros.append(("=", columna, (valor,)))
+        return self
+
+    def en(self, columna: str, valores) -> "ConsultaGviz":
+        self.filtros.append(("en", columna, tuple(valores)))
+        return self
+
+    def clave(self) -> tuple:
+        """Identifica la consulta (para el caché por consulta)."""
+        return (self.hoja, self.columnas, tuple(
+            (op, col, tuple(str(v) for v in valores)) for op, col, valores in self.filtros
+        ))
+
+    def seleccion(self, disponibles) -> list[str]:
+        """Columnas a traer, de las que tiene la hoja, en el orden de la hoja."""
+        pedidas = self.columnas or ESQUEMAS_CSV.get(self.hoja) or disponibles
+        return [c for c in disponibles if c in pedidas]
+
+    def tq(self, encabezado: list[str]) -> str:
+        """
+        Texto de la consulta para gviz.
+        Parametros:
+            encabezado: nombres de columna de la hoja, en orden (dan la letra)
+        Lanza:
+            KeyError si un filtro usa una columna que la hoja no tiene y
+            ValueError si una lista de valores está vacía (gviz no tiene
+            cómo expresarlo; localmente da cero filas).
+        """
+        letra = {nombre: _letra_columna(i) for i, nombre in enumerate(encabezado)}
+        condiciones = []
+        for op, col, valores in self.filtros:
+            if op == "=":
+                condiciones.append(f"{letra[col]} = {_literal_tq(valores[0])}")
+            else:
+                if not valores:
+                    raise ValueError(f"lista vacía para {col}")
+                condiciones.append("(" + " or ".join(f"{letra[col]} = {_literal_tq(v)}" for v in valores) + ")")
+        consulta = "select " + ", ".join(letra[c] for c in self.seleccion(encabezado))
+        if condiciones:
+            consulta += " where " + " and ".join(condiciones)
+        return consulta
+
+    def sql(self, disponibles) -> tuple[str, list]:
+        """
+        La misma consulta en SQL para la base local (FuenteSQLite), con
+        parámetros; los filtros por columnas id usan sus índices.
+        Parametros:
+            disponibles: columnas de la tabla de la hoja
+        Lanza:
+            KeyError y ValueError en los mismos casos que tq().
+        """
+        condiciones, params = [], []
+        for op, col, valores in self.filtros:
+            if col not in disponibles:
+                raise KeyError(col)
+            if op == "=":
+                condiciones.append(f'"{col}" = ?')
+            else:
+                if not valores:
+                    raise ValueError(f"lista vacía para {col}")
+                condiciones.append(f'"{col}" IN ({", ".join("?" * len(valores))})')
+            params.extend(_valor_sql(v) for v in valores)
+        columnas = ", ".join(f'"{c}"' for c in self.seleccion(disponibles))
+        consulta = f'SELECT {columnas} FROM "{self.hoja}"'
+        if condiciones:
+            consulta += " WHERE " + " AND ".join(condiciones)
+        return consulta, params
+
+    def filtrar(self, df: pd.DataFrame) -> pd.DataFrame:
+        """La misma consulta sobre un DataFrame (normalizado) local."""
+        if any(col not in df.columns for _, col, _ in self.filtros):
+            return df.iloc[0:0]
+        mascara = pd.Series(True, index=df.index)
+        for _, col, valores in self.filtros:
+            mascara &= df[col].isin(valores)
+        return df.loc[mascara, self.seleccion(list(df.columns))]
+
+
+class ConsultasHojas:
+    """
+    Porciones de hojas grandes (un partido, una semana) sin bajar toda la
+    temporada. Si la hoja completa está en memoria y al día, se filtra ahí
+    sin tocar la red; si no, la consulta viaja a Google (tq) y su resultado
+    se guarda por consulta durante DATOS_TTL_S (o menos, si la hoja vence
+    antes). Con la base local, la consulta va a SQLite y usa sus índices.
+    Si la consulta falla, se usa la copia completa de siempre (AlmacenHojas).
+    """
+
+    def __init__(self, almacen: AlmacenHojas, transporte: TransporteHTTP,
+                 ttl: float = DATOS_TTL_S, max_entradas: int = 256):
+        self.almacen      = almacen
+        self.transporte   = transporte
+        self.ttl          = ttl
+        self.max_entradas = max_entradas
+        self._lock        = threading.Lock()
+        self._cache: dict[tuple, tuple[float, pd.DataFrame]] = {}
+        self._encabezados: dict[str, tuple[float, list[str]]] = {}
+        self._vuelos      = VuelosCompartidos()
+
+    def _remota(self) -> bool:
+        # Por nombre y no isinstance: la clase se redefine en cada rerun
+        return self.almacen.fuente.nombre == FuenteSheets.nombre
+
+    def _base_local(self, hoja: str) -> bool:
+        """True si la porción sale de la base SQLite (la hoja no está en memoria)."""
+        return self.almacen.fuente.nombre == FuenteSQLite.nombre and hoja not in self.almacen.frames
+
+    def _al_dia(self, hoja: str) -> bool:
+        return self.almacen.al_dia(hoja)
+
+    def _guardar(self, clave, valor) -> None:
+        with self._lock:
+            self._cache[clave] = (time.time(), valor)
+            if len(self._cache) > self.max_entradas:
+                self._cache.pop(min(self._cache, key=lambda k: self._cache[k][0]))
+
+    def _pedir(self, hoja: str, tq: str) -> tuple[bytes, list[bytes]]:
+        """(encabezado, registros) del CSV que devuelve gviz para la consulta."""
+        resp, _ = self.transporte.get(_sheet_url(hoja, tq))
+        resp.raise_for_status()
+        metricas_en_curso().contar("consultas.bytes_red", resp.raw.tell())
+        return _registros_csv(resp.content)
+
+    def encabezado(self, hoja: str) -> list[str]:
+        """
+        Nombres de columna de la hoja, en orden. Sale de la última descarga
+        completa o, si no hay, de una consulta sin filas ("limit 0").
+        """
+        contenido = self.almacen.contenidos.get(hoja)
+        if contenido is not None and contenido.encabezado:
+            return [c.strip() for c in next(csv.reader([contenido.encabezado.decode("utf-8-sig", "replace")]))]
+        with self._lock:
+            guardado = self._encabezados.get(hoja)
+        if guardado and time.time() - guardado[0] <= self.ttl:
+            return guardado[1]
+        encabezado, _ = self._pedir(hoja, "limit 0")
+        nombres = [c.strip() for c in next(csv.reader([encabezado.decode("utf-8-sig", "replace")]), [])]
+        with self._lock:
+            self._encabezados[hoja] = (time.time(), nombres)
+        return nombres
+
+    def columnas(self, hoja: str) -> list[str]:
+        """Columnas de la hoja sin bajarla entera (para elegir por qué filtrar)."""
+        if self._base_local(hoja):
+            try:
+                columnas = self.almacen.fuente.columnas(hoja)
+                if columnas:
+                    return columnas
+            except Exception:
+                pass
+        if self._remota() and not self._al_dia(hoja):
+            try:
+                return self.encabezado(hoja)
+            except Exception:
+                pass
+        return list(self.almacen.obtener([hoja], registrar=False)[hoja].columns)
+
+    def _consultar_remoto(self, consulta: ConsultaGviz) -> pd.DataFrame | None:
+        hoja = consulta.hoja
+        try:
+            encabezado = self.encabezado(hoja)
+            seleccion = consulta.seleccion(encabezado)
+            cabecera, registros = self._pedir(hoja, consulta.tq(encabezado))
+            df = _parsear_csv(cabecera, registros, hoja)
+        except Exception:
+            return None
+        if not set(seleccion) <= set(df.columns):
+            # Cambiaron las columnas de la hoja: las letras ya no sirven
+            with self._lock:
+                self._encabezados.pop(hoja, None)
+            return None
+        df, _ = normalizar_hoja(hoja, df[seleccion])
+        # Filtro local también: no cuesta nada y cubre un servidor que ignore tq
+        return consulta.filtrar(df).reset_index(drop=True)
+
+    def _consultar_sqlite(self, consulta: ConsultaGviz) -> pd.DataFrame | None:
+        hoja = consulta.hoja
+        try:
+            sql, params = consulta.sql(self.almacen.fuente.columnas(hoja))
+            df = self.almacen.fuente.consultar(sql, params)
+        except Exception:
+            return None
+        df, _ = normalizar_hoja(hoja, df)
+        return consulta.filtrar(df).reset_index(drop=True)
+
+    def _consultar_remoto_y_guardar(self, consulta: ConsultaGviz) -> pd.DataFrame | None:
+        df = self._consultar_remoto(consulta)
+        if df is not None:
+            self._guardar(consulta.clave(), df)
+        return df
+
+    def porcion(self, consulta: ConsultaGviz) -> pd.DataFrame:
+        """
+        Filas y columnas de la consulta, normalizadas. Cada llamada recibe
+        su propia copia superficial: modificarla no toca el caché.
+        """
+        hoja = consulta.hoja
+        if self._base_local(hoja):
+            df = self._consultar_sqlite(consulta)
+            if df is not None:
+                metricas_en_curso().contar("consultas.sqlite")
+                return df
+        if self._remota() and not self._al_dia(hoja):
+            clave = consulta.clave()
+            with self._lock:
+                guardado = self._cache.get(clave)
+            # Una porción no dura más que la hoja completa según el planificador
+            if guardado and time.time() - guardado[0] <= min(self.ttl, self.almacen.vigencia(hoja)):
+                metricas_en_curso().contar("consultas.cache")
+                return guardado[1].copy(deep=False)
+            # La misma consulta pedida a la vez por varias sesiones viaja una vez
+            df = self._vuelos.hacer(clave, functools.partial(self._consultar_remoto_y_guardar, consulta))
+            if df is not None:
+                metricas_en_curso().contar("consultas.red")
+                return df.copy(deep=False)
+        metricas_en_curso().contar("consultas.local")
+        # No cuenta como lectura: si no, el planificador seguiría bajando
+        # entera una hoja que solo se consulta por porciones
+        _, datos, _ = datos_normalizados([hoja], registrar=False)
+        return consulta.filtrar(datos[hoja])
+
+
+@st.cache_resource
+def consultas_hojas() -> ConsultasHojas:
+    return ConsultasHojas(almacen_hojas(), transporte_sheets())
+
+
+@st.cache_resource(max_entries=64)
+def _etiquetas_cacheadas(clave: tuple, contenido: int, firma_plantel: tuple,
+                         _videoanalisis: pd.DataFrame, _plantel: pd.DataFrame) -> IndiceEtiquetas:
+    # cache_resource: el índice se comparte entre reruns y sesiones sin copiarse
+    metricas_en_curso().contar("indices.miss")
+    return IndiceEtiquetas(_videoanalisis, _plantel)
+
+
+def etiquetas_de_porcion(consulta: ConsultaGviz, videoanalisis: pd.DataFrame,
+                         plantel: pd.DataFrame) -> IndiceEtiquetas:
+    """
+    Índice de etiquetas de una porción de Videoanalisis (p. ej. los clips de
+    un partido), cacheado por consulta, contenido de la porción y versión
+    del Plantel: un rerun no vuelve a separar ni normalizar las etiquetas.
+    El contenido entra en la clave porque la misma consulta puede traer
+    otras filas (o con otro índice) según de dónde salga la porción.
+    """
+    columnas = [c for c in ("jugadores_etiquetados",) if c in videoanalisis.columns]
+    contenido = int(pd.util.hash_pandas_object(videoanalisis[columnas], index=True).sum())
+    return _etiquetas_cacheadas(
+        consulta.clave(), contenido, indices.firma_hojas(["Plantel"]), videoanalisis, plantel
+    )
+
+
+# ─────────────────────────────────────────────
+#  SESSION STATE
+# ─────────────────────────────────────────────
+if "jugador_perfil" not in st.session_state:
+    st.session_state.jugador_perfil = None
+if "tema" not in st.session_state:
+    st.session_state.tema = "oscuro"   # valor inicial
+
+
+# ─────────────────────────────────────────────
+#  SIDEBAR — NAVEGACIÓN
+# ─────────────────────────────────────────────
+
+with st.sidebar:
+    # Centrar la imagen usando tres columnas
+    col_l, col_img, col_r = st.columns([1, 4, 1])
+    with col_img:
+        st.image(
+            "excursionistas.png",
+            width=180,
+        )
+    st.markdown("<h2 style='text-align: center'>Excursionistas 2026</h2>", unsafe_allow_html=True)
+    st.divider()
+
+    seccion = st.radio(
+        "Navegación",
+        options=["🏠 Inicio", "📅 Entrenamientos", "👥 Plantel", "🟡 Asistencia", "📹 Videoanálisis", "⚽ Post-Partido"],
+        label_visibility="collapsed",
+    )
+
+    st.divider()
+    if st.button("🔄 Refrescar datos"):
+        st.session_state.hojas_actualizadas = almacen_hojas().refrescar()
+        st.rerun()
+
+    if "hojas_actualizadas" in st.session_state:
+        cambiadas = st.session_state.pop("hojas_actualizadas")
+        if not cambiadas:
+            st.caption("Sin cambios en las hojas.")
+        for nombre in cambiadas:
+            st.caption(f"{nombre}: {describir_delta(almacen_hojas().meta[nombre].get('delta'))}")
+    st.caption("Datos guardados localmente; cada hoja se revalida sola, más seguido cuanto más cambia.")
+
+    with st.expander("💾 Base local (SQLite)"):
+        st.caption(f"Fuente actual: {almacen_hojas().fuente.nombre}")
+        if st.button("Sincronizar desde Sheets"):
+            resultado = sincronizar_sqlite(base_local())
+            for hoja, estado in resultado.items():
+                st.caption(f"{hoja}: {estado}")
+
+
+# ─────────────────────────────────────────────
+#  HELPER: carga las hojas que pide cada sección
+# ─────────────────────────────────────────────
+
+def cargar_todo(nombres=HOJAS) -> tuple[tuple, dict]:
+    """
+    Hojas que necesita una sección, normalizadas; avisa en pantalla si
+    alguna no se pudo cargar, le faltan columnas o tiene ids inválidos.
+    Retorna (firma, datos): hashes de contenido de las hojas y dict
+    nombre de hoja → DataFrame normalizado.
+    """
+    # Se sirve desde el almacén local (memoria o disco); si los datos están
+    # viejos se revalidan en segundo plano y la página no espera a Sheets.
+    with metricas.medir("cargar_todo"):
+        firma, datos, avisos = datos_normalizados(nombres)
+    _avisar_errores(nombres)
+    for nombre, avisos_hoja in avisos.items():
+        for aviso in avisos_hoja:
+            st.warning(f"⚠️ La hoja '{nombre}' {aviso}")
+    return firma, datos
+
+
+# helper para leer categoría (admite acento o sin acento en el nombre de columna)
+def get_categoria(row):
+    for col in ["categoría", "categoria", "anio_nac"]:
+        if col in row.index and pd.notna(row[col]) and str(row[col]).strip() not in ("", "nan"):
+            return str(row[col]).strip()
+    return "—"
+
+
+# ─────────────────────────────────────────────
+#  SECCIONES COMO FRAGMENTOS + TIEMPOS
+# ─────────────────────────────────────────────
+
+def registrar_tiempo(unidad: str, segundos: float) -> None:
+    """Guarda el tiempo de una ejecución (script completo o fragmento) en la sesión."""
+    if "tiempos_ejecucion" not in st.session_state:
+        st.session_state.tiempos_ejecucion = deque(maxlen=50)
+    st.session_state.tiempos_ejecucion.append((unidad, segundos * 1000))
+
+
+def abrir_perfil(nombre) -> None:
+    """Callback de los botones del plantel (None vuelve a la grilla)."""
+    st.session_state.jugador_perfil = nombre
+
+
+def seccion_fragmento(*hojas, usa_indices=()):
+    """
+    Declara una sección: las hojas que recibe como argumentos (en ese
+    orden) y los índices que consulta. Todas las hojas necesarias se cargan
+    juntas en paralelo la primera vez y la sección corre como st.fragment:
+    al tocar uno de sus widgets se reejecuta solo ella (no el CSS, el
+    sidebar ni las demás secciones).
+    """
+    necesarias = tuple(dict.fromkeys(
+        list(hojas) + [h for nombre in usa_indices for h in INDICES[nombre][0]]
+    ))
+
+    def decorador(func):
+        @functools.wraps(func)
+        def cuerpo():
+            t0 = time.perf_counter()
+            firma, datos = cargar_todo(necesarias)
+            # Los índices salen de la misma versión que los frames de la sección
+            with metricas.medir(f"render.{func.__name__}"), indices.fijar(necesarias, firma, datos):
+                func(*(datos[h] for h in hojas))
+            ms = (time.perf_counter() - t0) * 1000
+            registrar_tiempo(func.__name__, ms / 1000)
+            metricas.volcar(func.__name__, ms)
+            if DEBUG:
+                st.caption(f"⏱ {func.__name__}: {ms:.0f} ms")
+
+        fragmento = st.fragment(cuerpo)
+        fragmento.hojas = necesarias
+        return fragmento
+
+    return decorador
+
+
+# ─────────────────────────────────────────────
+#  FOTOS DEL PLANTEL (caché local de miniaturas)
+# ─────────────────────────────────────────────
+
+def _hay_url(url) -> bool:
+    return bool(url) and str(url).strip().lower() not in ("nan", "none", "")
+
+
+class CacheFotos:
+    """
+    Fotos de los jugadores guardadas por contenido (sha256 de la imagen
+    original) en una variante por tamaño de FOTOS_VARIANTES, en JPEG. Cada
+    foto_url se baja una sola vez; urls.json recuerda qué contenido tiene
+    cada URL. Si el directorio supera max_bytes se borran las variantes
+    usadas hace más tiempo.
+    """
+
+    def __init__(self, directorio: Path = FOTOS_DIR, max_bytes: int = FOTOS_MAX_BYTES):
+        self.directorio = Path(directorio)
+        self.max_bytes  = max_bytes
+        self._lock      = threading.Lock()
+        self._urls      = self._leer_urls()
+        self._fallidas: dict[str, float] = {}   # url → momento del último fallo
+
+    def _ruta(self, hash_foto: str, variante: str) -> Path:
+        return self.directorio / f"{hash_foto}_{variante}.jpg"
+
+    def _leer_urls(self) -> dict:
+        try:
+            return json.loads((self.directorio / "urls.json").read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def _guardar_urls(self) -> None:
+        ruta = self.directorio / "urls.json"
+        tmp = ruta.with_name(ruta.name + ".tmp")
+        tmp.write_text(json.dumps(self._urls), encoding="utf-8")
+        os.replace(tmp, ruta)
+
+    def _leer(self, url: str, variante: str) -> bytes | None:
+        hash_foto = self._urls.get(url)
+        if hash_foto is None:
+            return None
+        ruta = self._ruta(hash_foto, variante)
+        try:
+            datos = ruta.read_bytes()
+            os.utime(ruta)          # la fecha de acceso decide qué se borra primero
+            return datos
+        except OSError:
+            return None
+
+    def _descargar(self, url: str) -> None:
+        """Baja la foto original y guarda todas sus variantes."""
+        with urllib.request.urlopen(url, timeout=CARGA_TIMEOUT_S) as resp:
+            original = resp.read()
+        hash_foto = hashlib.sha256(original).hexdigest()
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        imagen = ImageOps.exif_transpose(Image.open(io.BytesIO(original))).convert("RGB")
+        for variante, lado in FOTOS_VARIANTES.items():
+            ruta = self._ruta(hash_foto, variante)
+            if ruta.exists():
+                continue        # misma foto publicada en otra URL
+            copia = imagen.copy()
+            copia.thumbnail((lado, lado))
+            tmp = ruta.with_name(ruta.name + ".tmp")
+            copia.save(tmp, format="JPEG", quality=82, optimize=True)
+            os.replace(tmp, ruta)
+        with self._lock:
+            self._urls[url] = hash_foto
+            self._guardar_urls()
+
+    def _podar(self) -> None:
+        variantes = sorted(self.directorio.glob("*.jpg"), key=lambda r: r.stat().st_mtime)
+        total = sum(r.stat().st_size for r in variantes)
+        for ruta in variantes:
+            if total <= self.max_bytes:
+                break
+            total -= ruta.stat().st_size
+            ruta.unlink(missing_ok=True)
+
+    def lote(self, urls, variante: str) -> dict:
+        """
+        Variante de cada foto, bajando en paralelo las que no están en caché.
+        Parametros:
+            urls:     foto_url de los jugadores (se ignoran las vacías)
+            variante: clave de FOTOS_VARIANTES
+        Retorna:
+            dict url → bytes JPEG; las fotos que no se pudieron bajar o
+            abrir no aparecen (se pueden mostrar desde la URL original).
+        """
+        urls = list(dict.fromkeys(str(u).strip() for u in urls if _hay_url(u)))
+        fotos = {u: self._leer(u, variante) for u in urls}
+        ahora = time.time()
+        faltan = [
+            u for u, datos in fotos.items()
+            if datos is None and ahora - self._fallidas.get(u, 0) > FOTOS_REINTENTO_S
+        ]
+        if faltan:
+            with ThreadPoolExecutor(max_workers=min(CARGA_MAX_WORKERS, len(faltan))) as pool:
+                list(pool.map(self._descargar_sin_error, faltan))
+            for u in faltan:
+                fotos[u] = self._leer(u, variante)
+            self._podar()
+        return {u: datos for u, datos in fotos.items() if datos is not None}
+
+    def _descargar_sin_error(self, url: str) -> None:
+        try:
+            self._descargar(url)
+        except Exception:
+            self._fallidas[url] = time.time()
+
+    def foto(self, url: str, variante: str) -> bytes | None:
+        return self.lote([url], variante).get(url)
+
+
+@st.cache_resource
+def cache_fotos() -> CacheFotos:
+    return CacheFotos(FOTOS_DIR)
+
+
+# ─────────────────────────────────────────────
+#  RENDER DE TARJETAS DE TAREAS (vectorizado)
+# ─────────────────────────────────────────────
+
+# Fragmentos de HTML precalculados por tipo de tarea; los comparten
+# el "Orden del día" de Inicio y la grilla semanal de Entrenamientos.
+ESTILO_TITULO_TAREA = "font-size:1.05rem;font-weight:700;color:#e8eaed;margin-bottom:2px;"
+ESTILO_DESC_TAREA   = "font-size:0.83rem;color:#e8eaed;font-weight:400;margin:5px 0 6px;line-height:1.4;"
+ESTILO_VIDEO_TAREA  = "font-size:0.8rem;color:#38bdf8;text-decoration:none;"
+
+
+def _apertura_tarjeta(colores: dict) -> str:
+    return f"<div class='tarea-card' style='background:{colores['bg']};border-left:4px solid {colores['border']};'>"
+
+
+def _apertura_badge(colores: dict) -> str:
+    return f"<span class='tipo-badge' style='background:{colores['bg']};color:{colores['text']};'>"
+
+
+PLANTILLA_TARJETA = {tipo: _apertura_tarjeta(c) for tipo, c in TIPO_COLORES.items()}
+PLANTILLA_BADGE   = {tipo: _apertura_badge(c) for tipo, c in TIPO_COLORES.items()}
+TARJETA_DEFAULT   = _apertura_tarjeta(TIPO_DEFAULT)
+BADGE_DEFAULT     = _apertura_badge(TIPO_DEFAULT)
+
+
+def _texto_col(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return _a_texto(df[col]).fillna("")
+
+
+def html_tarjetas_tareas(tareas: pd.DataFrame, con_video: bool = True) -> pd.Series:
+    """
+    HTML de la tarjeta de cada tarea, armado columna a columna (sin iterrows).
+    Parametros:
+        tareas:    filas de Tareas (normalizadas) en el orden a mostrar
+        con_video: agrega el link "▶ Ver vídeo" si la tarea tiene link_youtube
+    Retorna:
+        Serie de strings HTML, una por tarea, con el mismo índice que tareas.
+    """
+    if tareas.empty:
+        return pd.Series(dtype=object)
+    vacio = pd.Series("", index=tareas.index, dtype=object)
+
+    nombre = _texto_col(tareas, "nombre_tarea").replace("", "Sin nombre")
+    tipo   = _texto_col(tareas, "tipo")
+    descr  = _texto_col(tareas, "descrip_tarea")
+
+    apertura = tipo.map(PLANTILLA_TARJETA).fillna(TARJETA_DEFAULT)
+    tipo_h = (tipo.map(PLANTILLA_BADGE).fillna(BADGE_DEFAULT) + tipo + "</span>").where(tipo != "", "")
+
+    if "tiempo_min" in tareas.columns:
+        mins = pd.to_numeric(tareas["tiempo_min"], errors="coerce")
+        mins_h = ("⏱ " + (mins // 1).astype("Int64").astype(str) + " min").where(mins.notna(), "")
+    else:
+        mins_h = vacio
+    meta_h = (
+        "<div class='tarea-meta' style='margin-top:4px;'>" + tipo_h + mins_h + "</div>"
+    ).where((tipo_h != "") | (mins_h != ""), "")
+
+    desc_h = (f"<div style='{ESTILO_DESC_TAREA}'>" + descr + "</div>").where(descr != "", "")
+
+    if con_video:
+        link = _texto_col(tareas, "link_youtube")
+        yt_h = (
+            "<div style='margin-top:8px;'><a href='" + link
+            + f"' target='_blank' style='{ESTILO_VIDEO_TAREA}'>▶ Ver vídeo</a></div>"
+        ).where(link != "", "")
+    else:
+        yt_h = vacio
+
+    return (
+        apertura + f"<div style='{ESTILO_TITULO_TAREA}'>" + nombre + "</div>"
+        + desc_h + meta_h + yt_h + "</div>"
+    )
+
+
+def html_asistencia_dia(ast_dia: pd.DataFrame) -> str:
+    """Resumen de asistencia de un día: total y quiénes faltaron o hicieron diferenciado."""
+    if ast_dia.empty or "nombre" not in ast_dia.columns:
+        return ""
+    ausentes      = ast_dia.loc[ast_dia["estado"] == "Ausente", "nombre"].dropna().astype(str).tolist()
+    diferenciados = ast_dia.loc[ast_dia["estado"] == "Diferenciado", "nombre"].dropna().astype(str).tolist()
+    return _html_resumen_asistencia(len(ast_dia), ", ".join(ausentes), ", ".join(diferenciados))
+
+
+def html_asistencia_dias(ast: pd.DataFrame) -> dict:
+    """html_asistencia_dia de todos los días de una vez: id_entreno_dia → HTML."""
+    if ast.empty or not {"nombre", "id_entreno_dia", "estado"} <= set(ast.columns):
+        return {}
+    total = ast.groupby("id_entreno_dia").size()
+
+    def nombres(estado):
+        filas = ast[ast["estado"] == estado].dropna(subset=["nombre"])
+        return filas["nombre"].astype(str).groupby(filas["id_entreno_dia"]).agg(", ".join)
+
+    ausentes, diferenciados = nombres("Ausente"), nombres("Diferenciado")
+    return {
+        id_dia: _html_resumen_asistencia(n, ausentes.get(id_dia, ""), diferenciados.get(id_dia, ""))
+        for id_dia, n in total.items()
+    }
+
+
+def _html_resumen_asistencia(total: int, ausentes: str, diferenciados: str) -> str:
+    # Construir texto de jugadores no disponibles
+    lista_nombres = []
+    if ausentes:
+        lista_nombres.append(f"{ausentes} ausente")
+    if diferenciados:
+        lista_nombres.append(f"{diferenciados} diferenciado")
+    detalle_str = f" ({'; '.join(lista_nombres)})" if lista_nombres else ""
+
+    return (
+        f"<div style='margin-bottom:12px; font-size:0.85rem; color:#8d9db6; "
+        f"background:rgba(255,255,255,0.03); padding:6px; border-radius:6px;'>"
+        f"<b>{total} jugadores</b>{detalle_str}"
+        f"</div>"
+    )
+
+
+def html_columnas_semana(
+    dias_semana: pd.DataFrame,
+    tareas_sem: pd.DataFrame,
+    asistencia_por_dia,
+    tarjetas_todas: pd.Series | None = None,
+    asistencia_html: dict | None = None,
+) -> list[str]:
+    """
+    HTML completo de cada columna de la grilla semanal (encabezado,
+    asistencia y tarjetas), en el orden de DIAS_ORDEN. Cada columna se
+    emite después con un único st.markdown. Para armar muchas semanas
+    seguidas (packs) se pueden pasar las tarjetas de todas las tareas y
+    el HTML de asistencia de todos los días ya calculados.
+    """
+    if "orden" in tareas_sem.columns:
+        tareas_sem = tareas_sem.sort_values("orden", kind="stable")
+    if tarjetas_todas is not None:
+        tarjetas = tarjetas_todas.loc[tareas_sem.index]
+    else:
+        tarjetas = html_tarjetas_tareas(tareas_sem)
+    tarjetas_por_dia = (
+        tarjetas.groupby(tareas_sem["dia_semana"], observed=True).agg("".join).to_dict()
+        if not tarjetas.empty else {}
+    )
+    id_por_dia = {}
+    if not dias_semana.empty:
+        for id_dia, dia in zip(dias_semana["id_entreno_dia"], dias_semana["dia_semana"]):
+            id_por_dia.setdefault(dia, id_dia)
+
+    columnas = []
+    for dia in DIAS_ORDEN:
+        asistencia_h = ""
+        if dia in id_por_dia and asistencia_html is not None:
+            asistencia_h = asistencia_html.get(id_por_dia[dia], "")
+        elif dia in id_por_dia and asistencia_por_dia is not None:
+            asistencia_h = html_asistencia_dia(asistencia_por_dia[id_por_dia[dia]])
+        cuerpo = tarjetas_por_dia.get(dia) or "<p style='color:#8d9db6;font-size:.85rem;'>Sin tareas</p>"
+        columnas.append(f"<div class='dia-header'>📆 {dia}</div>{asistencia_h}{cuerpo}")
+    return columnas
+
+
+# ─────────────────────────────────────────────
+#  PACKS SEMANALES OFFLINE
+# ─────────────────────────────────────────────
+
+PACKS_HOJAS = ("Sesiones", "Entrenamientos_Dia", "Tareas", "Asistencia_Entrenamiento", "Plantel")
+
+PLANTILLA_PACK = """<!doctype html>
+<html lang="es"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width,initial-scale=1">
+<title>Semana {semana} — Excursionistas Reserva</title>
+{css}
+<style>
+body {{ background:{fondo}; color:{texto}; font-family:sans-serif; margin:1rem; }}
+.semana {{ display:flex; gap:16px; overflow-x:auto; padding-bottom:12px; }}
+.semana > div {{ flex:0 0 300px; }}
+</style></head><body>
+<h2>📅 Semana {semana}{tipo}</h2>
+<p style="color:#8d9db6;">Inicio: {inicio} · {resumen}</p>
+<div class="semana">{columnas}</div>
+</body></html>
+"""
+
+
+def _hash_por_dia(df: pd.DataFrame) -> dict:
+    """
+    Hash de las filas de cada id_entreno_dia (depende del orden y del
+    contenido), calculado para toda la hoja de una vez.
+    """
+    if df.empty or "id_entreno_dia" not in df.columns:
+        return {}
+    filas = pd.util.hash_pandas_object(df, index=False)
+    posicion = df.groupby("id_entreno_dia").cumcount().to_numpy(dtype="uint64") + np.uint64(1)
+    mezcla = pd.Series(filas.to_numpy() * posicion, index=df.index)
+    return mezcla.groupby(df["id_entreno_dia"]).sum().to_dict()
+
+
+def _conteos_por_dia(ast: pd.DataFrame) -> dict:
+    """id_entreno_dia → {estado: cantidad} para ESTADOS_ASISTENCIA."""
+    if ast.empty or not {"id_entreno_dia", "estado"} <= set(ast.columns):
+        return {}
+    tabla = ast.groupby(["id_entreno_dia", "estado"], observed=True).size().unstack(fill_value=0)
+    tabla = tabla.reindex(columns=ESTADOS_ASISTENCIA, fill_value=0)
+    return {id_dia: {est: int(n) for est, n in fila.items()} for id_dia, fila in tabla.iterrows()}
+
+
+def pack_semana(sesion: pd.Series, dias: pd.DataFrame, tareas_sem: pd.DataFrame,
+                columnas: list[str], conteos: dict) -> tuple[str, dict]:
+    """
+    Arma el pack de una semana.
+    Parametros:
+        columnas: HTML de las columnas de la grilla (html_columnas_semana)
+        conteos:  id_entreno_dia → conteo de asistencia por estado
+    Retorna:
+        (html, bundle): página autocontenida y dict JSON con las columnas
+        HTML, las tareas por día y el resumen de asistencia.
+    """
+    tareas_por_dia = {}
+    if "id_entreno_dia" in tareas_sem.columns:
+        for tarea in json.loads(tareas_sem.to_json(orient="records", date_format="iso")):
+            tareas_por_dia.setdefault(tarea["id_entreno_dia"], []).append(tarea)
+
+    conteo = Counter()
+    dias_bundle = []
+    for id_dia, dia_semana in zip(dias["id_entreno_dia"], dias["dia_semana"]):
+        conteo_dia = conteos.get(id_dia, {})
+        conteo.update(conteo_dia)
+        dias_bundle.append({
+            "id_entreno_dia": int(id_dia),
+            "dia_semana":     None if pd.isna(dia_semana) else str(dia_semana),
+            "tareas":         tareas_por_dia.get(int(id_dia), []),
+            "asistencia":     conteo_dia,
+        })
+
+    fecha = sesion.get("fecha_inicio_semana")
+    inicio = fecha.strftime("%d/%m/%Y") if pd.notna(fecha) else "—"
+    tipo = sesion.get("tipo_semana", "")
+    conteo = {est: conteo[est] for est in ESTADOS_ASISTENCIA} if conteo else {}
+    resumen = " · ".join(f"{n} {est.lower()}" for est, n in conteo.items()) or "sin asistencia cargada"
+
+    bundle = {
+        "semana_num":   int(sesion["semana_num"]),
+        "id_sesion":    int(sesion["id_sesion"]),
+        "tipo_semana":  None if pd.isna(tipo) else str(tipo),
+        "inicio":       inicio,
+        "asistencia":   conteo,
+        "dias":         dias_bundle,
+        "columnas":     columnas,
+    }
+    html = PLANTILLA_PACK.format(
+        semana=bundle["semana_num"],
+        tipo=f" — {tipo}" if tipo and pd.notna(tipo) else "",
+        inicio=inicio,
+        resumen=resumen,
+        css=CSS_APP,
+        fondo=COLOR_FONDO,
+        texto=COLOR_TEXTO,
+        columnas="".join(f"<div>{c}</div>" for c in columnas),
+    )
+    return html, bundle
+
+
+def _escribir(ruta: Path, texto: str) -> None:
+    tmp = ruta.with_name(ruta.name + ".tmp")
+    tmp.write_text(texto, encoding="utf-8")
+    os.replace(tmp, ruta)
+
+
+def exportar_packs_semanales(datos: dict, directorio: Path = PACKS_DIR) -> dict:
+    """
+    Genera semana_N.html y semana_N.json para cada semana de Sesiones. Solo
+    se reescriben las semanas cuyas filas (sesión, días, tareas, asistencia
+    con nombres) cambiaron desde la última exportación (manifest.json).
+    Retorna:
+        dict semana_num → "generado" | "sin cambios"
+    """
+    sesiones = datos["Sesiones"]
+    if sesiones.empty or not {"id_sesion", "semana_num"} <= set(sesiones.columns):
+        return {}
+    directorio = Path(directorio)
+    directorio.mkdir(parents=True, exist_ok=True)
+    try:
+        manifest = json.loads((directorio / "manifest.json").read_text(encoding="utf-8"))
+    except Exception:
+        manifest = {}
+
+    dias_por_sesion = indices["dias_por_sesion"]
+    tareas_por_dia  = indices["tareas_por_dia"] if "id_entreno_dia" in datos["Tareas"].columns else None
+    # Igual que la grilla: asistencia solo si hay plantel para ponerle nombre
+    hay_asistencia = not datos["Asistencia_Entrenamiento"].empty and not datos["Plantel"].empty
+    ast = con_plantel(datos["Asistencia_Entrenamiento"], datos["Plantel"]) if hay_asistencia else pd.DataFrame()
+
+    # Todo lo que es por tarea o por día se calcula una vez para todas las semanas
+    todas = pd.concat(tareas_por_dia.grupos.values()) if tareas_por_dia is not None and tareas_por_dia.grupos \
+        else pd.DataFrame()
+    tarjetas_todas  = html_tarjetas_tareas(todas)
+    asistencia_html = html_asistencia_dias(ast)
+    conteos         = _conteos_por_dia(ast)
+    hashes = {
+        "dias":   _hash_por_dia(datos["Entrenamientos_Dia"]),
+        "tareas": _hash_por_dia(todas),
+        "ast":    _hash_por_dia(ast),
+    }
+    columnas_hoja = {nombre: list(map(str, df.columns)) for nombre, df in [("tareas", todas), ("ast", ast)]}
+
+    resultado = {}
+    for _, sesion in sesiones.dropna(subset=["semana_num"]).drop_duplicates("semana_num").iterrows():
+        semana = int(sesion["semana_num"])
+        dias = dias_por_sesion[sesion["id_sesion"]]
+        ids_dia = dias["id_entreno_dia"].tolist() if not dias.empty else []
+
+        firma = hashlib.sha256(json.dumps([
+            PACKS_VERSION,
+            columnas_hoja,
+            sesion.astype(str).to_dict(),
+            [[str(i), *(str(hashes[k].get(i)) for k in ("dias", "tareas", "ast"))] for i in ids_dia],
+        ]).encode()).hexdigest()
+        nombre = f"semana_{semana}"
+        if manifest.get(nombre) == firma and (directorio / f"{nombre}.json").exists():
+            resultado[semana] = "sin cambios"
+            continue
+
+        tareas_sem = tareas_por_dia.varios(ids_dia) if tareas_por_dia is not None else pd.DataFrame()
+        if "dia_semana" in tareas_sem.columns:
+            tareas_sem = tareas_sem.dropna(subset=["dia_semana"])
+        columnas = html_columnas_semana(
+            dias, tareas_sem, None,
+            tarjetas_todas=tarjetas_todas if not tareas_sem.empty else None,
+            asistencia_html=asistencia_html,
+        )
+        html, bundle = pack_semana(sesion, dias, tareas_sem, columnas, conteos)
+        _escribir(directorio / f"{nombre}.html", html)
+        _escribir(directorio / f"{nombre}.json", json.dumps(bundle, ensure_ascii=False))
+        manifest[nombre] = firma
+        resultado[semana] = "generado"
+
+    _escribir(directorio / "manifest.json", json.dumps(manifest))
+    return resultado
+
+
+class ExportadorPacks:
+    """
+    Exporta los packs en un hilo de fondo, nunca dentro de la página que
+    los lee. Recuerda para qué versión de los datos (firma de PACKS_HOJAS)
+    quedaron exportados; con otra versión los packs en disco no se usan.
+    """
+
+    def __init__(self, espera: float = PACKS_ESPERA_S):
+        self.espera    = espera
+        self.exportada = None       # firma de los datos de los packs en disco
+        self._ultima   = 0.0        # arranque de la última exportación
+        self._hilo     = None
+        self._lock     = threading.Lock()
+
+    def pedir(self, firma: tuple) -> None:
+        """Lanza la exportación si los packs no están al día, salvo que ya haya una en curso."""
+        with self._lock:
+            if firma == self.exportada or (self._hilo is not None and self._hilo.is_alive()):
+                return
+            if self.exportada is not None and time.time() - self._ultima < self.espera:
+                return
+            self._ultima = time.time()
+            self._hilo = threading.Thread(target=self._exportar, daemon=True)
+            self._hilo.start()
+
+    def _exportar(self) -> None:
+        firma, datos, _ = datos_normalizados(PACKS_HOJAS)
+        try:
+            with indices.fijar(PACKS_HOJAS, firma, datos):
+                exportar_packs_semanales(datos)
+        except OSError:
+            return          # sin disco escribible la grilla se sigue armando en vivo
+        with self._lock:
+            self.exportada = firma
+
+
+@st.cache_resource
+def exportador_packs() -> ExportadorPacks:
+    return ExportadorPacks()
+
+
+def leer_pack(semana_num) -> dict | None:
+    """
+    Bundle JSON de una semana desde disco, si los packs están exportados
+    para la versión actual de los datos. Si no, pide la exportación en
+    segundo plano y retorna None: esta vez la grilla se arma en vivo.
+    """
+    exportador = exportador_packs()
+    firma = almacen_hojas().firma(PACKS_HOJAS)
+    if exportador.exportada != firma:
+        exportador.pedir(firma)
+        return None
+    try:
+        return json.loads((PACKS_DIR / f"semana_{int(semana_num)}.json").read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+# ─────────────────────────────────────────────
+#  GRILLA DE CLIPS (paginada, un solo reproductor)
+# ─────────────────────────────────────────────
+
+# youtu.be/ID, watch?v=ID, embed/ID, shorts/ID, live/ID
+_RE_YOUTUBE = re.compile(r"(?:youtu\.be/|[?&]v=|/embed/|/shorts/|/live/)([A-Za-z0-9_-]{11})")
+
+ESTILO_MINIATURA = (
+    "position:relative;aspect-ratio:16/9;border-radius:8px;overflow:hidden;"
+    f"background:{COLOR_CARD};display:flex;align-items:center;justify-content:center;"
+)
+ESTILO_PLAY = (
+    "position:absolute;font-size:2.2rem;color:#fff;"
+    "text-shadow:0 2px 8px rgba(0,0,0,.7);pointer-events:none;"
+)
+
+
+def youtube_id(link) -> str | None:
+    """Id de 11 caracteres de un link de YouTube (None si no lo es)."""
+    m = _RE_YOUTUBE.search(str(link))
+    return m.group(1) if m else None
+
+
+def html_miniatura(link: str) -> str:
+    """Miniatura liviana del clip (imagen de YouTube con carga diferida) en lugar del iframe."""
+    vid = youtube_id(link)
+    if vid is None:
+        return f"<div style='{ESTILO_MINIATURA}'><span style='font-size:2.2rem;'>🎬</span></div>"
+    return (
+        f"<div style='{ESTILO_MINIATURA}'>"
+        f"<img src='https://i.ytimg.com/vi/{vid}/mqdefault.jpg' loading='lazy' "
+        f"style='width:100%;height:100%;object-fit:cover;'>"
+        f"<span style='{ESTILO_PLAY}'>▶</span></div>"
+    )
+
+
+def _cambiar_pagina(clave: str, pagina: int) -> None:
+    st.session_state[f"{clave}_pagina"] = pagina
+    st.session_state[f"{clave}_abierto"] = None
+
+
+def _abrir_clip(clave: str, posicion) -> None:
+    """Callback: monta el reproductor de un clip (None lo cierra)."""
+    st.session_state[f"{clave}_abierto"] = posicion
+
+
+def grilla_clips(clips: pd.DataFrame, clave: str, encabezado, etiquetas: bool = False) -> None:
+    """
+    Clips de a páginas, en dos columnas. Cada clip se muestra como
+    miniatura y solo el que el usuario abre monta st.video (un iframe de
+    YouTube por vez). Si cambian los clips filtrados se vuelve a la
+    primera página; los filtros quedan como estaban al pasar de página.
+    Parametros:
+        clips:      filas de Videoanalisis ya filtradas, en el orden a mostrar
+        clave:      prefijo único de los widgets y del estado de la grilla
+        encabezado: función fila → markdown del título del clip
+        etiquetas:  muestra los jugadores etiquetados de cada clip
+    """
+    links = clips["link_youtube"].astype(str).str.strip().tolist() if "link_youtube" in clips.columns \
+        else [""] * len(clips)
+    # Si cambió el conjunto de clips (otro filtro), volver a la página 1
+    firma = hash(tuple(links))
+    if st.session_state.get(f"{clave}_firma") != firma:
+        st.session_state[f"{clave}_firma"] = firma
+        _cambiar_pagina(clave, 0)
+
+    por_pagina = st.selectbox(
+        "Clips por página",
+        CLIPS_POR_PAGINA_OPCIONES,
+        index=CLIPS_POR_PAGINA_OPCIONES.index(CLIPS_POR_PAGINA),
+        key=f"{clave}_por_pagina",
+        on_change=_cambiar_pagina,
+        args=(clave, 0),
+    )
+    paginas = max(1, -(-len(clips) // por_pagina))
+    pagina = min(st.session_state.get(f"{clave}_pagina", 0), paginas - 1)
+    abierto = st.session_state.get(f"{clave}_abierto")
+
+    inicio = pagina * por_pagina
+    pagina_clips = clips.iloc[inicio : inicio + por_pagina]
+    for fila_start in range(0, len(pagina_clips), 2):
+        fila = pagina_clips.iloc[fila_start : fila_start + 2]
+        cols_vid = st.columns(2, gap="large")
+
+        for offset, (col_v, (_, vid_row)) in enumerate(zip(cols_vid, fila.iterrows())):
+            posicion = inicio + fila_start + offset
+            link = links[posicion]
+            with col_v:
+                st.markdown(encabezado(vid_row))
+
+                tipo = vid_row.get("tipo_analisis", "")
+                if tipo and pd.notna(tipo):
+                    st.caption(f"📌 {tipo}")
+
+                if not _hay_url(link):
+                    st.info("Video no disponible o link roto")
+                elif posicion == abierto:
+                    try:
+                        st.video(link)
+                    except Exception:
+                        st.error("Enlace de video inválido")
+                    st.button("✕ Cerrar", key=f"{clave}_cerrar_{posicion}",
+                              on_click=_abrir_clip, args=(clave, None))
+                else:
+                    st.markdown(html_miniatura(link), unsafe_allow_html=True)
+                    st.button("▶ Ver clip", key=f"{clave}_ver_{posicion}",
+                              on_click=_abrir_clip, args=(clave, posicion))
+
+                desc = vid_row.get("descripcion", "")
+                if desc and pd.notna(desc):
+                    st.markdown(f"*{desc}*")
+
+                jugadores = vid_row.get("jugadores_etiquetados", "")
+                if etiquetas and jugadores and pd.notna(jugadores):
+                    st.markdown(
+                        f"<div style='font-size:0.8rem; background:rgba(56,189,248,0.1); "
+                        f"padding:4px 8px; border-radius:4px; display:inline-block; margin-top:4px;'>"
+                        f"👤 <b>{jugadores}</b></div>",
+                        unsafe_allow_html=True
+                    )
+
+                st.markdown("<br>", unsafe_allow_html=True)
+
+    if paginas > 1:
+        col_ant, col_info, col_sig = st.columns([1, 2, 1])
+        col_ant.button("◀ Anterior", key=f"{clave}_anterior", disabled=pagina == 0,
+                       on_click=_cambiar_pagina, args=(clave, pagina - 1))
+        col_info.caption(f"Página {pagina + 1} de {paginas} · {len(clips)} clips")
+        col_sig.button("Siguiente ▶", key=f"{clave}_siguiente", disabled=pagina >= paginas - 1,
+                       on_click=_cambiar_pagina, args=(clave, pagina + 1))
+
+
+# ══════════════════════════════════════════════
+#  🏠  INICIO
+# ══════════════════════════════════════════════
+
+@seccion_fragmento(
+    "Sesiones", "Entrenamientos_Dia", "Tareas", "Partidos",
+    usa_indices=("dias_por_sesion", "tareas_por_dia"),
+)
+def seccion_inicio(sesiones, entrenamientos, tareas, partidos):
+    st.title("⚽ Excursionistas — Reserva 2026")
+    st.markdown("---")
+
+    col1, col2 = st.columns(2, gap="large")
+
+    # — Orden del día —
+    hoy = pd.Timestamp(date.today())
+    DIAS_ES = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+    dia_hoy_nombre = DIAS_ES[hoy.weekday()].title()
+
+    with col1:
+        st.subheader("📋 Orden del día")
+        # Buscar sesión de la semana actual
+        encontrado = False
+        if not sesiones.empty and not entrenamientos.empty and not tareas.empty:
+            df_ses_h = sesiones.dropna(subset=["fecha_inicio_semana"])
+            # Sesión más reciente cuya fecha_inicio <= hoy
+            ses_act = df_ses_h[df_ses_h["fecha_inicio_semana"] <= hoy].sort_values(
+                "fecha_inicio_semana", ascending=False
+            )
+            if not ses_act.empty:
+                id_ses_hoy = ses_act.iloc[0]["id_sesion"]
+                dias_ses_hoy = indices["dias_por_sesion"][id_ses_hoy]
+                ids_dia_hoy = dias_ses_hoy["id_entreno_dia"].tolist() if not dias_ses_hoy.empty else []
+                t_hoy = indices["tareas_por_dia"].varios(ids_dia_hoy)
+                if not t_hoy.empty and "dia_semana" in t_hoy.columns:
+                    # Ya vienen ordenadas por "orden"
+                    t_hoy = t_hoy[t_hoy["dia_semana"] == dia_hoy_nombre]
+                    if not t_hoy.empty:
+                        encontrado = True
+                        cards = "".join(html_tarjetas_tareas(t_hoy, con_video=False))
+                        st.markdown(
+                            f"<div style='background:{COLOR_CARD};border-radius:10px;padding:16px;'>"
+                            f"<p style='color:#8d9db6;font-size:.85rem;margin:0 0 10px;'>📆 {dia_hoy_nombre}</p>"
+                            f"{cards}</div>",
+                            unsafe_allow_html=True,
+                        )
+        if not encontrado:
+            st.info(f"No hay entrenamiento registrado para hoy ({dia_hoy_nombre}).")
+
+    # — Próximo partido —
+    with col2:
+        st.subheader("🏟️ Próximo partido")
+        if partidos.empty:
+            st.info("Sin partidos registrados.")
+        else:
+            hoy = pd.Timestamp(date.today())
+            proximos = partidos[partidos["fecha"] >= hoy].sort_values("fecha")
+            if proximos.empty:
+                st.info("No hay partidos próximos cargados.")
+            else:
+                prox = proximos.iloc[0]
+                dias_restantes = (prox["fecha"] - hoy).days
+                nombre_dia = DIAS_ES[prox["fecha"].weekday()]
+                horario = str(prox.get("horario", "")).strip()
+                horario_html = f"&nbsp;⏰ {horario}" if horario and horario.lower() not in ("nan", "none", "") else ""
+                st.markdown(f"""
+                <div style='background:{COLOR_CARD};border-radius:10px;padding:20px;'>
+                    <p style='color:#8d9db6;font-size:.85rem;margin:0'>Rival</p>
+                    <p style='font-size:1.8rem;font-weight:800;color:{COLOR_VERDE};margin:0'>
+                        {prox.get('rival','—')}
+                    </p>
+                    <p style='color:{COLOR_TEXTO};margin:4px 0 0;'>
+                        📅 <b>{nombre_dia}</b>{horario_html}
+                        &nbsp;|&nbsp; {prox.get('torneo','—')}
+                    </p>
+                    <p style='color:{COLOR_NARANJA};font-weight:600;margin-top:6px'>
+                        ⏳ {dias_restantes} día{'s' if dias_restantes != 1 else ''}
+                    </p>
+                </div>
+                """, unsafe_allow_html=True)
+
+
+# ══════════════════════════════════════════════
+#  📅  ENTRENAMIENTOS
+# ══════════════════════════════════════════════
+
+@seccion_fragmento(
+    "Sesiones", "Tareas", "Asistencia_Entrenamiento", "Plantel",
+    usa_indices=("dias_por_sesion", "tareas_por_dia", "asistencia_por_dia"),
+)
+def seccion_entrenamientos(sesiones, tareas, asistencia, plantel):
+    st.title("📅 Entrenamientos")
+    st.markdown("---")
+
+    if sesiones.empty or tareas.empty:
+        st.warning("No hay datos de sesiones o tareas disponibles.")
+    else:
+        # ── Preparar fechas ─────────────────────────────────────────
+        hoy = pd.Timestamp(date.today())
+        df_ses_tmp = sesiones.dropna(subset=["fecha_inicio_semana"])
+        df_ses_tmp = df_ses_tmp.assign(
+            mes=df_ses_tmp["fecha_inicio_semana"].dt.month,
+            anio=df_ses_tmp["fecha_inicio_semana"].dt.year,
+        )
+
+        MESES_ES = {
+            1: "Enero", 2: "Febrero", 3: "Marzo",    4: "Abril",
+            5: "Mayo",  6: "Junio",   7: "Julio",    8: "Agosto",
+            9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre",
+        }
+
+        # Meses disponibles ordenados cronológicamente
+        meses_disp  = sorted(df_ses_tmp[["anio", "mes"]].drop_duplicates().itertuples(index=False))
+        meses_labels = [
+            MESES_ES[m.mes] + (f" {m.anio}" if m.anio != hoy.year else "")
+            for m in meses_disp
+        ]
+        meses_keys = [(m.anio, m.mes) for m in meses_disp]
+
+        # Pre-seleccionar mes actual (o el más reciente pasado)
+        mes_actual_key = (hoy.year, hoy.month)
+        if mes_actual_key in meses_keys:
+            idx_mes = meses_keys.index(mes_actual_key)
+        else:
+            pasados_mes = [(i, k) for i, k in enumerate(meses_keys) if k <= mes_actual_key]
+            idx_mes = pasados_mes[-1][0] if pasados_mes else 0
+
+        col_mes, _ = st.columns([2, 3])
+        with col_mes:
+            mes_label_sel = st.selectbox("📆 Mes", options=meses_labels, index=idx_mes)
+        mes_sel_key = meses_keys[meses_labels.index(mes_label_sel)]
+
+        # ── Semanas del mes seleccionado ────────────────────────────
+        ses_mes = df_ses_tmp[
+            (df_ses_tmp["anio"] == mes_sel_key[0]) &
+            (df_ses_tmp["mes"]  == mes_sel_key[1])
+        ]
+        semanas_disp = sorted(ses_mes["semana_num"].dropna().unique().tolist())
+
+        if not semanas_disp:
+            st.info("No hay semanas registradas para ese mes.")
+        else:
+            # Auto-seleccionar semana actual dentro del mes
+            pasadas_mes = ses_mes[ses_mes["fecha_inicio_semana"] <= hoy].sort_values(
+                "fecha_inicio_semana", ascending=False
+            )
+            semana_actual = pasadas_mes.iloc[0]["semana_num"] if not pasadas_mes.empty else semanas_disp[0]
+            idx_sem = semanas_disp.index(semana_actual) if semana_actual in semanas_disp else 0
+
+            semana_sel = st.selectbox(
+                "Seleccioná la semana",
+                options=semanas_disp,
+                index=idx_sem,
+                format_func=lambda x: f"Semana {int(x)}",
+            )
+
+            # ── Filtrar sesión ──────────────────────────────────────
+            sesion_sem = sesiones[sesiones["semana_num"] == semana_sel]
+            if sesion_sem.empty:
+                st.info("Sin sesión para esa semana.")
+            else:
+                id_sesion_sel = sesion_sem.iloc[0]["id_sesion"]
+                tipo_sem      = sesion_sem.iloc[0].get("tipo_semana", "")
+                fecha_ini     = sesion_sem.iloc[0]["fecha_inicio_semana"]
+
+                cols_info = st.columns(3)
+                cols_info[0].metric("Semana", int(semana_sel))
+                cols_info[1].metric("Tipo", tipo_sem if tipo_sem else "—")
+                cols_info[2].metric(
+                    "Inicio",
+                    fecha_ini.strftime("%d/%m/%Y") if pd.notna(fecha_ini) else "—",
+                )
+                st.markdown("---")
+
+                # ── Días de entrenamiento ───────────────────────────
+                dias_semana = indices["dias_por_sesion"][id_sesion_sel]
+
+                if dias_semana.empty:
+                    st.info("No hay días de entrenamiento registrados para esta semana.")
+                else:
+                    ids_dia = dias_semana["id_entreno_dia"].tolist()
+
+                    if "id_entreno_dia" in tareas.columns:
+                        tareas_sem = indices["tareas_por_dia"].varios(ids_dia)
+                    else:
+                        tareas_sem = (
+                            tareas[tareas["id_sesion"] == id_sesion_sel].copy()
+                            if "id_sesion" in tareas.columns else pd.DataFrame()
+                        )
+
+                    if tareas_sem.empty:
+                        st.info("No hay tareas cargadas para esta semana.")
+                    else:
+                        tareas_sem = tareas_sem.dropna(subset=["dia_semana"])
+
+                        # Pack ya exportado de la semana: se lee de disco en vez de rearmar el HTML
+                        pack = leer_pack(semana_sel)
+                        if pack is not None:
+                            columnas_html = pack["columnas"]
+                        else:
+                            # Asistencia por día solo si hay plantel para ponerle nombre
+                            ast_por_dia = (
+                                indices["asistencia_por_dia"]
+                                if not asistencia.empty and not plantel.empty else None
+                            )
+                            columnas_html = html_columnas_semana(dias_semana, tareas_sem, ast_por_dia)
+
+                        ruta_pack = PACKS_DIR / f"semana_{int(semana_sel)}.html"
+                        if pack is not None and ruta_pack.exists():
+                            st.download_button(
+                                "📦 Descargar semana para ver sin conexión",
+                                data=ruta_pack.read_bytes(),
+                                file_name=f"semana_{int(semana_sel)}.html",
+                                mime="text/html",
+                            )
+                            st.caption(f"Datos en JSON: /app/static/packs/semana_{int(semana_sel)}.json")
+
+                        st.markdown("<div class='semana-scroll-wrapper'>", unsafe_allow_html=True)
+                        cols_dias = st.columns(7, gap="medium")
+                        # Un solo elemento por columna (no uno por tarjeta)
+                        for col_widget, html_col in zip(cols_dias, columnas_html):
+                            col_widget.markdown(html_col, unsafe_allow_html=True)
+                        st.markdown("</div>", unsafe_allow_html=True)
+
+
+# ══════════════════════════════════════════════
+#  👥  PLANTEL
+# ══════════════════════════════════════════════
+
+@seccion_fragmento(
+    "Plantel", "Asistencia_Entrenamiento", "PostPartido", "Partidos", "Videoanalisis",
+    usa_indices=("resumen_jugadores",),
+)
+def seccion_plantel(plantel, asistencia, postpartido, partidos, videoanalisis):
+
+    # ── Sub-vista: perfil individual ──────────────────────────────
+    if st.session_state.jugador_perfil is not None:
+        jug_nombre = st.session_state.jugador_perfil
+        # Callback: el cambio de vista se resuelve en el mismo rerun del fragmento
+        st.button("← Volver al plantel", on_click=abrir_perfil, args=(None,))
+
+        if not plantel.empty and jug_nombre in plantel["nombre"].values:
+            jug    = plantel[plantel["nombre"] == jug_nombre].iloc[0]
+            id_jug = jug["id_jugador"]
+
+            st.title(f"👤 {jug['nombre']}")
+            st.markdown("---")
+
+            col_foto, col_datos = st.columns([1, 3], gap="large")
+
+            with col_foto:
+                foto_url = str(jug.get("foto_url", "")).strip()
+                foto = cache_fotos().foto(foto_url, "perfil") if _hay_url(foto_url) else None
+                if _hay_url(foto_url):
+                    st.image(foto if foto is not None else foto_url, width=200)
+                else:
+                    st.markdown(
+                        f"<div style='width:180px;height:180px;background:{COLOR_CARD};"
+                        f"border-radius:16px;display:flex;align-items:center;"
+                        f"justify-content:center;font-size:5rem;'>👤</div>",
+                        unsafe_allow_html=True,
+                    )
+
+            with col_datos:
+                col_a, col_b = st.columns(2)
+                col_a.markdown(f"**Posición:** {jug.get('posicion','—')}")
+                col_b.markdown(f"**Categoría:** {get_categoria(jug)}")
+
+                # Resumen de temporada precalculado (no se recorre asistencia ni postpartido).
+                # Un jugador recién agregado todavía puede no estar: va en cero.
+                resumen = indices["resumen_jugadores"]
+                if id_jug in resumen.index:
+                    agg_jug = resumen.loc[id_jug]
+                else:
+                    agg_jug = pd.Series({**dict.fromkeys(ESTADOS_ASISTENCIA, 0), "partidos": 0, "clips": []})
+
+                # Conteo de asistencia
+                if not asistencia.empty:
+                    presente     = int(agg_jug["Presente"])
+                    ausente      = int(agg_jug["Ausente"])
+                    diferenciado = int(agg_jug["Diferenciado"])
+                    total        = presente + ausente + diferenciado
+
+                    st.markdown("#### 📊 Asistencia a entrenamientos")
+                    st.markdown(
+                        f"<span class='metric-pill pill-verde'>✅ Presente: {presente}</span>"
+                        f"<span class='metric-pill pill-rojo'>❌ Ausente: {ausente}</span>"
+                        f"<span class='metric-pill pill-amarillo'>⚠️ Diferenciado: {diferenciado}</span>",
+                        unsafe_allow_html=True,
+                    )
+                    if total > 0:
+                        fig_pie = px.pie(
+                            values=[presente, ausente, diferenciado],
+                            names=["Presente", "Ausente", "Diferenciado"],
+                            color_discrete_sequence=[COLOR_VERDE, "#ff4b4b", "#ffd600"],
+                            hole=0.45,
+                        )
+                        fig_pie.update_layout(
+                            margin=dict(t=10, b=10, l=10, r=10),
+                            paper_bgcolor="rgba(0,0,0,0)",
+                            plot_bgcolor="rgba(0,0,0,0)",
+                            legend=dict(font=dict(color="#e8eaed")),
+                        )
+                        st.plotly_chart(fig_pie, use_container_width=True)
+                else:
+                    st.info("Sin datos de asistencia.")
+
+                # Estadísticas de partidos
+                st.markdown("#### ⚽ Estadísticas de partidos")
+                if not postpartido.empty:
+                    if agg_jug["partidos"] > 0:
+                        mc1, mc2, mc3, mc4 = st.columns(4)
+                        mc1.metric("Partidos",    int(agg_jug["partidos"]))
+                        mc2.metric("Minutos",     int(agg_jug["minutos"])     if "minutos" in agg_jug.index else "—")
+                        mc3.metric("Goles",       int(agg_jug["goles"])       if "goles" in agg_jug.index else "—")
+                        mc4.metric("Asistencias", int(agg_jug["asistencias"]) if "asistencias" in agg_jug.index else "—")
+                    else:
+                        st.info("Sin estadísticas de partidos.")
+                else:
+                    st.info("Sin datos de postpartido.")
+
+                with st.expander("📈 Más estadísticas (próximamente)"):
+                    st.info("Aquí se agregarán métricas de rendimiento físico, posesión, pressing, etc.")
+                    
+                # ── Videos del Jugador (Videoanálisis) ──
+                if not videoanalisis.empty and "jugadores_etiquetados" in videoanalisis.columns:
+                    # Clips donde está etiquetado (precalculado en el resumen)
+                    vid_jug = videoanalisis[videoanalisis.index.isin(agg_jug["clips"])]
+                    
+                    if not vid_jug.empty:
+                        st.markdown("---")
+                        st.markdown("#### 📹  Videoanálisis personal")
+                        st.caption(f"Clips tácticos y resúmenes vinculados a {jug['nombre']}")
+                        
+                        # Combinar con Partidos para obtener información de fecha y rival (opcional, solo para mostrar)
+                        if not partidos.empty and "id_partido" in vid_jug.columns:
+                            vid_jug = vid_jug.merge(
+                                partidos[["id_partido", "rival", "fecha"]],
+                                on="id_partido",
+                                how="left"
+                            )
+
+                        # Crear opciones de filtro de partido
+                        def get_contexto(row):
+                            rival_str = row.get("rival", "")
+                            fecha_part = row.get("fecha", pd.NaT)
+                            if pd.notna(rival_str) and rival_str != "":
+                                if pd.notna(fecha_part):
+                                    return f"vs {rival_str} ({fecha_part.strftime('%d/%m')})"
+                                return f"vs {rival_str}"
+                            return "Sin asignar a partido"
+
+                        vid_jug["contexto_partido"] = vid_jug.apply(get_contexto, axis=1)
+                        partidos_disponibles = sorted(vid_jug["contexto_partido"].unique().tolist())
+                        
+                        if partidos_disponibles:
+                            partidos_con_todos = ["Todos los partidos"] + partidos_disponibles
+                            partido_filtro = st.selectbox("Filtrar clips por:", partidos_con_todos, key="filtro_vid_jugador")
+                            
+                            if partido_filtro != "Todos los partidos":
+                                vid_jug = vid_jug[vid_jug["contexto_partido"] == partido_filtro]
+                                
+                        st.markdown("<br>", unsafe_allow_html=True)
+                        
+                        if vid_jug.empty:
+                            st.info("No hay videos para este filtro.")
+                        else:
+                            grilla_clips(
+                                vid_jug,
+                                clave="clips_jugador",
+                                encabezado=lambda r: f"**{r.get('titulo', 'Sin título')}** | {r.get('contexto_partido', 'Video')}",
+                            )
+
+    # ── Vista principal: tarjetas por posición ────────────────────
+    else:
+        st.title("👥 Plantel")
+        st.markdown("---")
+
+        if plantel.empty:
+            st.warning("No hay datos de plantel disponibles.")
+        else:
+            # Agrupar por posición (orden POSICIONES_ORDEN + el resto)
+            posiciones_en_plantel = plantel["posicion"].dropna().unique().tolist()
+            orden = [p for p in POSICIONES_ORDEN if p in posiciones_en_plantel]
+            orden += [p for p in posiciones_en_plantel if p not in POSICIONES_ORDEN]
+
+            CARDS_POR_FILA = 5
+
+            with st.expander("📊 Resumen de temporada del plantel"):
+                resumen = indices["resumen_jugadores"]
+                if resumen.empty:
+                    st.info("Sin datos para el resumen.")
+                else:
+                    tabla = resumen.drop(columns=["clips"]).assign(videos=resumen["clips"].str.len())
+                    tabla = tabla.rename(columns={
+                        "Presente": "✅ Presente",
+                        "Ausente": "❌ Ausente",
+                        "Diferenciado": "⚠️ Diferenciado",
+                    })
+                    st.dataframe(tabla, use_container_width=True, hide_index=True)
+
+            for pos in orden:
+                jugadores_pos = plantel[plantel["posicion"] == pos].reset_index(drop=True)
+                emoji_pos  = POS_EMOJI.get(pos, "👤")
+                titulo_pos = POS_PLURAL.get(pos, f"{pos}s")
+                st.markdown(f"### {emoji_pos} {titulo_pos}")
+                # Miniaturas de todo el grupo de una vez (las faltantes se bajan en paralelo)
+                fotos = cache_fotos().lote(jugadores_pos.get("foto_url", pd.Series(dtype=object)), "mini")
+
+                for fila_start in range(0, len(jugadores_pos), CARDS_POR_FILA):
+                    fila = jugadores_pos.iloc[fila_start : fila_start + CARDS_POR_FILA]
+                    cols_cards = st.columns(len(fila), gap="small")
+                    for col_c, (_, jug_row) in zip(cols_cards, fila.iterrows()):
+                        with col_c:
+                            foto_url  = str(jug_row.get("foto_url", "")).strip()
+                            categoria = get_categoria(jug_row)
+                            nombre    = jug_row.get("nombre", "")
+
+                            # Foto (miniatura local o, si no bajó, la URL) o avatar
+                            if _hay_url(foto_url):
+                                st.image(fotos.get(foto_url, foto_url), use_column_width=True)
+                            else:
+                                st.markdown(
+                                    "<div style='height:120px;background:#1c2333;"
+                                    "border-radius:10px;display:flex;align-items:center;"
+                                    "justify-content:center;font-size:3rem;'>👤</div>",
+                                    unsafe_allow_html=True,
+                                )
+
+                            st.markdown(
+                                f"<div style='text-align:center;padding:4px 0;'>"
+                                f"<div style='font-weight:700;color:#e8eaed;font-size:.9rem;'>{nombre}</div>"
+                                f"<div style='color:#8d9db6;font-size:.78rem;'>{categoria}</div>"
+                                f"</div>",
+                                unsafe_allow_html=True,
+                            )
+                            # Botón para ingresar al perfil
+                            st.button(
+                                "Ver perfil",
+                                key=f"btn_{jug_row['id_jugador']}",
+                                use_container_width=True,
+                                on_click=abrir_perfil,
+                                args=(nombre,),
+                            )
+
+                st.markdown("---")
+
+
+# ══════════════════════════════════════════════
+#  🟡  ASISTENCIA
+# ══════════════════════════════════════════════
+
+# La asistencia de una semana se pide como porción (consultas_hojas): la
+# hoja completa solo se baja para la vista por rango de fechas.
+@seccion_fragmento(
+    "Sesiones", "Plantel",
+    usa_indices=("dias_por_sesion",),
+)
+def seccion_asistencia(sesiones, plantel):
+    st.title("🟡 Asistencia a Entrenamientos")
+    vista = st.radio("Vista", ["📆 Semana", "📈 Rango de fechas"], horizontal=True, label_visibility="collapsed")
+    st.markdown("---")
+
+    if sesiones.empty:
+        st.warning("No hay datos de sesiones o asistencia disponibles.")
+    elif vista == "📈 Rango de fechas":
+        vista_asistencia_rango(plantel)
+    else:
+        # ── Selector de semana ──────────────────────────────────────
+        df_ses = sesiones.copy()
+        df_ses["label"] = df_ses.apply(
+            lambda r: f"Semana {int(r['semana_num'])}  —  "
+                      f"{r['fecha_inicio_semana'].strftime('%d/%m/%Y') if pd.notna(r['fecha_inicio_semana']) else ''}",
+            axis=1,
+        )
+        df_ses_sorted = df_ses.sort_values("fecha_inicio_semana", ascending=False)
+
+        semana_label = st.selectbox(
+            "Seleccioná la semana",
+            options=df_ses_sorted["label"].tolist(),
+        )
+        id_sesion_sel = df_ses_sorted.loc[
+            df_ses_sorted["label"] == semana_label, "id_sesion"
+        ].values[0]
+
+        # ── Resolver id_entreno_dia de esa semana ───────────────────
+        dias_sel = indices["dias_por_sesion"][id_sesion_sel]
+        ids_dia_semana = dias_sel["id_entreno_dia"].tolist() if not dias_sel.empty else []
+
+        # ── Asistencia de esa semana (solo esas filas) ──────────────
+        consultas = consultas_hojas()
+        columnas_ast = consultas.columnas("Asistencia_Entrenamiento")
+        if "id_entreno_dia" in columnas_ast and ids_dia_semana:
+            ast_fil = consultas.porcion(
+                ConsultaGviz("Asistencia_Entrenamiento").en("id_entreno_dia", ids_dia_semana)
+            )
+        elif "id_sesion" in columnas_ast:
+            # fallback: la tabla aún tiene id_sesion directamente
+            ast_fil = consultas.porcion(
+                ConsultaGviz("Asistencia_Entrenamiento").donde("id_sesion", id_sesion_sel)
+            )
+        else:
+            ast_fil = pd.DataFrame()
+
+        if ast_fil.empty:
+            st.info("Sin datos de asistencia para este día.")
+        else:
+            # Join con plantel para mostrar nombres
+            if not plantel.empty and "nombre" not in ast_fil.columns:
+                ast_fil = ast_fil.merge(
+                    plantel[["id_jugador", "nombre", "posicion"]],
+                    on="id_jugador",
+                    how="left",
+                )
+
+            # Rellenar nulos para armar correctamente el resumen
+            if "nombre" in ast_fil.columns:
+                ast_fil["nombre"] = ast_fil["nombre"].fillna("Desconocido")
+            if "posicion" in ast_fil.columns:
+                ast_fil["posicion"] = rellenar_nulos(ast_fil["posicion"], "—")
+            if "estado" in ast_fil.columns:
+                ast_fil["estado"] = rellenar_nulos(ast_fil["estado"], "Sin registro")
+
+            # Agrupar por jugador
+            if 'nombre' in ast_fil.columns:
+                df_resumen = ast_fil.groupby(['nombre', 'posicion', 'estado']).size().unstack(fill_value=0).reset_index()
+                df_resumen.columns.name = None
+                
+                for est in ["Presente", "Ausente", "Diferenciado"]:
+                    if est not in df_resumen.columns:
+                        df_resumen[est] = 0
+                        
+                df_resumen["Sesiones"] = df_resumen["Presente"] + df_resumen["Ausente"] + df_resumen["Diferenciado"]
+                total_jugadores = len(df_resumen)
+                
+                # Métricas rápidas (contar si el jugador tuvo AL MENOS UN ausente/diferenciado en la semana)
+                ausente = int((df_resumen["Ausente"] > 0).sum())
+                diferenciado = int((df_resumen["Diferenciado"] > 0).sum())
+                # Presente es el resto o si tiene al menos un presente
+                presente = int((df_resumen["Presente"] > 0).sum())
+            else:
+                df_resumen = pd.DataFrame()
+                total_jugadores = ast_fil["id_jugador"].nunique() if "id_jugador" in ast_fil.columns else len(ast_fil)
+                presente     = int((ast_fil["estado"] == "Presente").sum())
+                ausente      = int((ast_fil["estado"] == "Ausente").sum())
+                diferenciado = int((ast_fil["estado"] == "Diferenciado").sum())
+
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Jugadores", total_jugadores)
+            c2.metric("✅ Presentes",     presente)
+            c3.metric("❌ Ausentes",      ausente)
+            c4.metric("⚠️ Diferenciados", diferenciado)
+
+            st.markdown("---")
+
+            col_tabla, col_grafico = st.columns([3, 2], gap="large")
+
+            with col_tabla:
+                st.subheader("📋 Detalle por Jugador")
+                if not df_resumen.empty:
+                    # Renombrar columnas para mejor visualización
+                    df_resumen = df_resumen.rename(columns={
+                        "Presente": "✅ Presente",
+                        "Ausente": "❌ Ausente",
+                        "Diferenciado": "⚠️ Diferenciado"
+                    })
+                    # Ordenar prioritariamente por presencias y luego nombre
+                    df_resumen = df_resumen.sort_values(by=["✅ Presente", "nombre"], ascending=[False, True])
+                    
+                    cols_vis = ["nombre", "posicion", "✅ Presente", "❌ Ausente", "⚠️ Diferenciado", "Sesiones"]
+                    st.dataframe(df_resumen[cols_vis], use_container_width=True, hide_index=True)
+                else:
+                    cols_vis = [c for c in ["nombre", "posicion", "estado"] if c in ast_fil.columns]
+                    st.dataframe(ast_fil[cols_vis], use_container_width=True, hide_index=True)
+
+            with col_grafico:
+                st.subheader("📊 Distribución")
+                fig_bar = px.bar(
+                    x=["Presente", "Ausente", "Diferenciado"],
+                    y=[presente, ausente, diferenciado],
+                    color=["Presente", "Ausente", "Diferenciado"],
+                    color_discrete_map={
+                        "Presente": COLOR_VERDE,
+                        "Ausente": "#ff4b4b",
+                        "Diferenciado": "#ffd600",
+                    },
+                    labels={"x": "Estado", "y": "Jugadores"},
+                    text_auto=True,
+                )
+                fig_bar.update_layout(
+                    showlegend=False,
+                    paper_bgcolor="rgba(0,0,0,0)",
+                    plot_bgcolor="rgba(0,0,0,0)",
+                    font=dict(color="#e8eaed"),
+                    margin=dict(t=10, b=10),
+                )
+                fig_bar.update_xaxes(showgrid=False)
+                fig_bar.update_yaxes(gridcolor="rgba(255,255,255,0.07)")
+                st.plotly_chart(fig_bar, use_container_width=True)
+
+                fig_pie = px.pie(
+                    values=[presente, ausente, diferenciado],
+                    names=["Presente", "Ausente", "Diferenciado"],
+                    color_discrete_sequence=[COLOR_VERDE, "#ff4b4b", "#ffd600"],
+                    hole=0.4,
+                )
+                fig_pie.update_layout(
+                    paper_bgcolor="rgba(0,0,0,0)",
+                    font=dict(color="#e8eaed"),
+                    margin=dict(t=10, b=10),
+                    legend=dict(font=dict(color="#e8eaed")),
+                )
+                st.plotly_chart(fig_pie, use_container_width=True)
+
+
+def vista_asistencia_rango(plantel: pd.DataFrame) -> None:
+    """
+    Asistencia de todo el plantel en un rango de fechas: disponibilidad de
+    los últimos 7 y 28 días, rachas de ausencias, tendencia de
+    diferenciados y heatmap semanal por jugador.
+    """
+    # La sección no carga la asistencia entera: se fija una versión para
+    # que la tabla fechada y la clave de la analítica coincidan
+    hojas = INDICES["asistencia_fechada"][0]
+    firma, datos, _ = datos_normalizados(hojas)
+    with indices.fijar(hojas, firma, datos):
+        fechada = indices["asistencia_fechada"]
+    if fechada.empty:
+        st.info("No se pudo fechar la asistencia (faltan fechas en Entrenamientos_Dia o Sesiones).")
+        return
+
+    primera, ultima = fechada["fecha"].min().date(), fechada["fecha"].max().date()
+    rango = st.date_input(
+        "Rango de fechas",
+        value=(max(primera, ultima - pd.Timedelta(weeks=8)), ultima),
+        min_value=primera,
+        max_value=ultima,
+        format="DD/MM/YYYY",
+    )
+    if not isinstance(rango, tuple) or len(rango) != 2:
+        st.info("Elegí la fecha de inicio y la de fin.")
+        return
+    desde, hasta = rango
+
+    analitica = analitica_asistencia(firma, desde, hasta, fechada)
+    resumen, semanal = analitica["resumen"], analitica["semanal"]
+    if resumen.empty:
+        st.info("Sin entrenamientos en ese rango.")
+        return
+
+    # Nombres del plantel (los ids sin jugador quedan con su número)
+    nombres = pd.Series(dtype=object)
+    if {"id_jugador", "nombre"} <= set(plantel.columns):
+        nombres = plantel.drop_duplicates("id_jugador").set_index("id_jugador")["nombre"]
+    etiqueta = resumen.index.map(lambda i: nombres.get(i, f"#{i}"))
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Disponibilidad 7 días",  f"{resumen['disp_7d'].mean():.0f}%" if resumen["disp_7d"].notna().any() else "—")
+    c2.metric("Disponibilidad 28 días", f"{resumen['disp_28d'].mean():.0f}%" if resumen["disp_28d"].notna().any() else "—")
+    c3.metric("❌ Con 2+ ausencias seguidas", int((resumen["racha_actual"] >= 2).sum()))
+    c4.metric(
+        "⚠️ Diferenciados 28 días",
+        int(resumen["dif_28d"].sum()),
+        delta=int(resumen["tendencia_dif"].sum()),
+        delta_color="inverse",
+    )
+
+    st.markdown("---")
+
+    # ── Heatmap semanal ─────────────────────────────────────────
+    st.subheader("🗓️ Presentismo por semana")
+    mapa = semanal.copy()
+    mapa.index = mapa.index.map(lambda i: nombres.get(i, f"#{i}"))
+    mapa.columns = [c.strftime("%d/%m") for c in mapa.columns]
+    mapa = mapa.sort_index()
+    fig_heat = px.imshow(
+        mapa,
+        color_continuous_scale=["#ff4b4b", "#ffd600", COLOR_VERDE],
+        zmin=0,
+        zmax=100,
+        aspect="auto",
+        labels={"x": "Semana", "y": "", "color": "% presente"},
+    )
+    fig_heat.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#e8eaed"),
+        margin=dict(t=10, b=10),
+        height=max(300, 22 * len(mapa)),
+    )
+    st.plotly_chart(fig_heat, use_container_width=True)
+
+    # ── Tabla por jugador ───────────────────────────────────────
+    st.subheader("📋 Detalle por Jugador")
+    tabla = pd.DataFrame({
+        "nombre":            etiqueta,
+        "Sesiones":          resumen["sesiones"].to_numpy(),
+        "% Presente":        resumen["pct_presente"].round(0).to_numpy(),
+        "Disp. 7d %":        resumen["disp_7d"].round(0).to_numpy(),
+        "Disp. 28d %":       resumen["disp_28d"].round(0).to_numpy(),
+        "Racha ausencias":   resumen["racha_actual"].to_numpy(),
+        "Racha máx.":        resumen["racha_max"].to_numpy(),
+        "Dif. 28d":          resumen["dif_28d"].to_numpy(),
+        "Dif. vs 28d prev.": resumen["tendencia_dif"].to_numpy(),
+    }).sort_values(["Disp. 28d %", "nombre"], ascending=[True, True])
+    st.dataframe(tabla, use_container_width=True, hide_index=True)
+
+
+# ══════════════════════════════════════════════
+#  📹  VIDEOANÁLISIS
+# ══════════════════════════════════════════════
+
+# Los clips se piden por partido (consultas_hojas), no la temporada entera
+@seccion_fragmento("Partidos", "Plantel")
+def seccion_videoanalisis(partidos, plantel):
+    st.title("📹 Videoanálisis")
+    st.markdown("---")
+
+    if partidos.empty:
+        st.warning("No hay datos de partidos o videos cargados.")
+    else:
+        df_par = partidos.copy()
+        df_par["label"] = df_par.apply(
+            lambda r: f"{r['fecha'].strftime('%d/%m/%Y') if pd.notna(r['fecha']) else '—'}  vs  "
+                      f"{r.get('rival','?')}  ({r.get('torneo','—')})",
+            axis=1,
+        )
+        df_par_sorted = df_par.sort_values("fecha", ascending=False)
+
+        # ── Selector de Partido ──
+        col_sel_p, _ = st.columns([2, 2])
+        with col_sel_p:
+            partido_label = st.selectbox("Seleccioná el partido a analizar", df_par_sorted["label"].tolist())
+            
+        id_partido_sel = df_par_sorted.loc[
+            df_par_sorted["label"] == partido_label, "id_partido"
+        ].values[0]
+
+        # ── Videos del partido (solo esas filas) ──
+        consulta_videos = ConsultaGviz("Videoanalisis").donde("id_partido", id_partido_sel)
+        vid_fil = consultas_hojas().porcion(consulta_videos)
+
+        if vid_fil.empty:
+            st.info("No hay recortes de video disponibles para este partido.")
+        else:
+            # ── Filtros combinados: Tipo y Jugador ──
+            col_f1, col_f2 = st.columns(2)
+            
+            with col_f1:
+                # ── Filtro por tipo de análisis ──
+                tipos_disponibles = vid_fil["tipo_analisis"].dropna().unique().tolist()
+                tipos_con_todos = ["Todos"] + tipos_disponibles if tipos_disponibles else ["Todos"]
+                tipo_sel = st.selectbox("Categoría de análisis", tipos_con_todos)
+
+            with col_f2:
+                # ── Filtro por Jugador (índice de jugadores_etiquetados) ──
+                etiquetas = etiquetas_de_porcion(consulta_videos, vid_fil, plantel)
+                jug_con_todos = ["Todos"] + etiquetas.claves_en(vid_fil.index)
+
+                jugador_sel = st.selectbox(
+                    "Jugador etiquetado",
+                    jug_con_todos,
+                    format_func=lambda c: c if c == "Todos" else etiquetas.nombres[c],
+                )
+
+            # Aplicar filtros
+            if tipo_sel != "Todos":
+                vid_fil = vid_fil[vid_fil["tipo_analisis"] == tipo_sel]
+                
+            if jugador_sel != "Todos":
+                # Coincidencia exacta contra el índice (no substring: "Juan" ≠ "Juanma")
+                vid_fil = vid_fil[vid_fil.index.isin(etiquetas.clips_por_clave.get(jugador_sel, []))]
+            
+            st.markdown("<br>", unsafe_allow_html=True)
+            
+            # ── Renderizar videos ──
+            if vid_fil.empty:
+                st.warning("No hay videos para la categoría seleccionada.")
+            else:
+                grilla_clips(
+                    vid_fil,
+                    clave="clips_partido",
+                    encabezado=lambda r: f"#### {r.get('titulo', 'Sin título')}",
+                    etiquetas=True,
+                )
+
+
+# ══════════════════════════════════════════════
+#  ⚽  POST-PARTIDO
+# ══════════════════════════════════════════════
+
+# Las estadísticas de un partido se piden como porción (consultas_hojas);
+# la vista de temporada arma el cubo con la hoja completa.
+@seccion_fragmento("Partidos", "Plantel")
+def seccion_post_partido(partidos, plantel):
+    st.title("⚽ Post-Partido")
+    vista = st.radio("Vista", ["📋 Partido", "📈 Temporada"], horizontal=True, label_visibility="collapsed")
+    st.markdown("---")
+
+    if partidos.empty:
+        st.warning("No hay datos de partidos o estadísticas disponibles.")
+    elif vista == "📈 Temporada":
+        vista_temporada(plantel)
+    else:
+        df_par = partidos.copy()
+        df_par["label"] = df_par.apply(
+            lambda r: f"{r['fecha'].strftime('%d/%m/%Y') if pd.notna(r['fecha']) else '—'}  vs  "
+                      f"{r.get('rival','?')}  ({r.get('torneo','—')})",
+            axis=1,
+        )
+        df_par_sorted = df_par.sort_values("fecha", ascending=False)
+
+        partido_label = st.selectbox("Seleccioná el partido", df_par_sorted["label"].tolist())
+        id_partido_sel = df_par_sorted.loc[
+            df_par_sorted["label"] == partido_label, "id_partido"
+        ].values[0]
+
+        # Estadísticas del partido (solo esas filas), unidas con el plantel
+        pp_fil = con_plantel(
+            consultas_hojas().porcion(ConsultaGviz("PostPartido").donde("id_partido", id_partido_sel)),
+            plantel,
+        )
+
+        if pp_fil.empty:
+            st.info("Sin estadísticas para este partido.")
+        else:
+            pp_fil = pp_fil.sort_values("minutos", ascending=False)
+
+            # — Tabla —
+            st.subheader("📋 Estadísticas del partido")
+            cols_vis = [c for c in ["nombre", "posicion", "minutos", "goles", "asistencias"] if c in pp_fil.columns]
+            st.dataframe(pp_fil[cols_vis], use_container_width=True, hide_index=True)
+
+            st.markdown("---")
+
+            # — Gráficos —
+            st.subheader("📊 Gráficos")
+
+            tab_min, tab_gol, tab_ast = st.tabs(["⏱ Minutos", "⚽ Goles", "🅰️ Asistencias"])
+
+            def bar_chart(df, col_y, title, color):
+                """Helper para gráfico de barras horizontales."""
+                df_plot = df[["nombre", col_y]].sort_values(col_y, ascending=True)
+                fig = px.bar(
+                    df_plot,
+                    x=col_y,
+                    y="nombre",
+                    orientation="h",
+                    title=title,
+                    color_discrete_sequence=[color],
+                    labels={"nombre": "", col_y: ""},
+                    text_auto=True,
+                )
+                fig.update_layout(
+                    paper_bgcolor="rgba(0,0,0,0)",
+                    plot_bgcolor="rgba(0,0,0,0)",
+                    font=dict(color="#e8eaed"),
+                    margin=dict(t=40, b=10, l=10, r=10),
+                    height=max(300, 30 * len(df_plot)),
+                )
+                fig.update_xaxes(showgrid=False)
+                fig.update_yaxes(gridcolor="rgba(255,255,255,0.07)")
+                return fig
+
+            with tab_min:
+                if "minutos" in pp_fil.columns:
+                    st.plotly_chart(
+                        bar_chart(pp_fil, "minutos", "Minutos jugados", COLOR_VERDE),
+                        use_container_width=True,
+                    )
+
+            with tab_gol:
+                if "goles" in pp_fil.columns:
+                    goleadores = pp_fil[pp_fil["goles"] > 0]
+                    if goleadores.empty:
+                        st.info("Sin goles registrados en este partido.")
+                    else:
+                        st.plotly_chart(
+                            bar_chart(goleadores, "goles", "Goles", COLOR_NARANJA),
+                            use_container_width=True,
+                        )
+
+            with tab_ast:
+                if "asistencias" in pp_fil.columns:
+                    asistidores = pp_fil[pp_fil["asistencias"] > 0]
+                    if asistidores.empty:
+                        st.info("Sin asistencias registradas en este partido.")
+                    else:
+                        st.plotly_chart(
+                            bar_chart(asistidores, "asistencias", "Asistencias", "#a78bfa"),
+                            use_container_width=True,
+                        )
+
+            # — Resumen global del partido —
+            st.markdown("---")
+            st.subheader("📈 Resumen global")
+            rc1, rc2, rc3, rc4 = st.columns(4)
+            rc1.metric("Jugadores",   len(pp_fil))
+            rc2.metric("Min. totales", int(pp_fil["minutos"].sum()) if "minutos" in pp_fil.columns else "—")
+            rc3.metric("Goles",        int(pp_fil["goles"].sum())   if "goles"   in pp_fil.columns else "—")
+            rc4.metric("Asistencias",  int(pp_fil["asistencias"].sum()) if "asistencias" in pp_fil.columns else "—")
+
+
+def vista_temporada(plantel: pd.DataFrame) -> None:
+    """Totales de la temporada desde el cubo: por jugador, posición y mes, y rival."""
+    cubo = indices["cubo_partidos"]
+    torneos = sorted(cubo.consulta(("torneo",))["torneo"].dropna().unique())
+    torneo = st.selectbox("Torneo", ["Todos"] + torneos)
+    torneo = None if torneo == "Todos" else torneo
+
+    total = cubo.consulta(torneo=torneo)
+    if total.empty or total["presencias"].iloc[0] == 0:
+        st.info("Sin estadísticas para este torneo.")
+        return
+    total = total.iloc[0]
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Presencias",   int(total["presencias"]))
+    c2.metric("Min. totales", int(total["minutos"]))
+    c3.metric("Goles",        int(total["goles"]))
+    c4.metric("Asistencias",  int(total["asistencias"]))
+
+    st.markdown("---")
+    tab_jug, tab_mes, tab_riv = st.tabs(["👤 Por jugador", "📅 Por posición y mes", "🆚 Por rival"])
+
+    with tab_jug:
+        por_jugador = cubo.consulta(("id_jugador",), torneo=torneo)
+        if {"id_jugador", "nombre"} <= set(plantel.columns):
+            nombres = plantel.drop_duplicates("id_jugador").set_index("id_jugador")["nombre"]
+            por_jugador.insert(0, "nombre", por_jugador["id_jugador"].map(nombres).fillna("Desconocido"))
+        por_jugador = por_jugador.drop(columns="id_jugador").rename(columns={"presencias": "partidos"})
+        st.dataframe(
+            por_jugador.sort_values(["minutos", "goles"], ascending=False),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    with tab_mes:
+        medida = st.radio("Medida", STATS_PARTIDO, horizontal=True, format_func=str.capitalize)
+        por_mes = cubo.consulta(("posicion", "mes"), torneo=torneo).dropna(subset=["mes"])
+        por_mes["posicion"] = rellenar_nulos(por_mes["posicion"], "—")
+        fig = px.bar(
+            por_mes.sort_values("mes"),
+            x="mes",
+            y=medida,
+            color="posicion",
+            category_orders={"posicion": POSICIONES_ORDEN},
+            labels={"mes": "Mes", medida: medida.capitalize(), "posicion": "Posición"},
+        )
+        fig.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#e8eaed"),
+            margin=dict(t=10, b=10),
+        )
+        fig.update_xaxes(showgrid=False, type="category")
+        fig.update_yaxes(gridcolor="rgba(255,255,255,0.07)")
+        st.plotly_chart(fig, use_container_width=True)
+
+    with tab_riv:
+        por_rival = cubo.consulta(("rival",), torneo=torneo)
+        st.dataframe(
+            por_rival.sort_values("goles", ascending=False),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+
+# ─────────────────────────────────────────────
+#  DESPACHO DE SECCIONES
+# ─────────────────────────────────────────────
+
+SECCIONES = {
+    "🏠 Inicio":         seccion_inicio,
+    "📅 Entrenamientos": seccion_entrenamientos,
+    "👥 Plantel":        seccion_plantel,
+    "🟡 Asistencia":     seccion_asistencia,
+    "📹 Videoanálisis":  seccion_videoanalisis,
+    "⚽ Post-Partido":   seccion_post_partido,
+}
+# Lo anterior a la sección (CSS, sidebar) se registra como unidad aparte
+metricas.volcar("inicio + sidebar", (time.perf_counter() - INICIO_SCRIPT) * 1000)
+SECCIONES[seccion]()
+
+# Con la sección ya dibujada, bajar en segundo plano lo que usan las demás
+# (menos las que se consultan por porciones: esas se bajan enteras solo si
+# una sección las necesita completas)
+almacen_hojas().precargar({h for f in SECCIONES.values() for h in f.hojas} - set(HOJAS_POR_PORCION))
+
+registrar_tiempo("script completo", time.perf_counter() - INICIO_SCRIPT)
+# Lo que vino después de la sección (precarga); ms = script entero
+metricas.volcar("script completo", (time.perf_counter() - INICIO_SCRIPT) * 1000)
+if DEBUG:
+    with st.sidebar.expander("⏱ Tiempos de ejecución"):
+        st.dataframe(
+            pd.DataFrame(
+                list(st.session_state.tiempos_ejecucion)[::-1], columns=["unidad", "ms"]
+            ).round(1),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        st.markdown("**Últimas unidades medidas**")
+        registros = list(st.session_state.get("registros_perf", []))[::-1]
+        if registros:
+            st.dataframe(
+                pd.json_normalize(registros).drop(columns="ts").fillna(0),
+                use_container_width=True,
+                hide_index=True,
+            )
+
+        st.markdown("**Descargas por hoja**")
+        meta = almacen_hojas().meta
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "hoja":    h,
+                        "ms":      meta[h].get("ms"),
+                        "bytes":   meta[h].get("bytes"),
+                        "bytes_red": meta[h].get("bytes_red"),
+                        "intentos":  meta[h].get("intentos"),
+                        "edad_s":  round(time.time() - meta[h]["fetched_at"]) if "fetched_at" in meta[h] else None,
+                        "fuente":  almacen_hojas().fuente.nombre,
+                    }
+                    for h in HOJAS if h in meta
+                ]
+            ),
+            use_container_width=True,
+            hide_index=True,
+        )
+        if almacen_hojas().fuente.nombre == FuenteSheets.nombre:
+            st.caption(f"Circuito HTTP: {transporte_sheets().estado()}")
+        vuelos = almacen_hojas().vuelos
+        st.caption(f"Descargas de hojas: {vuelos.propios} hechas, {vuelos.ajenos} esperaron una en curso")
+
+        st.markdown("**Refresco por hoja**")
+        st.dataframe(almacen_hojas().planificador.estado(), use_container_width=True, hide_index=True)
@@ -0,0 +1,99 @@
+"""
+Benchmark de la analítica de asistencia por rango de fechas sobre un
+dataset sintético de varias temporadas: asistencia_fechada (una vez por
+versión de los datos) + analitica_asistencia (una pasada vectorizada por
+rango) contra recorrer el rango semana a semana como la vista semanal de
+Asistencia (máscara por id_sesion + groupby por estado) y las rachas
+jugador por jugador.
+
+    pip install -r requirements-dev.txt
+    python bench/bench_analitica.py
+    python bench/bench_analitica.py --temporadas 3 --jugadores 40 --semanas-rango 8 52
+
+Una temporada = 52 semanas de lunes a viernes. "en_cache" es un rerun con
+el mismo rango (cache_resource por firma y rango).
+"""
+import argparse
+
+import pandas as pd
+
+from comun import capa_datos, cronometrar, datos_sinteticos
+
+
+def analitica_por_semana(app, datos: dict, desde, hasta) -> pd.DataFrame:
+    """Conteos por jugador y estado, y racha máxima de ausencias, semana a semana."""
+    ast, dias, sesiones = datos["Asistencia_Entrenamiento"], datos["Entrenamientos_Dia"], datos["Sesiones"]
+    en_rango = sesiones[sesiones["fecha_inicio_semana"].between(pd.Timestamp(desde), pd.Timestamp(hasta))]
+    conteos = []
+    for id_sesion in en_rango["id_sesion"]:
+        ids_dia = dias.loc[dias["id_sesion"] == id_sesion, "id_entreno_dia"]
+        ast_sem = ast[ast["id_entreno_dia"].isin(ids_dia)]
+        conteos.append(ast_sem.groupby(["id_jugador", "estado"], observed=True).size().unstack(fill_value=0))
+    resumen = pd.concat(conteos).groupby(level=0).sum()
+
+    # Rachas: cada jugador recorre sus entrenamientos en orden
+    unida = ast.merge(dias[["id_entreno_dia", "fecha"]], on="id_entreno_dia")
+    unida = unida[unida["fecha"].between(pd.Timestamp(desde), pd.Timestamp(hasta))]
+    rachas = {}
+    for id_jug, filas in unida.sort_values("fecha").groupby("id_jugador"):
+        actual = maxima = 0
+        for estado in filas["estado"]:
+            actual = actual + 1 if estado == "Ausente" else 0
+            maxima = max(maxima, actual)
+        rachas[id_jug] = maxima
+    resumen["racha_max"] = pd.Series(rachas)
+    return resumen
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--temporadas", type=int, default=3)
+    parser.add_argument("--jugadores", type=int, default=40)
+    parser.add_argument("--semanas-rango", type=int, nargs="+", default=[8, 52],
+                        help="largo de los rangos a medir, hasta la última semana (0 = todo)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    app = capa_datos()
+    datos = datos_sinteticos(app, jugadores=args.jugadores, semanas=52 * args.temporadas)
+    print(f"{args.temporadas} temporadas, {args.jugadores} jugadores, "
+          f"{len(datos['Asistencia_Entrenamiento'])} filas de asistencia")
+
+    fechada = {}
+    armar_ms = cronometrar(lambda: fechada.update(df=app.asistencia_fechada(datos)), args.repeticiones)
+    fechada = fechada["df"]
+    print(f"asistencia_fechada: {armar_ms} ms (una vez por versión de los datos)")
+
+    inicios = datos["Sesiones"]["fecha_inicio_semana"]
+    hasta = (inicios.max() + pd.Timedelta(days=6)).date()
+    filas = []
+    for semanas in args.semanas_rango + [0]:
+        desde = (inicios.min() if semanas == 0 else inicios.max() - pd.Timedelta(weeks=semanas - 1)).date()
+        firma = ("bench", semanas)
+
+        def vectorizada():
+            app.analitica_asistencia.clear()
+            return app.analitica_asistencia(firma, desde, hasta, fechada)
+
+        resultado = vectorizada()
+        base = analitica_por_semana(app, datos, desde, hasta)
+        # Mismos números que el recorrido semana a semana
+        assert resultado["resumen"].index.tolist() == base.index.tolist()
+        assert resultado["resumen"]["ausente"].tolist() == base["Ausente"].tolist()
+        assert resultado["resumen"]["racha_max"].tolist() == base["racha_max"].tolist()
+        filas.append({
+            "semanas":        semanas or len(inicios),
+            "por_semana_ms":  cronometrar(lambda: analitica_por_semana(app, datos, desde, hasta),
+                                          args.repeticiones),
+            "vectorizada_ms": cronometrar(vectorizada, args.repeticiones),
+            "en_cache_ms":    cronometrar(lambda: app.analitica_asistencia(firma, desde, hasta, fechada),
+                                          args.repeticiones),
+            "celdas_heatmap": resultado["semanal"].size,
+        })
+    tabla = pd.DataFrame(filas).drop_duplicates("semanas")
+    tabla["x"] = (tabla["por_semana_ms"] / tabla["vectorizada_ms"]).round(1)
+    print(tabla.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark de la carga de las hojas: las ocho en serie (un hilo) contra el
+pool de cargar_hojas, frente a un servidor local que imita gviz (el stub
+de tests/conftest.py) con latencia inyectada por pedido.
+
+    pip install -r requirements-dev.txt
+    python bench/bench_carga.py
+    python bench/bench_carga.py --latencias 0.05 0.2 0.5 --repeticiones 5
+
+Con latencia L por hoja, en serie se paga 8·L; con el pool, 8·L/hilos
+(con tantos hilos como hojas, L: lo que tarda la hoja más lenta).
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "tests"))
+
+from conftest import Gviz, cargar_capa_datos  # noqa: E402
+
+
+def medir(app, hojas: dict, latencia: float, hilos: int, repeticiones: int) -> dict:
+    """
+    Tiempo de bajar todas las hojas con `hilos` descargas simultáneas.
+    Cada repetición usa conexiones nuevas (arranque en frío).
+    Retorna:
+        Fila con la mediana y el máximo en ms, y los pedidos por repetición.
+    """
+    stub = Gviz(hojas, latencia=latencia)
+    url_original = app._sheet_url
+    app._sheet_url = lambda hoja, tq=None: url_original(hoja, tq).replace(
+        f"https://docs.google.com/spreadsheets/d/{app.SHEET_ID}/", stub.base)
+    try:
+        tiempos = []
+        for _ in range(repeticiones):
+            fuente = app.FuenteSheets(app.TransporteHTTP(conexiones=hilos))
+            t0 = time.perf_counter()
+            contenidos, _, errores = app.cargar_hojas(app.HOJAS, fuente=fuente, max_workers=hilos)
+            tiempos.append((time.perf_counter() - t0) * 1000)
+            if errores or len(contenidos) != len(app.HOJAS):
+                raise RuntimeError(f"carga incompleta: {errores}")
+    finally:
+        app._sheet_url = url_original
+        stub.http.shutdown()
+        stub.http.server_close()
+    return {
+        "latencia_ms": round(latencia * 1000),
+        "hilos":       hilos,
+        "mediana_ms":  round(statistics.median(tiempos), 1),
+        "max_ms":      round(max(tiempos), 1),
+        "pedidos":     len(stub.pedidos) // repeticiones,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latencias", type=float, nargs="+", default=[0.0, 0.1, 0.3],
+                        help="latencia por pedido del stub, en segundos")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--datos", default="jugadores=40,semanas=40,clips_por_partido=6",
+                        help="parámetros de la fuente sintética")
+    args = parser.parse_args()
+
+    import logging
+    import pandas as pd
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+        app = cargar_capa_datos(Path(tmp))
+        fuente = app.FuenteSintetica.desde_texto(args.datos)
+        hojas = fuente._generar(**fuente.params)
+        print(f"{len(hojas)} hojas, {sum(map(len, hojas.values())) // 1024} KB ({args.datos})")
+        filas = []
+        for latencia in args.latencias:
+            for hilos in dict.fromkeys([1, app.CARGA_MAX_WORKERS, len(app.HOJAS)]):
+                filas.append(medir(app, hojas, latencia, hilos, args.repeticiones))
+        print(pd.DataFrame(filas).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark del parseo de una hoja grande: _parsear_csv con el esquema de
+ESQUEMAS_CSV (pyarrow, solo las columnas que usa la app, tipos fijos)
+contra el read_csv original (motor C, todas las columnas, tipos inferidos),
+en tiempo y memoria. También mide la relectura como texto cuando un id no
+es numérico.
+
+    pip install -r requirements-dev.txt
+    python bench/bench_csv.py
+    python bench/bench_csv.py --temporadas 1 5 10 --jugadores 40
+
+La hoja es Asistencia_Entrenamiento de la fuente sintética, con una columna
+de observaciones de texto libre (como las que agrega el cuerpo técnico y la
+app no usa). "df_mb" es lo que ocupa el DataFrame resultante; "pico_py_mb",
+el máximo asignado en el heap de Python durante el parseo (tracemalloc no
+ve el pool de memoria de Arrow).
+"""
+import argparse
+import tracemalloc
+
+import pandas as pd
+
+from comun import capa_datos, cronometrar, hojas_crudas
+
+HOJA = "Asistencia_Entrenamiento"
+
+
+def con_observaciones(payload: bytes) -> bytes:
+    """Agrega una columna de texto libre que no está en el esquema."""
+    lineas = payload.rstrip(b"\n").split(b"\n")
+    notas = [b"", b"llego tarde", b"\"molestia, sigue\"", b"kine martes y jueves"]
+    return b"\n".join(
+        [lineas[0] + b",observaciones"]
+        + [linea + b"," + notas[i % len(notas)] for i, linea in enumerate(lineas[1:])]
+    ) + b"\n"
+
+
+def memoria(funcion) -> tuple[float, float]:
+    """(pico del heap de Python durante la llamada, tamaño del resultado) en MB."""
+    tracemalloc.start()
+    try:
+        df = funcion()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return round(pico / 1e6, 1), round(df.memory_usage(deep=True).sum() / 1e6, 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--temporadas", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--jugadores", type=int, default=40)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    app = capa_datos()
+    filas = []
+    for temporadas in args.temporadas:
+        payload = con_observaciones(
+            hojas_crudas(app, jugadores=args.jugadores, semanas=52 * temporadas)[HOJA]
+        )
+        encabezado, registros = app._registros_csv(payload)
+        # Un id no numérico a mitad de la hoja: la tanda se relee como texto
+        registros_invalidos = list(registros)
+        registros_invalidos[len(registros) // 2] = b"J07," + registros[len(registros) // 2].split(b",", 1)[1]
+
+        variantes = {
+            "read_csv":          lambda: app._parsear_csv(encabezado, registros),
+            "esquema":           lambda: app._parsear_csv(encabezado, registros, HOJA),
+            "esquema_id_texto":  lambda: app._parsear_csv(encabezado, registros_invalidos, HOJA),
+        }
+        for nombre, funcion in variantes.items():
+            pico_mb, df_mb = memoria(funcion)
+            filas.append({
+                "temporadas": temporadas,
+                "filas":      len(registros),
+                "csv_mb":     round(len(payload) / 1e6, 1),
+                "parseo":     nombre,
+                "ms":         cronometrar(funcion, args.repeticiones),
+                "pico_py_mb": pico_mb,
+                "df_mb":      df_mb,
+            })
+    print(pd.DataFrame(filas).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark de los índices relacionales (INDICES) contra los escaneos con
+máscaras booleanas que hacía la sección Entrenamientos: resolver una
+semana (días, tareas de esos días y asistencia de cada día con nombre del
+plantel) sobre varias temporadas sintéticas.
+
+    pip install -r requirements-dev.txt
+    python bench/bench_indices.py
+    python bench/bench_indices.py --temporadas 1 5 10 --jugadores 40
+
+Una temporada = 52 semanas de lunes a viernes. "armar" es lo que cuesta
+construir los índices una vez por versión de los datos; "semana" es lo
+que cuesta cada página después.
+"""
+import argparse
+
+import pandas as pd
+
+from comun import capa_datos, cronometrar, datos_sinteticos
+
+
+def semana_con_mascaras(datos: dict, id_sesion) -> int:
+    """Como la grilla original: escaneo de toda la temporada por cada filtro."""
+    dias, tareas = datos["Entrenamientos_Dia"], datos["Tareas"]
+    asistencia, plantel = datos["Asistencia_Entrenamiento"], datos["Plantel"]
+    dias_semana = dias[dias["id_sesion"] == id_sesion]
+    tareas_sem = tareas[tareas["id_entreno_dia"].isin(dias_semana["id_entreno_dia"])]
+    filas = len(tareas_sem)
+    for id_dia in dias_semana["id_entreno_dia"]:
+        ast_dia = asistencia[asistencia["id_entreno_dia"] == id_dia]
+        filas += len(ast_dia.merge(plantel[["id_jugador", "nombre"]], on="id_jugador", how="left"))
+    return filas
+
+
+def semana_con_indices(indices: dict, id_sesion) -> int:
+    """Como la grilla actual: accesos a dict por clave."""
+    dias_semana = indices["dias_por_sesion"][id_sesion]
+    ids = dias_semana["id_entreno_dia"].tolist()
+    filas = len(indices["tareas_por_dia"].varios(ids))
+    for id_dia in ids:
+        filas += len(indices["asistencia_por_dia"][id_dia])
+    return filas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--temporadas", type=int, nargs="+", default=[1, 3, 5])
+    parser.add_argument("--jugadores", type=int, default=40)
+    parser.add_argument("--tareas-por-dia", type=int, default=6)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    app = capa_datos()
+    nombres = ("dias_por_sesion", "tareas_por_dia", "asistencia_por_dia")
+    filas = []
+    for temporadas in args.temporadas:
+        datos = datos_sinteticos(app, jugadores=args.jugadores, semanas=52 * temporadas,
+                                 tareas_por_dia=args.tareas_por_dia)
+        indices = {}
+
+        def armar():
+            indices.update({n: app.INDICES[n][1](datos) for n in nombres})
+
+        armar_ms = cronometrar(armar, args.repeticiones)
+        sesiones = datos["Sesiones"]["id_sesion"].tolist()
+        # Una semana del medio (la última y la primera pueden ser atípicas)
+        id_sesion = sesiones[len(sesiones) // 2]
+        assert semana_con_mascaras(datos, id_sesion) == semana_con_indices(indices, id_sesion)
+        mascaras_ms = cronometrar(lambda: semana_con_mascaras(datos, id_sesion), args.repeticiones)
+        indices_ms = cronometrar(lambda: semana_con_indices(indices, id_sesion), args.repeticiones)
+        filas.append({
+            "temporadas":      temporadas,
+            "filas_asist":     len(datos["Asistencia_Entrenamiento"]),
+            "filas_tareas":    len(datos["Tareas"]),
+            "armar_ms":        armar_ms,
+            "semana_mascaras_ms": mascaras_ms,
+            "semana_indices_ms":  indices_ms,
+            "x":               round(mascaras_ms / indices_ms, 1),
+            # Páginas que amortizan la construcción de los índices
+            "amortiza_en":     max(1, round(armar_ms / max(mascaras_ms - indices_ms, 1e-9))),
+        })
+    print(pd.DataFrame(filas).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark de la grilla semanal de Entrenamientos: una semana de 7 días con
+60 tareas dibujada como antes (un st.markdown por tarjeta, armado con
+iterrows y asistencia con máscara + merge por día) contra la versión
+actual (html_columnas_semana: un st.markdown por columna).
+
+    pip install -r requirements-dev.txt
+    python bench/bench_render.py
+    python bench/bench_render.py --tareas 120 --jugadores 40
+
+Corre con streamlit en modo "bare" (sin servidor): cada elemento arma su
+delta igual, pero no se manda a ningún navegador. Los elementos se cuentan
+con ContadorElementos, como el panel de debug de MEDIR.
+"""
+import argparse
+
+import pandas as pd
+import streamlit as st
+
+from comun import capa_datos, cronometrar, datos_sinteticos
+
+
+def semana_de_prueba(app, datos: dict, n_tareas: int):
+    """Primeros 7 días de la temporada, de Lunes a Domingo, con n_tareas repartidas."""
+    dias_semana = datos["Entrenamientos_Dia"].head(7).copy()
+    dias_semana["dia_semana"] = app.DIAS_ORDEN[:len(dias_semana)]
+    ids = dias_semana["id_entreno_dia"].tolist()
+    tareas_sem = datos["Tareas"].copy()
+    tareas_sem["id_entreno_dia"] = [ids[i % len(ids)] for i in range(len(tareas_sem))]
+    tareas_sem = tareas_sem.head(n_tareas)
+    tareas_sem["dia_semana"] = tareas_sem["id_entreno_dia"].map(
+        dict(zip(ids, dias_semana["dia_semana"])))
+    tareas_sem["orden"] = tareas_sem.groupby("id_entreno_dia").cumcount() + 1
+    return dias_semana, tareas_sem
+
+
+def semana_por_tarjeta(app, st_, dias_semana, tareas_sem, asistencia, plantel) -> None:
+    """La grilla original: un elemento por encabezado, asistencia y tarjeta."""
+    st_.markdown("<div class='semana-scroll-wrapper'>", unsafe_allow_html=True)
+    cols_dias = st_.columns(7, gap="medium")
+    for col_widget, dia in zip(cols_dias, app.DIAS_ORDEN):
+        with col_widget:
+            st_.markdown(f"<div class='dia-header'>📆 {dia}</div>", unsafe_allow_html=True)
+            dia_row = dias_semana[dias_semana["dia_semana"].str.strip().str.title() == dia]
+            if not dia_row.empty:
+                ast_dia = asistencia[asistencia["id_entreno_dia"] == dia_row.iloc[0]["id_entreno_dia"]]
+                if not ast_dia.empty:
+                    ast_dia = ast_dia.merge(plantel[["id_jugador", "nombre"]], on="id_jugador", how="left")
+                    ausentes = ast_dia[ast_dia["estado"] == "Ausente"]["nombre"].dropna().tolist()
+                    st_.markdown(
+                        f"<div><b>{len(ast_dia)} jugadores</b> ({', '.join(ausentes)} ausente)</div>",
+                        unsafe_allow_html=True,
+                    )
+            if dia in tareas_sem["dia_semana"].values:
+                tareas_dia = tareas_sem[tareas_sem["dia_semana"] == dia].sort_values("orden")
+                for _, t in tareas_dia.iterrows():
+                    tipo = str(t.get("tipo", "")).strip()
+                    colores = app.TIPO_COLORES.get(tipo, app.TIPO_DEFAULT)
+                    mins = t.get("tiempo_min", "")
+                    mins_str = f"{int(float(mins))} min" if pd.notna(mins) else ""
+                    yt_url = str(t.get("link_youtube", "")).strip()
+                    tipo_html = (
+                        f"<span class='tipo-badge' style='background:{colores['bg']};color:{colores['text']};'>"
+                        f"{tipo}</span>"
+                    ) if tipo and tipo.lower() not in ("nan", "none", "") else ""
+                    descr_val = str(t.get("descrip_tarea", "")).strip()
+                    yt_html = (
+                        f"<div style='margin-top:8px;'><a href='{yt_url}' target='_blank' "
+                        f"style='font-size:0.8rem;color:#38bdf8;text-decoration:none;'>▶ Ver vídeo</a></div>"
+                    ) if yt_url and yt_url.lower() not in ("", "nan", "none", "<na>") else ""
+                    st_.markdown(
+                        f"<div class='tarea-card' style='background:{colores['bg']};"
+                        f"border-left:4px solid {colores['border']};'>"
+                        f"<div style='font-size:1.05rem;font-weight:700;color:#e8eaed;margin-bottom:2px;'>"
+                        f"{t.get('nombre_tarea', 'Sin nombre')}</div>"
+                        f"<div style='font-size:0.83rem;color:#e8eaed;font-weight:400;"
+                        f"margin:5px 0 6px;line-height:1.4;'>{descr_val}</div>"
+                        f"<div class='tarea-meta' style='margin-top:4px;'>{tipo_html}⏱ {mins_str}</div>"
+                        f"{yt_html}</div>",
+                        unsafe_allow_html=True,
+                    )
+            else:
+                st_.caption("Sin tareas")
+    st_.markdown("</div>", unsafe_allow_html=True)
+
+
+def semana_por_columna(app, st_, dias_semana, tareas_sem, ast_por_dia) -> None:
+    """La grilla actual: el HTML de cada columna armado de una vez."""
+    columnas_html = app.html_columnas_semana(dias_semana, tareas_sem, ast_por_dia)
+    st_.markdown("<div class='semana-scroll-wrapper'>", unsafe_allow_html=True)
+    for col_widget, html_col in zip(st_.columns(7, gap="medium"), columnas_html):
+        col_widget.markdown(html_col, unsafe_allow_html=True)
+    st_.markdown("</div>", unsafe_allow_html=True)
+
+
+def medir(app, nombre: str, dibujar, repeticiones: int) -> dict:
+    """Tiempo mediano de dibujar(st_) y elementos que emite una pasada."""
+    metricas = app.Metricas(True)
+    dibujar(app.ContadorElementos(st, metricas))
+    elementos = sum(n for clave, n in metricas.contadores.items() if clave.startswith("st."))
+    ms = cronometrar(lambda: dibujar(app.ContadorElementos(st, app.Metricas(False))), repeticiones)
+    return {
+        "grilla":     nombre,
+        "render_ms":  ms,
+        "elementos":  elementos,
+        "kb_markdown": round(metricas.contadores["bytes_markdown"] / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tareas", type=int, default=60)
+    parser.add_argument("--jugadores", type=int, default=30)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    app = capa_datos("RENDER DE TARJETAS")
+    # Tareas suficientes en los primeros días para repartir args.tareas en 7
+    datos = datos_sinteticos(app, jugadores=args.jugadores, semanas=2,
+                             tareas_por_dia=-(-args.tareas // 7))
+    dias_semana, tareas_sem = semana_de_prueba(app, datos, args.tareas)
+    asistencia, plantel = datos["Asistencia_Entrenamiento"], datos["Plantel"]
+    ast_por_dia = app.INDICES["asistencia_por_dia"][1](datos)
+    print(f"{len(dias_semana)} días, {len(tareas_sem)} tareas, {args.jugadores} jugadores")
+
+    filas = [
+        medir(app, "por_tarjeta", lambda st_: semana_por_tarjeta(
+            app, st_, dias_semana, tareas_sem, asistencia, plantel), args.repeticiones),
+        medir(app, "por_columna", lambda st_: semana_por_columna(
+            app, st_, dias_semana, tareas_sem, ast_por_dia), args.repeticiones),
+    ]
+    print(pd.DataFrame(filas).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
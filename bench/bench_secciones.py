@@ -0,0 +1,138 @@
+"""
+Benchmark sin interfaz de las secciones de la app. Corre app.py con
+AppTest sobre la fuente sintética (EXCURSIONISTAS_FUENTE=sintetica) a
+varios tamaños de datos y, por sección, informa el tiempo de pared, el
+pico de memoria del proceso y los elementos emitidos.
+
+Cada tamaño corre en un proceso aparte (el pico de memoria es del
+proceso) y cada sección se visita dos veces: "fría" (primera visita,
+incluye la carga de sus hojas) y "caliente" (volver a entrar).
+
+    pip install -r requirements-dev.txt
+    python bench/bench_secciones.py
+    python bench/bench_secciones.py "jugadores=30,semanas=40" --json resultados.json
+
+Los tiempos y contadores salen del log de métricas de la app
+(EXCURSIONISTAS_PERF_LOG): una línea por sección ejecutada.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+# Tamaños por defecto: la temporada de hoy, una larga y una exagerada
+TAMANOS = [
+    "jugadores=25,semanas=12",
+    "jugadores=40,semanas=40,clips_por_partido=6",
+    "jugadores=60,semanas=120,clips_por_partido=10",
+]
+TIMEOUT_S = 600
+
+
+def medir_tamano(sinteticos: str) -> list[dict]:
+    """
+    Corre todas las secciones con un tamaño de datos (en este proceso).
+
+    Parametros:
+        sinteticos: parámetros de FuenteSintetica, p. ej. "jugadores=30,semanas=40"
+
+    Retorna:
+        Una fila por sección y visita, con tiempos, memoria y elementos.
+    """
+    with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+        directorio = Path(tmp)
+        for archivo in ("app.py", "excursionistas.png"):
+            shutil.copy(RAIZ / archivo, directorio / archivo)
+        log = directorio / "perf.jsonl"
+        os.environ.update(
+            EXCURSIONISTAS_FUENTE="sintetica",
+            EXCURSIONISTAS_SINTETICA=sinteticos,
+            EXCURSIONISTAS_PERF_LOG=str(log),
+        )
+        os.chdir(directorio)
+
+        import logging
+        from streamlit.testing.v1 import AppTest
+        logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+        at = AppTest.from_file(str(directorio / "app.py"), default_timeout=TIMEOUT_S)
+        filas = []
+        leidas = 0
+
+        def correr(visita: str, seccion: str, accion) -> None:
+            nonlocal leidas
+            t0 = time.perf_counter()
+            accion()
+            pared_ms = (time.perf_counter() - t0) * 1000
+            if at.exception:
+                raise RuntimeError(f"{seccion}: {at.exception[0].value}")
+            lineas = log.read_text(encoding="utf-8").splitlines()
+            registros = [json.loads(linea) for linea in lineas[leidas:]]
+            leidas = len(lineas)
+            registro = next(r for r in registros if r["unidad"].startswith("seccion_"))
+            contadores = registro["contadores"]
+            filas.append({
+                "datos":         sinteticos,
+                "seccion":       seccion,
+                "visita":        visita,
+                "pared_ms":      round(pared_ms, 1),
+                "seccion_ms":    registro["ms"],
+                "rss_max_mb":    round(registro.get("rss_max_kb", 0) / 1024, 1),
+                "elementos":     sum(v for k, v in contadores.items() if k.startswith("st.")),
+                "kb_markdown":   round(contadores.get("bytes_markdown", 0) / 1024, 1),
+            })
+
+        # Arranque: la primera ejecución dibuja la sección por defecto
+        correr("fría", "(arranque)", at.run)
+        secciones = list(at.sidebar.radio[0].options)
+        filas[-1]["seccion"] = at.sidebar.radio[0].value
+        for visita in ("fría", "caliente"):
+            for seccion in secciones:
+                if visita == "fría" and seccion == filas[0]["seccion"]:
+                    continue
+                correr(visita, seccion, lambda s=seccion: at.sidebar.radio[0].set_value(s).run())
+        return filas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("tamanos", nargs="*", default=TAMANOS,
+                        help='parámetros de la fuente sintética, p. ej. "jugadores=30,semanas=40"')
+    parser.add_argument("--json", help="además guardar las filas en este archivo")
+    parser.add_argument("--un-tamano", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.un_tamano is not None:
+        # Proceso hijo: un solo tamaño, filas por stdout
+        print(json.dumps(medir_tamano(args.un_tamano), ensure_ascii=False))
+        return
+
+    import pandas as pd
+
+    filas = []
+    for sinteticos in args.tamanos:
+        print(f"· {sinteticos} …", file=sys.stderr, flush=True)
+        hijo = subprocess.run(
+            [sys.executable, __file__, "--un-tamano", sinteticos],
+            capture_output=True, text=True, encoding="utf-8", check=True,
+        )
+        filas += json.loads(hijo.stdout.strip().splitlines()[-1])
+
+    tabla = pd.DataFrame(filas)
+    with pd.option_context("display.width", 200, "display.max_rows", None):
+        for sinteticos, grupo in tabla.groupby("datos", sort=False):
+            print(f"\n{sinteticos}")
+            print(grupo.drop(columns="datos").to_string(index=False))
+    if args.json:
+        Path(args.json).write_text(json.dumps(filas, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
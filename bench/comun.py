@@ -0,0 +1,53 @@
+"""
+Utilidades de los benchmarks: la capa de datos de app.py (cargada como en
+tests/conftest.py), hojas sintéticas ya normalizadas y un cronómetro.
+"""
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "tests"))
+
+from conftest import cargar_capa_datos, cargar_seccion  # noqa: E402
+
+_TEMPORAL = tempfile.TemporaryDirectory(prefix="bench_")
+
+
+def capa_datos(*secciones: str):
+    """
+    Módulo con todo lo anterior a SESSION STATE de app.py (carpetas en un
+    temporal), más las secciones posteriores que se nombren.
+    """
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    modulo = cargar_capa_datos(Path(_TEMPORAL.name))
+    for titulo in secciones:
+        cargar_seccion(modulo, titulo)
+    return modulo
+
+
+def hojas_crudas(app, **params) -> dict:
+    """hoja → CSV (bytes) de FuenteSintetica con esos parámetros."""
+    fuente = app.FuenteSintetica(**params)
+    return fuente._generar(**fuente.params)
+
+
+def datos_sinteticos(app, **params) -> dict:
+    """hoja → DataFrame parseado y normalizado, como lo reciben las secciones."""
+    return {
+        hoja: app.normalizar_hoja(hoja, app._parsear_csv(*app._registros_csv(payload), hoja))[0]
+        for hoja, payload in hojas_crudas(app, **params).items()
+    }
+
+
+def cronometrar(funcion, repeticiones: int = 5) -> float:
+    """Mediana en ms de `repeticiones` llamadas a funcion()."""
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    return round(statistics.median(tiempos), 2)
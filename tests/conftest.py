@@ -0,0 +1,185 @@
+"""
+Fixtures compartidas. app.py es un script de Streamlit: para probar la capa
+de datos sin levantar la interfaz se ejecuta todo lo anterior a la sección
+SESSION STATE (configuración, fuentes, almacén, normalización, consultas)
+en un módulo aparte, con las carpetas de trabajo en un directorio temporal.
+
+    pip install -r requirements-dev.txt
+    python -m pytest -q tests
+"""
+import csv
+import http.server
+import io
+import logging
+import re
+import shutil
+import threading
+import time
+import types
+import urllib.parse
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parents[1]
+FIN_CAPA_DATOS = "#  SESSION STATE"
+
+
+def cargar_capa_datos(directorio: Path) -> types.ModuleType:
+    fuente = (RAIZ / "app.py").read_text(encoding="utf-8")
+    modulo = types.ModuleType("app_datos")
+    # SNAPSHOT_DIR, FOTOS_DIR, etc. cuelgan de __file__: que queden en el temporal
+    modulo.__file__ = str(directorio / "app.py")
+    # Sin servidor de Streamlit cada st.* avisa que corre en "bare mode"
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    exec(compile(fuente[:fuente.index(FIN_CAPA_DATOS)], str(RAIZ / "app.py"), "exec"), modulo.__dict__)
+    return modulo
+
+
+def cargar_seccion(modulo: types.ModuleType, titulo: str) -> types.ModuleType:
+    """
+    Agrega al módulo de cargar_capa_datos una sección de app.py posterior
+    a SESSION STATE que no dibuja nada al importarse (p. ej. "FOTOS DEL
+    PLANTEL"): desde su banner hasta el banner siguiente.
+    """
+    fuente = (RAIZ / "app.py").read_text(encoding="utf-8")
+    inicio = fuente.index(f"#  {titulo}")
+    fin = fuente.index("\n# ─", fuente.index("\n", fuente.index("\n", inicio) + 1))
+    # Mismo número de línea que en app.py en los tracebacks
+    codigo = "\n" * fuente.count("\n", 0, inicio) + fuente[inicio:fin]
+    exec(compile(codigo, str(RAIZ / "app.py"), "exec"), modulo.__dict__)
+    return modulo
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    return cargar_capa_datos(tmp_path_factory.mktemp("app"))
+
+
+@pytest.fixture
+def app_test(tmp_path, monkeypatch):
+    """
+    Fábrica de AppTest sobre una copia de la app en un directorio temporal
+    (snapshots, packs y fotos quedan ahí), con la fuente sintética.
+    """
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    # cache_resource es del proceso: sin esto la app reusaría el almacén
+    # (y sus carpetas) de una prueba anterior
+    st.cache_resource.clear()
+    for archivo in ("app.py", "excursionistas.png"):
+        shutil.copy(RAIZ / archivo, tmp_path / archivo)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("EXCURSIONISTAS_FUENTE", "sintetica")
+
+    def crear(sinteticos: str = "", timeout: float = 120) -> "AppTest":
+        monkeypatch.setenv("EXCURSIONISTAS_SINTETICA", sinteticos)
+        return AppTest.from_file(str(tmp_path / "app.py"), default_timeout=timeout)
+
+    return crear
+
+
+# ── Stub de gviz ─────────────────────────────────────────────
+
+def _indice(letra: str) -> int:
+    n = 0
+    for ch in letra:
+        n = n * 26 + ord(ch) - ord("A") + 1
+    return n - 1
+
+
+def _cumple(fila: list[str], condicion: str) -> bool:
+    for termino in re.split(r"\s+and\s+(?![^()]*\))", condicion.strip()):
+        if termino.startswith("("):
+            if not any(_cumple(fila, alt) for alt in termino[1:-1].split(" or ")):
+                return False
+            continue
+        letra, literal = re.fullmatch(r"\s*([A-Z]+)\s*=\s*(.+?)\s*", termino).groups()
+        celda = fila[_indice(letra)]
+        if literal[0] in "'\"":
+            if celda != literal[1:-1]:
+                return False
+        elif celda == "" or float(celda) != float(literal):
+            return False
+    return True
+
+
+def aplicar_tq(payload: bytes, tq: str) -> bytes:
+    filas = list(csv.reader(io.StringIO(payload.decode("utf-8"))))
+    encabezado, filas = filas[0], filas[1:]
+    seleccion, condicion, limite = re.fullmatch(
+        r"(?:select (.+?))?(?: ?where (.+?))?(?: ?limit (\d+))?", tq.strip()
+    ).groups()
+    indices = [_indice(c.strip()) for c in seleccion.split(",")] if seleccion else range(len(encabezado))
+    if condicion:
+        filas = [f for f in filas if _cumple(f, condicion)]
+    if limite is not None:
+        filas = filas[:int(limite)]
+    salida = io.StringIO()
+    escritor = csv.writer(salida, quoting=csv.QUOTE_ALL)
+    escritor.writerow([encabezado[i] for i in indices])
+    escritor.writerows([[f[i] for i in indices] for f in filas])
+    return salida.getvalue().encode("utf-8")
+
+
+class Gviz:
+    """
+    Stub de gviz: sirve hojas (bytes CSV, se pueden cambiar en el medio),
+    aplica tq si viene y anota cada pedido como (hoja, tq). Con latencia,
+    cada respuesta tarda eso (ensancha la ventana en que los pedidos se pisan).
+    """
+
+    def __init__(self, hojas: dict[str, bytes], latencia: float = 0.0):
+        self.hojas = dict(hojas)
+        self.latencia = latencia
+        self.pedidos = []
+        self.caido = False
+        stub = self
+
+        class Manejador(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                consulta = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+                hoja, tq = consulta["sheet"][0], consulta.get("tq", [None])[0]
+                stub.pedidos.append((hoja, tq))
+                time.sleep(stub.latencia)
+                if stub.caido or hoja not in stub.hojas:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                cuerpo = aplicar_tq(stub.hojas[hoja], tq) if tq else stub.hojas[hoja]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass
+
+        self.http = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+        self.http.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.http.server_address[1]}/"
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+
+
+@pytest.fixture(scope="session")
+def hojas(app):
+    """CSV de cada hoja, de la fuente sintética (chica)."""
+    fuente = app.FuenteSintetica(jugadores=12, semanas=6, clips_por_partido=4)
+    return fuente._generar(**fuente.params)
+
+
+@pytest.fixture
+def gviz(app, hojas, monkeypatch):
+    """Stub de gviz levantado; las URL de las hojas (_sheet_url) apuntan a él."""
+    stub = Gviz(hojas)
+    url_original = app._sheet_url
+    monkeypatch.setattr(app, "_sheet_url", lambda hoja, tq=None: url_original(hoja, tq).replace(
+        f"https://docs.google.com/spreadsheets/d/{app.SHEET_ID}/", stub.base))
+    yield stub
+    stub.http.shutdown()
+    stub.http.server_close()
@@ -0,0 +1,135 @@
+"""
+Muchas sesiones a la vez contra el stub de gviz, que cuenta los pedidos:
+cada hoja se pide una sola vez por arranque o refresco, aunque la pidan
+30 sesiones juntas (single-flight de AlmacenHojas). Las sesiones además
+comparten los frames normalizados y los índices en vez de copiarlos.
+"""
+import threading
+import tracemalloc
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+SESIONES = 30
+
+
+@pytest.fixture
+def almacen(app, gviz, tmp_path, monkeypatch):
+    gviz.latencia = 0.2
+    transporte = app.TransporteHTTP(reintentos=0, backoff=0)
+    almacen = app.AlmacenHojas(tmp_path / "snapshots", fuente=app.FuenteSheets(transporte))
+    monkeypatch.setattr(app, "almacen_hojas", lambda: almacen)
+    return almacen
+
+
+def a_la_vez(funcion, sesiones: int = SESIONES) -> list:
+    """funcion() en `sesiones` hilos que arrancan juntos; retorna sus resultados."""
+    barrera = threading.Barrier(sesiones)
+    resultados, errores = [], []
+
+    def sesion():
+        barrera.wait()
+        try:
+            resultados.append(funcion())
+        except Exception as e:
+            errores.append(e)
+
+    hilos = [threading.Thread(target=sesion) for _ in range(sesiones)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert not errores, errores
+    return resultados
+
+
+def pedidos_por_hoja(gviz, desde: int = 0) -> Counter:
+    return Counter(hoja for hoja, _ in gviz.pedidos[desde:])
+
+
+def test_arranque_en_frio_pide_cada_hoja_una_vez(app, gviz, almacen):
+    resultados = a_la_vez(lambda: almacen.obtener(app.HOJAS))
+    assert pedidos_por_hoja(gviz) == Counter(app.HOJAS)
+    for datos in resultados:
+        assert all(not datos[h].empty for h in app.HOJAS)
+
+
+def test_datos_normalizados_a_la_vez(app, gviz, almacen):
+    resultados = a_la_vez(lambda: app.datos_normalizados(app.HOJAS))
+    assert pedidos_por_hoja(gviz) == Counter(app.HOJAS)
+    assert len({firma for firma, _, _ in resultados}) == 1
+
+
+def test_refrescos_simultaneos(app, hojas, gviz, almacen):
+    almacen.obtener(app.HOJAS)
+    for ronda in range(3):
+        n0 = len(gviz.pedidos)
+        if ronda == 2:
+            gviz.hojas["Plantel"] = hojas["Plantel"] + b'999,Jugador 999,Delantero,2005,\n'
+        cambiadas = a_la_vez(almacen.refrescar)
+        assert pedidos_por_hoja(gviz, n0) == Counter(app.HOJAS)
+        # Quien esperó la descarga de otro también se entera de qué cambió
+        esperado = ["Plantel"] if ronda == 2 else []
+        assert all(sorted(c) == esperado for c in cambiadas), cambiadas
+    assert 999 in set(almacen.frames["Plantel"]["id_jugador"])
+
+
+def test_ttl_vencido_revalida_una_vez_en_segundo_plano(app, gviz, almacen):
+    almacen.obtener(app.HOJAS)
+    for meta in almacen.meta.values():
+        meta["fetched_at"] = 0
+    n0 = len(gviz.pedidos)
+    resultados = a_la_vez(lambda: almacen.obtener(app.HOJAS))
+    # Nadie esperó la red: todas las sesiones recibieron la copia vieja
+    assert all(len(datos) == len(app.HOJAS) for datos in resultados)
+    almacen._refresco.join(timeout=30)
+    assert pedidos_por_hoja(gviz, n0) == Counter(app.HOJAS)
+    assert all(almacen.al_dia(h) for h in app.HOJAS)
+
+
+def buffers(serie: pd.Series) -> list[int]:
+    """Direcciones de memoria de los valores de una columna."""
+    arr = serie.array
+    if isinstance(arr, pd.arrays.ArrowStringArray):
+        return [b.address for chunk in arr.__arrow_array__().chunks for b in chunk.buffers() if b is not None]
+    if isinstance(arr, pd.Categorical):
+        valores = arr.codes
+    else:
+        valores = arr._data if hasattr(arr, "_mask") else arr._ndarray
+    return [valores.__array_interface__["data"][0]]
+
+
+def test_sesiones_comparten_frames_e_indices(app, gviz, almacen):
+    # Una temporada larga, para que copiar los datos se note en la memoria
+    fuente = app.FuenteSintetica(jugadores=40, semanas=104)
+    gviz.hojas = fuente._generar(**fuente.params)
+    gviz.latencia = 0
+
+    def pagina():
+        """Lo que hace una sección: sus frames y todos los índices de esa versión."""
+        firma, datos, _ = app.datos_normalizados(app.HOJAS)
+        with app.indices.fijar(app.HOJAS, firma, datos):
+            return datos, {nombre: app.indices[nombre] for nombre in app.INDICES}
+
+    primera, _ = pagina()
+    tamano = sum(int(df.memory_usage(deep=True).sum()) for df in primera.values())
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        resultados = a_la_vez(pagina, sesiones=20)
+        por_sesion = (tracemalloc.get_traced_memory()[0] - antes) / 20
+    finally:
+        tracemalloc.stop()
+
+    for datos, idx in resultados:
+        # Un frame por sesión (lo que agregue una sección no se ve en otra)...
+        assert all(datos[h] is not primera[h] for h in app.HOJAS)
+        # ...sobre los mismos arrays de la versión compartida
+        for hoja, df in primera.items():
+            for col in df.columns:
+                assert buffers(datos[hoja][col]) == buffers(df[col]), (hoja, col)
+        # Los índices son el mismo objeto para todas
+        assert all(idx[n] is resultados[0][1][n] for n in app.INDICES)
+    # Cada sesión suma solo los envoltorios de los frames, no los datos
+    assert por_sesion < tamano / 10, (por_sesion, tamano)
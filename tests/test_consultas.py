@@ -0,0 +1,147 @@
+"""
+Porciones (ConsultasHojas) contra el stub de gviz de conftest, que aplica
+la consulta tq (select, where con = / or / and, limit) como Google.
+"""
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def consultas(app, gviz, tmp_path, monkeypatch):
+    transporte = app.TransporteHTTP(reintentos=0, backoff=0)
+    almacen = app.AlmacenHojas(tmp_path / "snapshots", fuente=app.FuenteSheets(transporte))
+    almacen.planificador = app.PlanificadorRefresco(almacen)   # sin iniciar: solo registra
+    # La copia completa de respaldo (datos_normalizados) sale de este almacén
+    monkeypatch.setattr(app, "almacen_hojas", lambda: almacen)
+    return app.ConsultasHojas(almacen, transporte)
+
+
+def completa(app, hojas, hoja: str) -> pd.DataFrame:
+    df = app._parsear_csv(*app._registros_csv(hojas[hoja]), hoja)
+    return app.normalizar_hoja(hoja, df)[0]
+
+
+def iguales(obtenido: pd.DataFrame, esperado: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(obtenido.reset_index(drop=True), esperado.reset_index(drop=True))
+
+
+def test_porcion_viaja_como_tq_y_coincide_con_filtrar_la_hoja(app, hojas, gviz, consultas):
+    consulta = app.ConsultaGviz("PostPartido").donde("id_partido", 3)
+    df = consultas.porcion(consulta)
+    assert not df.empty
+    iguales(df, consulta.filtrar(completa(app, hojas, "PostPartido")))
+    # Encabezado ("limit 0") y la porción; nunca la hoja entera
+    assert [tq for _, tq in gviz.pedidos] == ["limit 0", consulta.tq(consultas.encabezado("PostPartido"))]
+    assert "where" in gviz.pedidos[-1][1]
+
+
+def test_lista_de_valores(app, hojas, gviz, consultas):
+    consulta = app.ConsultaGviz("Asistencia_Entrenamiento").en("id_entreno_dia", [2, 5, 7])
+    df = consultas.porcion(consulta)
+    assert set(df["id_entreno_dia"]) == {2, 5, 7}
+    iguales(df, consulta.filtrar(completa(app, hojas, "Asistencia_Entrenamiento")))
+    assert all(tq for _, tq in gviz.pedidos)
+
+
+def test_filtro_por_texto(app, hojas, gviz, consultas):
+    completa_video = completa(app, hojas, "Videoanalisis")
+    link = completa_video["link_youtube"].dropna().iloc[0]
+    consulta = app.ConsultaGviz("Videoanalisis").donde("link_youtube", link)
+    iguales(consultas.porcion(consulta), consulta.filtrar(completa_video))
+
+
+def test_misma_consulta_sale_del_cache(app, gviz, consultas):
+    consulta = app.ConsultaGviz("PostPartido").donde("id_partido", 2)
+    primera = consultas.porcion(consulta)
+    pedidos = len(gviz.pedidos)
+    segunda = consultas.porcion(app.ConsultaGviz("PostPartido").donde("id_partido", 2))
+    assert len(gviz.pedidos) == pedidos
+    iguales(segunda, primera)
+    # Cada llamada recibe su copia: modificarla no toca el caché
+    segunda["goles"] = 99
+    assert not (consultas.porcion(consulta)["goles"] == 99).any()
+
+
+def test_consultas_simultaneas_viajan_una_vez(app, gviz, consultas):
+    consultas.encabezado("PostPartido")
+    barrera = threading.Barrier(20)
+    resultados = []
+
+    def pedir():
+        barrera.wait()
+        resultados.append(consultas.porcion(app.ConsultaGviz("PostPartido").donde("id_partido", 4)))
+
+    hilos = [threading.Thread(target=pedir) for _ in range(20)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert len(resultados) == 20
+    assert sum(1 for _, tq in gviz.pedidos if tq and "where" in tq) == 1
+
+
+def test_hoja_al_dia_en_memoria_no_toca_la_red(app, hojas, gviz, consultas):
+    consultas.almacen.obtener(["PostPartido"])
+    pedidos = len(gviz.pedidos)
+    consulta = app.ConsultaGviz("PostPartido").donde("id_partido", 3)
+    iguales(consultas.porcion(consulta), consulta.filtrar(completa(app, hojas, "PostPartido")))
+    assert len(gviz.pedidos) == pedidos
+
+
+def test_sin_red_usa_la_copia_completa_sin_contar_lectura(app, hojas, gviz, consultas):
+    consultas.almacen.obtener(["PostPartido"], registrar=False)
+    consultas.almacen.meta["PostPartido"]["fetched_at"] = 0      # vencida: iría a la red
+    gviz.caido = True
+    consulta = app.ConsultaGviz("PostPartido").donde("id_partido", 3)
+    assert consultas.columnas("PostPartido")
+    iguales(consultas.porcion(consulta), consulta.filtrar(completa(app, hojas, "PostPartido")))
+    # Ni la porción ni las columnas mantienen viva la hoja en el planificador
+    estado = consultas.almacen.planificador.estado()
+    assert estado.loc[estado["hoja"] == "PostPartido", "lecturas"].sum() == 0
+
+
+def test_columna_inexistente_da_cero_filas(app, gviz, consultas):
+    df = consultas.porcion(app.ConsultaGviz("PostPartido").donde("no_existe", 1))
+    assert df.empty
+
+
+def test_precarga_no_baja_las_hojas_por_porciones(app, app_test, tmp_path):
+    at = app_test()
+    at.run()
+    assert not at.exception
+    snapshots = next((tmp_path / ".snapshots").glob("sintetica-*"))
+    # La precarga corre en segundo plano al final del script
+    limite = time.time() + 30
+    while not (snapshots / "Plantel.parquet").exists() and time.time() < limite:
+        time.sleep(0.1)
+    assert (snapshots / "Plantel.parquet").exists()
+    time.sleep(0.5)
+    for hoja in app.HOJAS_POR_PORCION:
+        assert not (snapshots / f"{hoja}.parquet").exists(), hoja
+
+
+def test_etiquetas_de_la_porcion_se_cachean(app, hojas, gviz, consultas):
+    app._etiquetas_cacheadas.clear()
+    consulta = app.ConsultaGviz("Videoanalisis").donde("id_partido", 1)
+    firma, datos, _ = app.datos_normalizados(["Plantel"])
+    plantel = datos["Plantel"]
+    with app.indices.fijar(["Plantel"], firma, datos):
+        etiquetas = app.etiquetas_de_porcion(consulta, consultas.porcion(consulta), plantel)
+        assert etiquetas.clips_por_clave
+        # Otro rerun: la misma porción (otra copia) da el mismo índice
+        assert app.etiquetas_de_porcion(consulta, consultas.porcion(consulta), plantel) is etiquetas
+
+        # Misma consulta con otras filas (la hoja cambió): índice nuevo
+        otra = consultas.porcion(consulta).iloc[1:]
+        assert app.etiquetas_de_porcion(consulta, otra, plantel) is not etiquetas
+        # Sin la columna de etiquetas también se puede armar (vacío)
+        sin_etiquetas = consultas.porcion(consulta).drop(columns="jugadores_etiquetados")
+        assert not app.etiquetas_de_porcion(consulta, sin_etiquetas, plantel).clips_por_clave
+
+    # Otra versión del Plantel: índice nuevo
+    nuevo = datos["Plantel"].iloc[:-1]
+    with app.indices.fijar(["Plantel"], (firma[0] + "x",), {"Plantel": nuevo}):
+        assert app.etiquetas_de_porcion(consulta, consultas.porcion(consulta), nuevo) is not etiquetas
@@ -0,0 +1,135 @@
+"""
+Repetición de versiones sintéticas de una hoja: el diff por filas de
+CSVHoja.desde_payload tiene que dar siempre lo mismo que parsear el CSV
+entero, y su delta tiene que coincidir con el calculado por clave.
+"""
+import csv
+import io
+import random
+
+import pandas as pd
+
+HOJA = "Asistencia_Entrenamiento"
+ESTADOS = ["Presente", "Ausente", "Diferenciado", ""]
+RONDAS = 300
+
+
+def _csv(filas: list[dict]) -> bytes:
+    # Como exporta gviz: todo entre comillas
+    salida = io.StringIO()
+    escritor = csv.writer(salida, quoting=csv.QUOTE_ALL, lineterminator="\n")
+    escritor.writerow(["id_entreno_dia", "id_sesion", "id_jugador", "estado", "observaciones"])
+    for f in filas:
+        escritor.writerow([f["id_entreno_dia"], f["id_sesion"], f["id_jugador"], f["estado"], f["observaciones"]])
+    return salida.getvalue().encode("utf-8")
+
+
+def _observacion(rng: random.Random) -> str:
+    # Texto libre con comas, comillas y saltos de línea: registros de varias líneas
+    return rng.choice(["", "llegó tarde", 'dijo "molestia", sigue', "kine\nmartes y jueves", "ok"])
+
+
+def _fila(rng: random.Random, dia: int, jugador: int) -> dict:
+    return {
+        "id_entreno_dia": dia, "id_sesion": (dia - 1) // 5 + 1, "id_jugador": jugador,
+        "estado": rng.choice(ESTADOS), "observaciones": _observacion(rng),
+    }
+
+
+def _editar(rng: random.Random, filas: list[dict], proximo_dia: list[int]) -> list[dict]:
+    filas = [dict(f) for f in filas]
+    for _ in range(rng.randint(1, 6)):
+        accion = rng.choice(["cambio", "cambio", "alta", "baja", "dia", "orden", "invalido"])
+        if accion == "cambio" and filas:
+            f = rng.choice(filas)
+            campo = rng.choice(["estado", "observaciones"])
+            f[campo] = rng.choice(ESTADOS) if campo == "estado" else _observacion(rng)
+        elif accion == "alta":
+            existentes = {(f["id_entreno_dia"], f["id_jugador"]) for f in filas}
+            dia, jugador = rng.randint(1, proximo_dia[0]), rng.randint(1, 30)
+            if (dia, jugador) not in existentes:
+                filas.insert(rng.randint(0, len(filas)), _fila(rng, dia, jugador))
+        elif accion == "baja" and filas:
+            filas.pop(rng.randrange(len(filas)))
+        elif accion == "dia":
+            # Un entrenamiento nuevo: una fila por jugador al final
+            proximo_dia[0] += 1
+            filas.extend(_fila(rng, proximo_dia[0], j) for j in range(1, 26))
+        elif accion == "orden" and len(filas) > 1:
+            i, j = rng.randrange(len(filas)), rng.randrange(len(filas))
+            filas[i], filas[j] = filas[j], filas[i]
+        elif accion == "invalido" and filas:
+            # Un id que no es número: la tanda se relee como texto
+            rng.choice(filas)["id_sesion"] = rng.choice(["x", "", "3"])
+    return filas
+
+
+def _delta_esperado(antes: list[dict], despues: list[dict]) -> dict:
+    # Se compara el texto del CSV: 3 y "3" son el mismo registro
+    clave = lambda f: (f["id_entreno_dia"], f["id_jugador"])
+    previas = {clave(f): {c: str(v) for c, v in f.items()} for f in antes}
+    actuales = {clave(f): {c: str(v) for c, v in f.items()} for f in despues}
+    return {
+        "altas":   len(actuales.keys() - previas.keys()),
+        "cambios": sum(previas[k] != actuales[k] for k in actuales.keys() & previas.keys()),
+        "bajas":   len(previas.keys() - actuales.keys()),
+    }
+
+
+def test_diff_por_filas_igual_a_parseo_completo(app):
+    rng = random.Random(1)
+    proximo_dia = [20]
+    filas = [_fila(rng, d, j) for d in range(1, 21) for j in range(1, 26)]
+    base = app.CSVHoja.desde_payload(_csv(filas), HOJA)
+    base.hash = "v0"
+    for ronda in range(RONDAS):
+        nuevas = _editar(rng, filas, proximo_dia)
+        payload = _csv(nuevas)
+        incremental = app.CSVHoja.desde_payload(payload, HOJA, base=base)
+        completo = app.CSVHoja.desde_payload(payload, HOJA)
+
+        pd.testing.assert_frame_equal(incremental.df, completo.df, obj=f"ronda {ronda}")
+        if incremental.delta is not None:
+            # Las observaciones no están en el esquema, pero cambian el registro
+            esperado = _delta_esperado(
+                [dict(f, observaciones="") for f in filas], [dict(f, observaciones="") for f in nuevas]
+            )
+            assert incremental.delta["altas"] == esperado["altas"]
+            assert incremental.delta["bajas"] == esperado["bajas"]
+            assert incremental.delta["cambios"] >= esperado["cambios"]
+            assert incremental.base_hash == base.hash
+        incremental.hash = f"v{ronda + 1}"
+        base, filas = incremental, nuevas
+
+
+def test_encabezado_distinto_parsea_completo(app):
+    rng = random.Random(0)
+    filas = [_fila(rng, 1, j) for j in range(1, 6)]
+    base = app.CSVHoja.desde_payload(_csv(filas), HOJA)
+    payload = _csv(filas).replace(b'"observaciones"', b'"notas"', 1)
+    nuevo = app.CSVHoja.desde_payload(payload, HOJA, base=base)
+    assert nuevo.delta is None
+    pd.testing.assert_frame_equal(nuevo.df, app.CSVHoja.desde_payload(payload, HOJA).df)
+
+
+def test_ids_no_numericos_se_avisan(app):
+    rng = random.Random(2)
+    filas = [_fila(rng, 1, j) for j in range(1, 6)]
+    filas[1]["id_jugador"], filas[3]["id_jugador"] = "J07", "3b"
+    filas[4]["id_jugador"] = "5.0"
+    df = app.CSVHoja.desde_payload(_csv(filas), HOJA).df
+    tipado, avisos = app.normalizar_hoja(HOJA, df)
+
+    assert str(tipado["id_jugador"].dtype) == "Int32"
+    assert tipado["id_jugador"].isna().tolist() == [False, True, False, True, False]
+    assert tipado["id_jugador"].iloc[4] == 5
+    # Como las columnas faltantes: un aviso por problema, con los valores perdidos
+    assert len(avisos) == 1 and "id_jugador" in avisos[0]
+    assert "J07" in avisos[0] and "3b" in avisos[0] and "5.0" not in avisos[0]
+
+
+def test_ids_validos_quedan_enteros_sin_aviso(app):
+    rng = random.Random(3)
+    df = app.CSVHoja.desde_payload(_csv([_fila(rng, 1, j) for j in range(1, 6)]), HOJA).df
+    assert str(df["id_jugador"].dtype) == "Int32"
+    assert app.normalizar_hoja(HOJA, df)[1] == []
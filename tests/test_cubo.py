@@ -0,0 +1,47 @@
+"""CuboEstadisticas.con_filas: el camino incremental tiene que dar lo mismo que rearmar el cubo."""
+import pandas as pd
+import pytest
+
+
+def _hechos(app, filas):
+    columnas = ["id_partido", *app.DIMENSIONES_CUBO, *app.MEDIDAS_CUBO]
+    return pd.DataFrame(filas, columns=columnas)
+
+
+def _fila(id_partido, id_jugador, minutos, goles, rival="Rival 1"):
+    return (id_partido, id_jugador, "Delantero", "Apertura", rival, "2026-03", 1, minutos, goles, 0)
+
+
+CONSULTAS = [(), ("id_jugador",), ("rival",), ("id_jugador", "rival")]
+
+
+def _con_rollups(app, hechos):
+    cubo = app.CuboEstadisticas(_hechos(app, hechos))
+    for por in CONSULTAS:
+        cubo.consulta(por)
+    return cubo
+
+
+@pytest.mark.parametrize("antes, despues", [
+    # Solo altas: partido nuevo
+    ([_fila(1, 7, 90, 1), _fila(1, 8, 45, 0)],
+     [_fila(1, 7, 90, 1), _fila(1, 8, 45, 0), _fila(2, 7, 80, 2, "Rival 2")]),
+    # Fila repetida: a, b → a, a, c (b desapareció aunque a esté dos veces)
+    ([_fila(1, 7, 90, 1), _fila(1, 8, 45, 0)],
+     [_fila(1, 7, 90, 1), _fila(1, 7, 90, 1), _fila(2, 9, 10, 0, "Rival 2")]),
+    # Repetida antes y después: a, a → a, a, a
+    ([_fila(1, 7, 90, 1), _fila(1, 7, 90, 1)],
+     [_fila(1, 7, 90, 1), _fila(1, 7, 90, 1), _fila(1, 7, 90, 1)]),
+    # Repetida antes, una sola después: a, a → a, c
+    ([_fila(1, 7, 90, 1), _fila(1, 7, 90, 1)],
+     [_fila(1, 7, 90, 1), _fila(2, 8, 30, 1, "Rival 2")]),
+    # Cambio de una fila existente
+    ([_fila(1, 7, 90, 1)], [_fila(1, 7, 85, 1)]),
+])
+def test_con_filas_igual_a_rearmar(app, antes, despues):
+    incremental = _con_rollups(app, antes).con_filas(_hechos(app, despues))
+    completo = app.CuboEstadisticas(_hechos(app, despues))
+    for por in CONSULTAS:
+        pd.testing.assert_frame_equal(
+            incremental.consulta(por), completo.consulta(por), check_dtype=False, obj=str(por)
+        )
@@ -0,0 +1,127 @@
+"""CacheFotos contra un servidor local de imágenes: variantes, aciertos, poda y reintentos."""
+import http.server
+import io
+import os
+import threading
+from collections import Counter
+
+import pytest
+from PIL import Image
+
+from conftest import cargar_seccion
+
+
+def imagen(color: str, tamano=(800, 600)) -> bytes:
+    salida = io.BytesIO()
+    Image.new("RGB", tamano, color).save(salida, format="JPEG")
+    return salida.getvalue()
+
+
+class ServidorFotos:
+    """Sirve ruta → bytes de imagen; lo que no está, 404. Cuenta los pedidos por ruta."""
+
+    def __init__(self):
+        self.fotos = {}
+        self.pedidos = Counter()
+        servidor = self
+
+        class Manejador(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                servidor.pedidos[self.path] += 1
+                cuerpo = servidor.fotos.get(self.path)
+                self.send_response(200 if cuerpo is not None else 404)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", str(len(cuerpo or b"")))
+                self.end_headers()
+                self.wfile.write(cuerpo or b"")
+
+            def log_message(self, *args):
+                pass
+
+        self.http = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+        self.http.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.http.server_address[1]}"
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+
+    def url(self, ruta: str) -> str:
+        return self.base + ruta
+
+
+@pytest.fixture(scope="module")
+def fotos_app(app):
+    return cargar_seccion(app, "FOTOS DEL PLANTEL")
+
+
+@pytest.fixture
+def servidor():
+    stub = ServidorFotos()
+    yield stub
+    stub.http.shutdown()
+    stub.http.server_close()
+
+
+def test_variantes_y_aciertos(fotos_app, servidor, tmp_path):
+    servidor.fotos["/a.jpg"] = imagen("red")
+    url = servidor.url("/a.jpg")
+    cache = fotos_app.CacheFotos(tmp_path)
+
+    mini = cache.foto(url, "mini")
+    perfil = cache.foto(url, "perfil")
+    assert max(Image.open(io.BytesIO(mini)).size) == fotos_app.FOTOS_VARIANTES["mini"]
+    assert max(Image.open(io.BytesIO(perfil)).size) == fotos_app.FOTOS_VARIANTES["perfil"]
+    # Una sola descarga arma todas las variantes
+    assert servidor.pedidos["/a.jpg"] == 1
+
+    # Otro proceso (caché nueva sobre la misma carpeta) no vuelve a bajarla
+    assert fotos_app.CacheFotos(tmp_path).foto(url, "mini") == mini
+    assert servidor.pedidos["/a.jpg"] == 1
+
+
+def test_misma_foto_en_dos_urls_se_guarda_una_vez(fotos_app, servidor, tmp_path):
+    servidor.fotos["/a.jpg"] = servidor.fotos["/copia.jpg"] = imagen("blue")
+    cache = fotos_app.CacheFotos(tmp_path)
+    fotos = cache.lote([servidor.url("/a.jpg"), servidor.url("/copia.jpg"), "", None], "mini")
+    assert len(fotos) == 2
+    assert len(list(tmp_path.glob("*.jpg"))) == len(fotos_app.FOTOS_VARIANTES)
+
+
+def test_poda_las_variantes_usadas_hace_mas_tiempo(fotos_app, servidor, tmp_path):
+    servidor.fotos["/vieja.jpg"] = imagen("green")
+    servidor.fotos["/nueva.jpg"] = imagen("yellow")
+    cache = fotos_app.CacheFotos(tmp_path)
+    cache.lote([servidor.url("/vieja.jpg")], "mini")
+    viejas = list(tmp_path.glob("*.jpg"))
+    for ruta in viejas:
+        os.utime(ruta, (1, 1))
+    # Entra una foto sola, no las dos
+    cache.max_bytes = int(sum(r.stat().st_size for r in viejas) * 1.5)
+
+    assert servidor.url("/nueva.jpg") in cache.lote([servidor.url("/nueva.jpg")], "mini")
+    assert not any(r.exists() for r in viejas)
+    assert sum(r.stat().st_size for r in tmp_path.glob("*.jpg")) <= cache.max_bytes
+
+    # La podada se vuelve a bajar cuando se pide
+    assert cache.foto(servidor.url("/vieja.jpg"), "mini") is not None
+    assert servidor.pedidos["/vieja.jpg"] == 2
+
+
+def test_fallida_no_se_reintenta_hasta_el_plazo(fotos_app, servidor, tmp_path):
+    url = servidor.url("/tarde.jpg")
+    servidor.fotos["/rota.jpg"] = b"no es una imagen"
+    cache = fotos_app.CacheFotos(tmp_path)
+
+    assert cache.lote([url, servidor.url("/rota.jpg")], "mini") == {}
+    assert servidor.pedidos == Counter({"/tarde.jpg": 1, "/rota.jpg": 1})
+
+    # La foto aparece, pero dentro del plazo no se vuelve a pedir
+    servidor.fotos["/tarde.jpg"] = imagen("white")
+    assert cache.foto(url, "mini") is None
+    assert servidor.pedidos["/tarde.jpg"] == 1
+
+    # Vencido FOTOS_REINTENTO_S desde el fallo, sí
+    cache._fallidas[url] -= fotos_app.FOTOS_REINTENTO_S + 1
+    assert cache.foto(url, "mini") is not None
+    assert servidor.pedidos["/tarde.jpg"] == 2
+    assert servidor.pedidos["/rota.jpg"] == 1
@@ -0,0 +1,55 @@
+"""Los índices de una página salen de la misma versión de las hojas que sus frames."""
+import pytest
+
+HOJAS = ("Plantel", "Entrenamientos_Dia", "Asistencia_Entrenamiento", "PostPartido", "Videoanalisis")
+
+
+@pytest.fixture
+def almacen(app, gviz, tmp_path, monkeypatch):
+    transporte = app.TransporteHTTP(reintentos=0, backoff=0)
+    almacen = app.AlmacenHojas(tmp_path / "snapshots", fuente=app.FuenteSheets(transporte))
+    monkeypatch.setattr(app, "almacen_hojas", lambda: almacen)
+    return almacen
+
+
+def test_indices_fijados_a_la_version_de_la_seccion(app, hojas, gviz, almacen):
+    firma, datos, _ = app.datos_normalizados(HOJAS)
+    ultimo_dia = int(datos["Entrenamientos_Dia"]["id_entreno_dia"].max())
+    ultimo_jug = int(datos["Plantel"]["id_jugador"].max())
+
+    # El planificador trae una versión nueva en medio de la página
+    gviz.hojas["Entrenamientos_Dia"] = hojas["Entrenamientos_Dia"] + \
+        f"{ultimo_dia + 1},1,Sábado,01/01/2030\n".encode()
+    gviz.hojas["Plantel"] = hojas["Plantel"] + f"{ultimo_jug + 1},Nuevo,Delantero,2005,\n".encode()
+    assert sorted(almacen.refrescar(HOJAS)) == ["Entrenamientos_Dia", "Plantel"]
+
+    with app.indices.fijar(HOJAS, firma, datos):
+        assert app.indices.firma("dias_por_sesion") == (firma[1],)
+        dias = app.indices["dias_por_sesion"][1]
+        assert ultimo_dia + 1 not in set(dias["id_entreno_dia"])
+        resumen = app.indices["resumen_jugadores"]
+        assert list(resumen.index) == list(datos["Plantel"]["id_jugador"])
+        # Las etiquetas (índice anidado) también son de esa versión: los
+        # clips apuntan a filas del Videoanalisis de la sección
+        clips = {c for lista in resumen["clips"] for c in lista}
+        assert clips <= set(datos["Videoanalisis"].index)
+
+    # Fuera de fijar(): la versión actual del almacén
+    assert ultimo_dia + 1 in set(app.indices["dias_por_sesion"][1]["id_entreno_dia"])
+    assert ultimo_jug + 1 in app.indices["resumen_jugadores"].index
+
+
+def test_hojas_no_fijadas_salen_de_otra_instantanea(app, gviz, almacen):
+    firma, datos, _ = app.datos_normalizados(["Plantel"])
+    with app.indices.fijar(["Plantel"], firma, datos):
+        # dias_por_sesion depende de Entrenamientos_Dia, que no está fijada
+        assert app.indices["dias_por_sesion"].grupos
+
+
+def test_columnas_agregadas_por_la_seccion_no_llegan_al_indice(app, gviz, almacen):
+    firma, datos, _ = app.datos_normalizados(HOJAS)
+    with app.indices.fijar(HOJAS, firma, datos):
+        datos["Entrenamientos_Dia"]["marca_de_la_seccion"] = 1
+        app._indice_cacheado.clear()
+        dias = app.indices["dias_por_sesion"]
+    assert "marca_de_la_seccion" not in dias.vacio.columns
@@ -0,0 +1,20 @@
+"""Los contadores de la capa de datos llegan a la ejecución en curso, no a la primera."""
+import json
+
+
+def test_contadores_de_consultas_en_cada_rerun(app_test, tmp_path, monkeypatch):
+    log = tmp_path / "perf.jsonl"
+    monkeypatch.setenv("EXCURSIONISTAS_PERF_LOG", str(log))
+    at = app_test()
+    at.run()
+    for _ in range(3):
+        at.sidebar.radio[0].set_value("📹 Videoanálisis").run()
+        at.sidebar.radio[0].set_value("🏠 Inicio").run()
+    assert not at.exception
+
+    registros = [json.loads(linea) for linea in log.read_text(encoding="utf-8").splitlines()]
+    videos = [r["contadores"] for r in registros if r["unidad"] == "seccion_videoanalisis"]
+    assert len(videos) == 3
+    for contadores in videos:
+        assert any(k.startswith("consultas.") for k in contadores), contadores
+        assert contadores.get("normalizar.llamadas", 0) == videos[0]["normalizar.llamadas"]
@@ -0,0 +1,34 @@
+"""Ventanas de carga del planificador: se comparan con la hora del club, no la del servidor."""
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def planificador(app, tmp_path):
+    hoy = pd.Timestamp.now(tz=app.ZONA_HORARIA).normalize().tz_localize(None)
+    almacen = app.AlmacenHojas(tmp_path)
+    almacen.frames["Entrenamientos_Dia"] = pd.DataFrame({"fecha": [hoy.strftime(app.FORMATO_FECHA)]})
+    almacen.frames["Partidos"] = pd.DataFrame({"fecha": pd.Series([], dtype=object)})
+    return app.PlanificadorRefresco(almacen), hoy
+
+
+def test_ahora_con_zona_se_pasa_a_la_hora_del_club(app, planificador):
+    pl, hoy = planificador
+    utc = hoy.tz_localize("UTC")
+    # El club está en UTC-3: el entrenamiento (08-13) va de 11 a 16 UTC
+    assert not pl.en_vivo("Asistencia_Entrenamiento", utc + pd.Timedelta(hours=9))
+    assert pl.en_vivo("Asistencia_Entrenamiento", utc + pd.Timedelta(hours=12))
+    assert pl.en_vivo("Asistencia_Entrenamiento", utc + pd.Timedelta(hours=15))
+    assert not pl.en_vivo("Asistencia_Entrenamiento", utc + pd.Timedelta(hours=17))
+    # Sin zona: hora del club
+    assert pl.en_vivo("Tareas", hoy + pd.Timedelta(hours=9))
+    assert not pl.en_vivo("Tareas", hoy + pd.Timedelta(hours=20))
+    assert not pl.en_vivo("Plantel", hoy + pd.Timedelta(hours=9))
+
+
+def test_sin_ahora_usa_el_reloj_del_club(app, planificador):
+    pl, _ = planificador
+    hora = pd.Timestamp.now(tz=app.ZONA_HORARIA).hour
+    if hora in (7, 12, 13):
+        pytest.skip("demasiado cerca del borde de la ventana")
+    assert pl.en_vivo("Asistencia_Entrenamiento") == (8 <= hora < 13)
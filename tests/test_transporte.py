@@ -0,0 +1,148 @@
+"""TransporteHTTP contra un servidor local que falla a pedido: reintentos y circuito."""
+import http.server
+import threading
+
+import pytest
+import requests
+
+CUERPO = b"fecha,jugador\n01/03/2025,Perez\n" * 200
+
+
+class Servidor:
+    """
+    Stub HTTP que responde según un guion, un paso por pedido: "ok", un
+    código ("503", "404", ...) sin cuerpo, "corte" (cuerpo cortado a mitad de camino), "gzip" (gzip roto)
+    o "cierre" (cierra la conexión sin responder). Agotado el guion, "ok".
+    """
+
+    def __init__(self):
+        self.guion = []
+        self.pedidos = 0
+        servidor = self
+
+        class Manejador(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                servidor.pedidos += 1
+                paso = servidor.guion.pop(0) if servidor.guion else "ok"
+                if paso == "cierre":
+                    self.close_connection = True
+                    return
+                if paso.isdigit():
+                    self.send_response(int(paso))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                cuerpo = b"\x1f\x8bno es gzip" if paso == "gzip" else CUERPO
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv")
+                if paso == "gzip":
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                if paso == "corte":
+                    self.wfile.write(cuerpo[: len(cuerpo) // 2])
+                    self.close_connection = True
+                    return
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass
+
+        self.http = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+        self.http.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.http.server_address[1]}/hoja"
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def servidor():
+    s = Servidor()
+    yield s
+    s.http.shutdown()
+    s.http.server_close()
+
+
+def transporte(app, **kwargs):
+    kwargs.setdefault("backoff", 0)
+    return app.TransporteHTTP(**kwargs)
+
+
+def test_reintenta_503_cortes_y_gzip_roto(app, servidor):
+    servidor.guion = ["503", "corte", "gzip", "cierre"]
+    t = transporte(app, reintentos=4)
+    resp, intentos = t.get(servidor.url, timeout=5)
+    assert resp.status_code == 200 and resp.content == CUERPO
+    assert intentos == 5 and servidor.pedidos == 5
+    assert t.estado() == "cerrado"
+
+
+@pytest.mark.parametrize("paso, error", [
+    ("503", requests.HTTPError),
+    ("corte", requests.exceptions.ChunkedEncodingError),
+    ("gzip", requests.exceptions.ContentDecodingError),
+])
+def test_agotados_los_reintentos_lanza_el_ultimo_error(app, servidor, paso, error):
+    servidor.guion = [paso] * 3
+    t = transporte(app, reintentos=2)
+    with pytest.raises(error):
+        t.get(servidor.url, timeout=5)
+    assert servidor.pedidos == 3
+    assert t.estado() == "cerrado (1 fallas)"
+
+
+@pytest.mark.parametrize("codigo, falla", [("400", True), ("403", True), ("404", True), ("304", False)])
+def test_4xx_no_se_reintenta_pero_cuenta_como_falla(app, servidor, codigo, falla):
+    servidor.guion = [codigo]
+    t = transporte(app, reintentos=2)
+    resp, intentos = t.get(servidor.url, timeout=5)
+    assert resp.status_code == int(codigo)
+    assert intentos == 1 and servidor.pedidos == 1
+    assert t.estado() == ("cerrado (1 fallas)" if falla else "cerrado")
+
+
+def test_hoja_despublicada_abre_el_circuito(app, servidor):
+    servidor.guion = ["403"] * 2
+    t = transporte(app, fallas_circuito=2, pausa=60)
+    for _ in range(2):
+        assert t.get(servidor.url, timeout=5)[0].status_code == 403
+    assert t.estado().startswith("abierto")
+    with pytest.raises(app.CircuitoAbierto):
+        t.get(servidor.url, timeout=5)
+    assert servidor.pedidos == 2
+
+
+def test_circuito_se_abre_y_falla_sin_tocar_la_red(app, servidor):
+    servidor.guion = ["503"] * 6
+    t = transporte(app, reintentos=1, fallas_circuito=3, pausa=60)
+    for _ in range(3):
+        with pytest.raises(requests.HTTPError):
+            t.get(servidor.url, timeout=5)
+    assert t.estado().startswith("abierto")
+    with pytest.raises(app.CircuitoAbierto):
+        t.get(servidor.url, timeout=5)
+    assert servidor.pedidos == 6
+
+
+def test_circuito_medio_abierto_se_cierra_con_un_exito(app, servidor):
+    servidor.guion = ["503"] * 2
+    t = transporte(app, reintentos=1, fallas_circuito=1, pausa=0.05)
+    with pytest.raises(requests.HTTPError):
+        t.get(servidor.url, timeout=5)
+    assert t.estado().startswith("abierto")
+    threading.Event().wait(0.1)
+    assert t.get(servidor.url, timeout=5)[0].status_code == 200
+    assert t.estado() == "cerrado"
+
+
+def test_error_inesperado_cuenta_como_falla(app, servidor, monkeypatch):
+    t = transporte(app, fallas_circuito=1)
+
+    def rota(*args, **kwargs):
+        raise requests.exceptions.InvalidHeader("encabezado inválido")
+
+    monkeypatch.setattr(t.sesion, "get", rota)
+    with pytest.raises(requests.exceptions.InvalidHeader):
+        t.get(servidor.url, timeout=5)
+    assert t.estado().startswith("abierto")